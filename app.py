@@ -1,16 +1,27 @@
 import os
+import io
 import base64
+import hashlib
 import json
 import uuid
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict, deque
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Union, Optional, Tuple
+from typing import Dict, Iterator, List, Union, Optional, Tuple
+from urllib.parse import urlparse
 
 import pytz
 import requests
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
 from instagrapi import Client
+from instagrapi.crawler import RATE_LIMIT_ERRORS
 from instagrapi.exceptions import LoginRequired, ClientError
+from instagrapi.pagination import PagePrefetcher
+from instagrapi.refresh import REFRESH_INTERVALS, RefreshCache, RefreshScheduler
+from instagrapi.story_watcher import StoryWatcher
 import time
 import random
 
@@ -21,6 +32,25 @@ USERNAME = "your instagram username here"
 PASSWORD = "your instagram passoword"
 SESSION_FILE = "session.json"
 
+# How many cursor pages of posts/reels to fetch ahead of the user's scrolling
+PREFETCH_DEPTH = 1
+PREFETCH_MAX_PROFILES = 64
+# Prefetched pages older than this are fetched again, all profiles share the prefetch workers
+PREFETCH_TTL = 300
+PREFETCH_WORKERS = 2
+# Largest watchlist accepted by /stories/batch and /stories/new
+MAX_BATCH_USERS = 500
+# Seen state of /stories/new, one file per watchlist (the reels tray is not paged, followed
+# accounts past its first 50 entries are only checked by the 15 minute fallback)
+STORY_WATCH_STATE_DIR = "story_watch"
+# Background refreshes of viewed profiles allowed per hour, shared by all profiles
+REFRESH_BUDGET_PER_HOUR = 120
+WARM_CACHE_MAX_ENTRIES = 2048
+# Profile ZIP export: concurrent media downloads, each buffered in memory up to the spool size
+EXPORT_WORKERS = 4
+EXPORT_SPOOL_SIZE = 8 * 1024 * 1024
+EXPORT_CHUNK_SIZE = 256 * 1024
+
 # Custom Jinja2 filter to format large numbers
 def format_number(value):
     """Format large numbers with K (thousands) or M (millions)."""
@@ -93,6 +123,40 @@ class InstaClient:
             print(f"Login error: {e}")
             raise e
 
+class PagePrefetchCache:
+    """Keeps one background page prefetcher per (content type, user) so the next scroll is warm.
+
+    Pages are fetched on a small shared executor with the same client as the foreground
+    requests, so both share its delay_range pacing (last_json is kept per thread).
+    """
+
+    _prefetchers = OrderedDict()
+    _lock = threading.Lock()
+    _executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch')
+
+    @classmethod
+    def page(cls, kind: str, user_id: int, fetch_page, end_cursor: Optional[str] = None) -> Tuple[List, str]:
+        """Return a cursor page, served from the warm prefetched pages when possible.
+
+        fetch_page is called with the client and a cursor.
+        """
+        key = (kind, user_id)
+        with cls._lock:
+            prefetcher = cls._prefetchers.pop(key, None)
+            if prefetcher is None:
+                client = InstaClient().get_client()
+                prefetcher = PagePrefetcher(
+                    lambda cursor: fetch_page(client, cursor),
+                    prefetch=PREFETCH_DEPTH,
+                    ttl=PREFETCH_TTL,
+                    executor=cls._executor,
+                )
+            cls._prefetchers[key] = prefetcher
+            while len(cls._prefetchers) > PREFETCH_MAX_PROFILES:
+                _, stale = cls._prefetchers.popitem(last=False)
+                stale.close(wait=False)
+        return prefetcher.page(end_cursor or "")
+
 class InstaStory:
     """Class to handle Instagram profile downloading operations including stories, posts, reels, highlights."""
 
@@ -113,34 +177,37 @@ class InstaStory:
         """Set the username and call get_profile_name."""
         self._username = self.get_profile_name(username_id)
 
-    def get_profile_name(self, username_id: str) -> str:
-        """Extract profile name from profile url."""
-        return username_id.split('?')[0].strip('/').split('/')[-1].strip()
+    @staticmethod
+    def get_profile_name(username_id: str) -> str:
+        """Extract profile name from profile url or @username (usernames are case-insensitive)."""
+        return username_id.split('?')[0].strip('/').split('/')[-1].strip().lstrip('@').lower()
 
     def get_profile_details(self) -> Dict:
         """Get profile details using instagrapi."""
         try:
-            user_info = self.cl.user_info_by_username(self.username)
-            
-            profile_details = {
-                "username": self.username,
-                "user_id": str(user_info.pk),
-                "full_name": user_info.full_name or self.username,
-                "posts_count": user_info.media_count,
-                "followers": user_info.follower_count,
-                "following": user_info.following_count,
-                "bio": user_info.biography or '',
-                "external_url": user_info.external_url or '',
-                "category_name": user_info.category or '',
-                "is_private": user_info.is_private,
-                "is_verified": user_info.is_verified,
-                "profile_pic_url": str(user_info.profile_pic_url_hd),
-            }
-            return profile_details
+            return self.fetch_profile_details()
         except Exception as e:
             print(f"Failed to fetch profile details for {self.username}: {str(e)}")
             return {"error": f"Failed to fetch profile details: {str(e)}"}
 
+    def fetch_profile_details(self) -> Dict:
+        """Get profile details, raising the instagrapi errors."""
+        user_info = self.cl.user_info_by_username(self.username)
+        return {
+            "username": self.username,
+            "user_id": str(user_info.pk),
+            "full_name": user_info.full_name or self.username,
+            "posts_count": user_info.media_count,
+            "followers": user_info.follower_count,
+            "following": user_info.following_count,
+            "bio": user_info.biography or '',
+            "external_url": user_info.external_url or '',
+            "category_name": user_info.category or '',
+            "is_private": user_info.is_private,
+            "is_verified": user_info.is_verified,
+            "profile_pic_url": str(user_info.profile_pic_url_hd),
+        }
+
     def story_download(self) -> Dict:
         """Download stories from Instagram and fetch profile details."""
         if not self.validate_inputs():
@@ -167,48 +234,7 @@ class InstaStory:
     def get_story(self) -> Dict:
         """Get story data using instagrapi - FIXED VERSION."""
         try:
-            user_id = int(self.user_id)
-            
-            # First try to get stories directly
-            try:
-                stories = self.cl.user_stories(user_id)
-                print(f"Found {len(stories)} stories for user {self.username}")
-            except Exception as e:
-                print(f"Error fetching stories directly: {e}")
-                # Try alternative method - get reel feed
-                try:
-                    reel_feed = self.cl.reels_media([user_id])
-                    stories = reel_feed.get(user_id, {}).get('items', []) if reel_feed else []
-                    print(f"Found {len(stories)} stories via reel feed for user {self.username}")
-                except Exception as e2:
-                    print(f"Error fetching via reel feed: {e2}")
-                    stories = []
-            
-            if not stories:
-                return {
-                    'url': f'https://www.instagram.com/stories/{self.username}/',
-                    'Story Data': []
-                }
-            
-            processed_items = []
-            
-            # Process stories sequentially to avoid rate limiting
-            for idx, story in enumerate(stories, 1):
-                try:
-                    story_item = self.process_single_story(story, idx)
-                    if story_item:
-                        processed_items.append(story_item)
-                    
-                    # Add delay between processing - increased for bot protection
-                    time.sleep(random.uniform(1, 3))
-                except Exception as e:
-                    print(f"Error processing story {idx}: {e}")
-                    continue
-            
-            return {
-                'url': f'https://www.instagram.com/stories/{self.username}/',
-                'Story Data': processed_items
-            }
+            return self.fetch_story()
         except Exception as e:
             print(f"Error getting story: {e}")
             return {
@@ -216,6 +242,89 @@ class InstaStory:
                 'Story Data': []
             }
 
+    def fetch_story(self) -> Dict:
+        """Get story data, raising the instagrapi errors of the story requests."""
+        user_id = int(self.user_id)
+
+        # First try to get stories directly
+        try:
+            stories = self.cl.user_stories(user_id)
+            print(f"Found {len(stories)} stories for user {self.username}")
+        except RATE_LIMIT_ERRORS:
+            raise
+        except Exception as e:
+            print(f"Error fetching stories directly: {e}")
+            # Try alternative method - get reel feed
+            stories = self.cl.users_stories_v1([user_id]).get(str(user_id), [])
+            print(f"Found {len(stories)} stories via reel feed for user {self.username}")
+
+        processed_items = []
+
+        # Process stories sequentially to avoid rate limiting
+        for idx, story in enumerate(stories, 1):
+            try:
+                story_item = self.process_single_story(story, idx)
+                if story_item:
+                    processed_items.append(story_item)
+
+                # Add delay between processing - increased for bot protection
+                time.sleep(random.uniform(1, 3))
+            except Exception as e:
+                print(f"Error processing story {idx}: {e}")
+                continue
+
+        return {
+            'url': f'https://www.instagram.com/stories/{self.username}/',
+            'Story Data': processed_items
+        }
+
+    def get_stories_batch(self, user_ids: List[str]) -> Dict:
+        """Get story metadata for many users with batched reel requests (no preview downloads)."""
+        try:
+            stories_by_user = self.cl.users_stories(user_ids)
+        except Exception as e:
+            print(f"Error fetching stories batch: {e}")
+            return {}
+
+        return {
+            user_id: [self.story_metadata(story) for story in stories]
+            for user_id, stories in stories_by_user.items()
+        }
+
+    def get_new_stories(self, user_ids: List[str]) -> Dict:
+        """Get metadata of stories not reported before; an idle poll costs one reels tray call."""
+        try:
+            watchlist = hashlib.sha1(','.join(sorted(set(user_ids))).encode()).hexdigest()
+            os.makedirs(STORY_WATCH_STATE_DIR, exist_ok=True)
+            state_path = os.path.join(STORY_WATCH_STATE_DIR, f'{watchlist}.json')
+            watcher = StoryWatcher(self.cl, state_path, user_ids)
+            new_stories = watcher.poll()
+        except Exception as e:
+            print(f"Error polling new stories: {e}")
+            return {}
+
+        return {
+            user_id: [self.story_metadata(story) for story in stories]
+            for user_id, stories in new_stories.items()
+        }
+
+    @staticmethod
+    def story_metadata(story) -> Dict:
+        """Story metadata with URLs only, previews are loaded on demand."""
+        is_video = story.media_type == 2
+        taken_at = int(story.taken_at.timestamp())
+        username = story.user.username or story.user.pk
+        return {
+            'pk': story.pk,
+            'url': f'https://www.instagram.com/stories/{username}/{story.pk}/',
+            'Time': TimeConverter.convert_unix_timestamp(taken_at)[0],
+            'taken_at': taken_at,
+            'expiring_at': TimeConverter.convert_unix_timestamp(taken_at + 86400)[0],
+            'preview_url': str(story.thumbnail_url) if story.thumbnail_url else '',
+            'media_url': str(story.video_url if is_video else story.thumbnail_url),
+            'is_video': is_video
+        }
+
     def process_single_story(self, story, index) -> Dict:
         """Process a single story item - FIXED VERSION with lazy loading."""
         try:
@@ -320,7 +429,12 @@ class InstaStory:
             user_id = int(self.user_id)
             
             # Use the correct paginated method with end_cursor - reduced to 6 for optimization
-            medias, next_cursor = self.cl.user_medias_paginated_v1(user_id, amount=6, end_cursor=end_cursor or "")
+            # The next cursor page is fetched in the background while this one is processed
+            medias, next_cursor = PagePrefetchCache.page(
+                'posts', user_id,
+                lambda client, cursor: client.user_medias_paginated_v1(user_id, amount=6, end_cursor=cursor),
+                end_cursor,
+            )
             
             # Filter out reels/videos - only get images and carousels
             posts = [m for m in medias if m.media_type in [1, 8]]  # 1=photo, 8=carousel
@@ -425,7 +539,12 @@ class InstaStory:
             user_id = int(self.user_id)
             
             # Use the correct paginated method with end_cursor - reduced to 6 for optimization
-            clips, next_cursor = self.cl.user_clips_paginated_v1(user_id, amount=6, end_cursor=end_cursor or "")
+            # The next cursor page is fetched in the background while this one is processed
+            clips, next_cursor = PagePrefetchCache.page(
+                'reels', user_id,
+                lambda client, cursor: client.user_clips_paginated_v1(user_id, amount=6, end_cursor=cursor),
+                end_cursor,
+            )
             
             processed = []
             for clip in clips[:6]:  # Limit to 6 reels
@@ -603,6 +722,215 @@ class InstaStory:
             print(f"Error fetching highlight items {highlight_id}: {e}")
             return []
 
+def refresh_profile(username: str) -> Dict:
+    """Refresh job for the warm cache: profile details, rate limit errors reach the scheduler."""
+    return InstaStory(username=username).fetch_profile_details()
+
+def refresh_stories(username: str, user_id: str) -> Dict:
+    """Refresh job for the warm cache: stories with previews."""
+    insta = InstaStory(username=username)
+    insta.user_id = user_id
+    return insta.fetch_story()
+
+def refresh_highlights(username: str, user_id: str) -> List:
+    """Refresh job for the warm cache: highlights list with covers."""
+    insta = InstaStory(username=username)
+    insta.user_id = user_id
+    return insta.get_highlights()
+
+class WarmCache:
+    """Server-side cache which a background scheduler keeps warm for frequently viewed profiles."""
+
+    cache = RefreshCache(max_entries=WARM_CACHE_MAX_ENTRIES)
+    _scheduler = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def scheduler(cls) -> RefreshScheduler:
+        """Start the refresh scheduler on first use (after gunicorn has forked the worker)."""
+        with cls._lock:
+            if cls._scheduler is None:
+                cls._scheduler = RefreshScheduler(
+                    {
+                        'profile': refresh_profile,
+                        'stories': refresh_stories,
+                        'highlights': refresh_highlights,
+                    },
+                    cache=cls.cache,
+                    budget=REFRESH_BUDGET_PER_HOUR,
+                ).start()
+        return cls._scheduler
+
+    @classmethod
+    def get(cls, kind: str, username: str, load, **params):
+        """Serve warm data, loading it on the request path only on a miss.
+
+        The view is recorded after a miss is cached, so the scheduler does not fetch it a second time.
+        """
+        scheduler = cls.scheduler()
+        value = cls.cache.get((kind, username), max_age=REFRESH_INTERVALS[kind])
+        if value is None:
+            value = load()
+            if not (isinstance(value, dict) and "error" in value):
+                cls.cache.set((kind, username), value)
+                scheduler.touch(username, kind)
+        scheduler.view(username, kind, **params)
+        return value
+
+class ZipStream(io.RawIOBase):
+    """Unseekable sink for zipfile which hands out written bytes as they are produced."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self) -> bytes:
+        """Return and forget everything written so far (popped after every chunk, so usually one write)."""
+        chunks, self._chunks = self._chunks, []
+        return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+class ProfileExport:
+    """Streams a ZIP of a whole profile (stories, posts, reels, highlights) while it is being built."""
+
+    progress = {}  # username -> progress of the running or last export
+    _lock = threading.Lock()
+
+    def __init__(self, username: str):
+        """Initialize the exporter for one profile."""
+        self.insta = InstaStory(username=username)
+        self.username = self.insta.username
+        self.cl = self.insta.cl
+
+    @staticmethod
+    def _media_urls(media) -> List[Tuple[str, str]]:
+        """(pk, url) of every file of a post, reel or story."""
+        resources = media.resources if media.media_type == 8 else [media]
+        return [
+            (str(resource.pk), str(resource.video_url if resource.media_type == 2 else resource.thumbnail_url))
+            for resource in resources
+            if resource.video_url or resource.thumbnail_url
+        ]
+
+    def iter_files(self, user_id: str) -> Iterator[Tuple[str, str]]:
+        """Walk the profile with the paginated client methods, yielding (archive name, url)."""
+        sections = [
+            ('stories', lambda: [self.cl.user_stories(user_id)]),
+            ('posts', lambda: (page for page, _ in self.cl.user_medias_pages_v1(user_id))),
+            ('reels', lambda: (page for page, _ in self.cl.user_clips_pages_v1(user_id))),
+        ]
+        for folder, pages in sections:
+            try:
+                for page in pages():
+                    for media in page:
+                        code = getattr(media, 'code', None) or media.pk
+                        for pk, url in self._media_urls(media):
+                            yield f"{folder}/{code}_{pk}{self._extension(url)}", url
+            except Exception as e:
+                print(f"Error exporting {folder} of {self.username}: {e}")
+                self._update(errors=1)
+        try:
+            highlights = self.cl.user_highlights(user_id)
+        except Exception as e:
+            print(f"Error exporting highlights of {self.username}: {e}")
+            self._update(errors=1)
+            return
+        for highlight in highlights:
+            try:
+                items = self.cl.highlight_info(highlight.pk).items
+            except Exception as e:
+                print(f"Error exporting highlight {highlight.pk}: {e}")
+                self._update(errors=1)
+                continue
+            title = ''.join(c for c in highlight.title if c.isalnum() or c in ' -_').strip() or highlight.pk
+            for item in items:
+                for pk, url in self._media_urls(item):
+                    yield f"highlights/{title}/{pk}{self._extension(url)}", url
+
+    @staticmethod
+    def _extension(url: str) -> str:
+        """File extension from a CDN URL."""
+        return os.path.splitext(urlparse(url).path)[1] or '.jpg'
+
+    def _update(self, **counters):
+        """Add to the progress counters of this export."""
+        with self._lock:
+            progress = self.progress[self.username]
+            for key, value in counters.items():
+                progress[key] += value
+
+    def _set_state(self, state: str):
+        """Set the state of this export."""
+        with self._lock:
+            self.progress[self.username]['state'] = state
+
+    def _fetch(self, url: str):
+        """Download a file into a spooled buffer which moves to disk past EXPORT_SPOOL_SIZE."""
+        spool = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_SIZE)
+        try:
+            self.cl.download_to_fileobj(url, spool)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+
+    def stream(self) -> Iterator[bytes]:
+        """Generate the ZIP archive chunk by chunk."""
+        with self._lock:
+            self.progress[self.username] = {
+                'state': 'running', 'files': 0, 'bytes': 0, 'errors': 0, 'started_at': int(time.time())
+            }
+        sink = ZipStream()
+        executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix='export')
+        pending = deque()
+        try:
+            profile = self.insta.get_profile_details()
+            if 'error' in profile:
+                raise ClientError(profile['error'])
+            with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+                archive.writestr('profile.json', json.dumps(profile, indent=2))
+                files = self.iter_files(profile['user_id'])
+                while True:
+                    # Keep at most 2 x EXPORT_WORKERS files in flight, written in walk order
+                    for name, url in files:
+                        pending.append((name, executor.submit(self._fetch, url)))
+                        if len(pending) >= 2 * EXPORT_WORKERS:
+                            break
+                    if not pending:
+                        break
+                    name, future = pending.popleft()
+                    try:
+                        spool = future.result()
+                    except Exception as e:
+                        print(f"Error downloading {name}: {e}")
+                        self._update(errors=1)
+                        continue
+                    # Hand out every chunk as soon as it is written, so memory stays at one chunk
+                    with spool, archive.open(name, 'w', force_zip64=True) as entry:
+                        while True:
+                            chunk = spool.read(EXPORT_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            entry.write(chunk)
+                            yield sink.pop()
+                        size = spool.tell()
+                    self._update(files=1, bytes=size)
+            yield sink.pop()
+            self._set_state('done')
+        except BaseException as e:
+            self._set_state(f'failed: {e}')
+            raise
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
 class InstaPost:
     """Class to handle Instagram post/reel downloading operations using instagrapi."""
 
@@ -771,10 +1099,11 @@ def get_profile():
         return jsonify({"error": "Username is missing"}), 400
 
     insta = InstaStory(username=username)
-    profile_details = insta.get_profile_details()
+    profile_details = WarmCache.get('profile', insta.username, insta.get_profile_details)
     if "error" in profile_details:
         return jsonify(profile_details), 500
 
+    profile_details = dict(profile_details)
     insta.user_id = profile_details['user_id']
     profile_pic_content, profile_pic_type = insta.get_media_content(profile_details.get('profile_pic_url'), False)
     profile_details['profile_pic_base64'] = base64.b64encode(profile_pic_content).decode('utf-8') if profile_pic_content else None
@@ -791,9 +1120,37 @@ def get_stories():
 
     insta = InstaStory(username=username)
     insta.user_id = user_id
-    story_data = insta.get_story()
+    story_data = WarmCache.get('stories', insta.username, insta.get_story, user_id=user_id)
     return jsonify(story_data)
 
+@app.route('/stories/batch', methods=['GET', 'POST'])
+def get_stories_batch():
+    """Story metadata for a watchlist of users, fetched 50 users per request."""
+    if request.method == 'POST':
+        user_ids = (request.get_json(silent=True) or {}).get('user_ids') or []
+    else:
+        user_ids = [i for i in request.args.get('user_ids', '').split(',') if i]
+    user_ids = [str(i).strip() for i in user_ids if str(i).strip().isdigit()]
+    if not user_ids:
+        return jsonify({"error": "user_ids is missing"}), 400
+    if len(user_ids) > MAX_BATCH_USERS:
+        return jsonify({"error": f"At most {MAX_BATCH_USERS} user_ids per request"}), 400
+
+    insta = InstaStory()
+    return jsonify({"stories": insta.get_stories_batch(user_ids)})
+
+@app.route('/stories/new', methods=['GET'])
+def get_new_stories():
+    """Only stories not reported by previous polls of the watchlist."""
+    user_ids = [i.strip() for i in request.args.get('user_ids', '').split(',') if i.strip().isdigit()]
+    if not user_ids:
+        return jsonify({"error": "user_ids is missing"}), 400
+    if len(user_ids) > MAX_BATCH_USERS:
+        return jsonify({"error": f"At most {MAX_BATCH_USERS} user_ids per request"}), 400
+
+    insta = InstaStory()
+    return jsonify({"stories": insta.get_new_stories(user_ids)})
+
 @app.route('/download_story', methods=['POST'])
 def download_story():
     username = request.form.get('username')
@@ -911,7 +1268,7 @@ def get_user_highlights():
 
     insta = InstaStory(username=username)
     insta.user_id = user_id
-    highlights_data = insta.get_highlights()
+    highlights_data = WarmCache.get('highlights', insta.username, insta.get_highlights, user_id=user_id)
     return jsonify({"highlights": highlights_data})
 
 @app.route('/get_highlight_items', methods=['GET'])
@@ -928,6 +1285,24 @@ def get_highlight_items():
     items = insta.get_highlight_items(highlight_id)
     return jsonify({"story_data": items})  # Changed key to story_data for consistency
 
+@app.route('/export/<username>.zip', methods=['GET'])
+def export_profile(username):
+    """Stream a ZIP of all stories, posts, reels and highlights of a profile."""
+    export = ProfileExport(username)
+    return Response(
+        export.stream(),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{export.username}.zip"'},
+    )
+
+@app.route('/export/<username>/progress', methods=['GET'])
+def export_progress(username):
+    """Progress of the running or last export of a profile (in this worker)."""
+    progress = ProfileExport.progress.get(InstaStory.get_profile_name(username))
+    if progress is None:
+        return jsonify({"error": "No export for this profile"}), 404
+    return jsonify(progress)
+
 # New endpoint to download media content on demand
 @app.route('/download_media_content', methods=['POST'])
 def download_media_content():
@@ -13,6 +13,7 @@ from instagrapi.mixins.clip import DownloadClipMixin, UploadClipMixin
 from instagrapi.mixins.collection import CollectionMixin
 from instagrapi.mixins.comment import CommentMixin
 from instagrapi.mixins.direct import DirectMixin
+from instagrapi.mixins.download import DownloadMixin
 from instagrapi.mixins.explore import ExploreMixin
 from instagrapi.mixins.fbsearch import FbSearchMixin
 from instagrapi.mixins.fundraiser import FundraiserMixin
@@ -50,6 +51,7 @@ DEFAULT_LOGGER = logging.getLogger("instagrapi")
 
 class Client(
     PublicRequestMixin,
+    DownloadMixin,
     ChallengeResolveMixin,
     PrivateRequestMixin,
     TopSearchesPublicMixin,
@@ -0,0 +1,199 @@
+import heapq
+from functools import reduce
+from itertools import groupby
+from typing import Dict, List, Sequence
+
+from instagrapi.pkset import PkSet, numpy
+
+
+def intersection_size(a: PkSet, b: PkSet) -> int:
+    """
+    Number of pks present in both sets
+
+    Parameters
+    ----------
+    a: PkSet
+    b: PkSet
+
+    Returns
+    -------
+    int
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return 0
+    if numpy is not None:
+        small, large = a.array(), b.array()
+        idx = numpy.searchsorted(large, small)
+        idx[idx == len(large)] = 0
+        return int(numpy.count_nonzero(large[idx] == small))
+    return sum(1 for pk in a if pk in b)
+
+
+def mutuals(sets: Sequence[PkSet]) -> PkSet:
+    """
+    Pks present in every set (mutual followers of all accounts)
+
+    Parameters
+    ----------
+    sets: Sequence[PkSet]
+
+    Returns
+    -------
+    PkSet
+        Usernames are kept from the smallest set when it has them
+    """
+    if not sets:
+        return PkSet()
+    return reduce(PkSet.intersection, sorted(sets, key=len))
+
+
+def jaccard(a: PkSet, b: PkSet) -> float:
+    """
+    Jaccard similarity of two audiences: |A & B| / |A | B|
+
+    Parameters
+    ----------
+    a: PkSet
+    b: PkSet
+
+    Returns
+    -------
+    float
+    """
+    common = intersection_size(a, b)
+    union = len(a) + len(b) - common
+    return common / union if union else 0.0
+
+
+def _pk_counts(sets: Sequence[PkSet]):
+    """Distinct pks over all sets and how many sets contain each of them"""
+    if numpy is not None:
+        return numpy.unique(
+            numpy.concatenate([pks.array() for pks in sets]), return_counts=True
+        )
+    pks, counts = [], []
+    for pk, group in groupby(heapq.merge(*sets)):
+        pks.append(pk)
+        counts.append(sum(1 for _ in group))
+    return pks, counts
+
+
+def unique_reach(sets: Sequence[PkSet]) -> int:
+    """
+    Number of distinct users across all sets
+
+    Parameters
+    ----------
+    sets: Sequence[PkSet]
+
+    Returns
+    -------
+    int
+    """
+    if not sets:
+        return 0
+    if numpy is not None:
+        return len(reduce(PkSet.union, sets))
+    return sum(1 for _ in groupby(heapq.merge(*sets)))
+
+
+def exclusive_reach(sets: Sequence[PkSet]) -> List[int]:
+    """
+    For every set, the number of its users that no other set contains
+
+    Parameters
+    ----------
+    sets: Sequence[PkSet]
+
+    Returns
+    -------
+    List[int]
+    """
+    if not sets:
+        return []
+    pks, counts = _pk_counts(sets)
+    if numpy is not None:
+        exclusive = PkSet.from_sorted(pks[counts == 1])
+    else:
+        exclusive = PkSet(pk for pk, count in zip(pks, counts) if count == 1)
+    return [intersection_size(pks, exclusive) for pks in sets]
+
+
+def overlap_matrix(sets: Sequence[PkSet]) -> List[List[int]]:
+    """
+    Pairwise intersection sizes, the diagonal holds the set sizes
+
+    Parameters
+    ----------
+    sets: Sequence[PkSet]
+
+    Returns
+    -------
+    List[List[int]]
+    """
+    size = len(sets)
+    matrix = [[0] * size for _ in range(size)]
+    for i in range(size):
+        matrix[i][i] = len(sets[i])
+        for j in range(i + 1, size):
+            matrix[i][j] = matrix[j][i] = intersection_size(sets[i], sets[j])
+    return matrix
+
+
+def jaccard_matrix(sets: Sequence[PkSet], overlaps: List[List[int]] = None) -> List[List[float]]:
+    """
+    Pairwise Jaccard similarity
+
+    Parameters
+    ----------
+    sets: Sequence[PkSet]
+    overlaps: List[List[int]], optional
+        Result of ``overlap_matrix`` to reuse, default is None
+
+    Returns
+    -------
+    List[List[float]]
+    """
+    overlaps = overlaps or overlap_matrix(sets)
+    size = len(sets)
+    return [
+        [
+            overlaps[i][j] / (len(sets[i]) + len(sets[j]) - overlaps[i][j])
+            if len(sets[i]) + len(sets[j]) - overlaps[i][j]
+            else 0.0
+            for j in range(size)
+        ]
+        for i in range(size)
+    ]
+
+
+def audience_overlap(audiences: Dict[str, PkSet]) -> Dict:
+    """
+    Overlap report for several accounts
+
+    Parameters
+    ----------
+    audiences: Dict[str, PkSet]
+        Account (username or user id) -> followers, e.g. from ``user_followers_pks``
+        or ``FollowCrawler.pkset``
+
+    Returns
+    -------
+    Dict
+        sizes, mutuals (users following every account), unique_reach,
+        exclusive_reach, overlap and jaccard matrices (ordered as ``accounts``)
+    """
+    accounts = list(audiences)
+    sets = [audiences[account] for account in accounts]
+    overlaps = overlap_matrix(sets)
+    return {
+        "accounts": accounts,
+        "sizes": [len(pks) for pks in sets],
+        "mutuals": len(mutuals(sets)),
+        "unique_reach": unique_reach(sets),
+        "exclusive_reach": exclusive_reach(sets),
+        "overlap": overlaps,
+        "jaccard": jaccard_matrix(sets, overlaps),
+    }
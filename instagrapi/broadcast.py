@@ -0,0 +1,320 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from instagrapi.crawler import RATE_LIMIT_ERRORS
+from instagrapi.exceptions import ClientError
+
+BROADCAST_KINDS = ("text", "photo", "video", "media", "story", "profile")
+
+
+class DirectBroadcast:
+    """
+    Resumable direct message campaign to many users or threads
+
+    ``message`` describes what is sent, one of BROADCAST_KINDS:
+
+    - ``{"kind": "text", "text": "Hello"}``
+    - ``{"kind": "photo", "path": "a.jpg"}`` / ``{"kind": "video", "path": "a.mp4"}``
+      (uploaded once per run, see ``direct_send_file_broadcast``)
+    - ``{"kind": "media", "media_id": "...", "media_type": "photo"}`` (users only)
+    - ``{"kind": "story", "story_id": "..."}``
+    - ``{"kind": "profile", "user_id": "..."}``
+
+    Every user gets its own request, threads are grouped ``chunk_size`` per
+    request. Requests run on ``workers`` threads, paced to at most
+    ``max_per_hour`` per account on top of the client ``delay_range``.
+
+    Progress is kept in ``state_dir``:
+
+    - ``campaign.json``: message and recipients
+    - ``status.ndjson``: one line per recipient result, fsynced
+
+    Running again skips recipients already sent, so an interrupted
+    campaign resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        client,
+        state_dir: Path,
+        message: Dict,
+        user_ids: Iterable = (),
+        thread_ids: Iterable = (),
+        workers: int = 2,
+        chunk_size: int = 10,
+        max_per_hour: int = 120,
+        rate_limit_sleep: int = 300,
+        max_retries: int = 3,
+        retry_failed: bool = False,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        client: Client
+            Logged in instagrapi client
+        state_dir: Path
+            Directory for the campaign and status files
+        message: Dict
+            What to send, see the class docstring
+        user_ids: Iterable, optional
+            Recipient users, each in a private thread
+        thread_ids: Iterable, optional
+            Recipient threads
+        workers: int, optional
+            Concurrent sends, default is 2
+        chunk_size: int, optional
+            Threads per request, default is 10
+        max_per_hour: int, optional
+            Requests allowed per hour for the account, default is 120
+        rate_limit_sleep: int, optional
+            Seconds to pause all sends after a rate limit error, default is 300
+        max_retries: int, optional
+            Rate limit pauses allowed in a row before giving up, default is 3
+        retry_failed: bool, optional
+            Send again to recipients which failed in previous runs, default value is False
+
+        Returns
+        -------
+        Void
+        """
+        kind = message.get("kind")
+        if kind not in BROADCAST_KINDS:
+            raise ValueError(f'Unknown message kind "{kind}", expected one of {BROADCAST_KINDS}')
+        if kind == "media" and thread_ids:
+            raise ValueError("Media can only be shared to user_ids")
+        self.client = client
+        self.message = dict(message)
+        self.recipients = [f"user:{int(pk)}" for pk in user_ids]
+        self.recipients += [f"thread:{int(pk)}" for pk in thread_ids]
+        self.workers = max(int(workers), 1)
+        self.chunk_size = max(int(chunk_size), 1)
+        self.min_interval = 3600 / max_per_hour if max_per_hour else 0
+        self.rate_limit_sleep = rate_limit_sleep
+        self.max_retries = max_retries
+        self.retry_failed = retry_failed
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.campaign_path = self.state_dir / "campaign.json"
+        self.status_path = self.state_dir / "status.ndjson"
+        self.status = {}  # recipient -> last status record
+        self._load_state()
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+        self._paused_until = 0.0
+        self._stop = threading.Event()
+        self._started_at = None
+        self._sent_this_run = 0
+        self._upload_id = None
+
+    def _load_state(self):
+        campaign = {"message": self.message, "recipients": self.recipients}
+        if self.campaign_path.exists():
+            with open(self.campaign_path) as fp:
+                saved = json.load(fp)
+            if saved != json.loads(json.dumps(campaign)):
+                raise ValueError(f"{self.state_dir} holds a different campaign")
+        else:
+            tmp_path = self.campaign_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as fp:
+                json.dump(campaign, fp)
+            os.replace(tmp_path, self.campaign_path)
+        if self.status_path.exists():
+            with open(self.status_path, encoding="utf-8") as fp:
+                for line in fp:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break  # torn last line of an interrupted run
+                    self.status[record["recipient"]] = record
+
+    def _record(self, recipients: List[str], status: str, **extra):
+        now = int(time.time())
+        records = [
+            {"recipient": recipient, "status": status, "at": now, **extra}
+            for recipient in recipients
+        ]
+        with self._lock:
+            with open(self.status_path, "a", encoding="utf-8") as fp:
+                fp.write("".join(json.dumps(record) + "\n" for record in records))
+                fp.flush()
+                os.fsync(fp.fileno())
+            for record in records:
+                self.status[record["recipient"]] = record
+            if status == "sent":
+                self._sent_this_run += len(records)
+
+    def pending(self) -> List[str]:
+        """
+        Recipients still to send to
+
+        Returns
+        -------
+        List[str]
+            "user:<pk>" or "thread:<id>" keys
+        """
+        skip = ("sent", "failed") if not self.retry_failed else ("sent",)
+        return [
+            recipient
+            for recipient in self.recipients
+            if self.status.get(recipient, {}).get("status") not in skip
+        ]
+
+    def _batches(self) -> List[Tuple[List[int], List[int], List[str]]]:
+        """(user_ids, thread_ids, recipient keys) per request"""
+        batches, threads = [], []
+        for recipient in self.pending():
+            kind, pk = recipient.split(":")
+            if kind == "user":
+                batches.append(([int(pk)], [], [recipient]))
+            else:
+                threads.append((int(pk), recipient))
+        for i in range(0, len(threads), self.chunk_size):
+            chunk = threads[i:i + self.chunk_size]
+            batches.append(([], [pk for pk, _ in chunk], [key for _, key in chunk]))
+        return batches
+
+    def _send(self, user_ids: List[int], thread_ids: List[int]):
+        message, cl = self.message, self.client
+        kind = message["kind"]
+        if kind == "text":
+            return cl.direct_send(message["text"], user_ids, thread_ids)
+        if kind in ("photo", "video"):
+            return self._send_uploaded(user_ids, thread_ids)
+        if kind == "media":
+            return cl.direct_media_share(
+                message["media_id"], user_ids, media_type=message.get("media_type", "photo")
+            )
+        if kind == "story":
+            return cl.direct_story_share(message["story_id"], user_ids, thread_ids)
+        return cl.direct_profile_share(message["user_id"], user_ids, thread_ids)
+
+    def _send_uploaded(self, user_ids: List[int], thread_ids: List[int]):
+        path, kind = Path(self.message["path"]), self.message["kind"]
+        upload_id = self._upload_id
+        try:
+            return self.client._direct_configure_file(upload_id, kind, user_ids, thread_ids)
+        except RATE_LIMIT_ERRORS:
+            raise
+        except ClientError as e:
+            # The upload expired, replace it once for every batch still to send
+            self.client.logger.warning("Broadcast of %s failed, upload again (%s)", path, e)
+            upload_id, _ = self.client._direct_upload(path, kind, stale=upload_id)
+            self._upload_id = upload_id
+            return self.client._direct_configure_file(upload_id, kind, user_ids, thread_ids)
+
+    def _wait_turn(self) -> bool:
+        """Sleep until this worker may send (pacing and rate limit pauses), False when stopped"""
+        while not self._stop.is_set():
+            with self._lock:
+                now = time.time()
+                start = max(self._next_at, self._paused_until)
+                if start <= now:
+                    self._next_at = now + self.min_interval
+                    return True
+            self._stop.wait(start - now)
+        return False
+
+    def _worker(self, batches: deque):
+        retries = 0
+        while not self._stop.is_set():
+            with self._lock:
+                if not batches:
+                    return
+                user_ids, thread_ids, recipients = batches.popleft()
+            if not self._wait_turn():
+                return
+            try:
+                result = self._send(user_ids, thread_ids)
+            except RATE_LIMIT_ERRORS as e:
+                retries += 1
+                with self._lock:
+                    batches.appendleft((user_ids, thread_ids, recipients))
+                    self._paused_until = time.time() + self.rate_limit_sleep
+                if retries > self.max_retries:
+                    self._stop.set()
+                    raise e
+                self.client.logger.warning(
+                    "Broadcast rate limited, pause %ds (%s)", self.rate_limit_sleep, e
+                )
+                continue
+            except Exception as e:
+                self.client.logger.warning("Broadcast to %s failed: %s", recipients, e)
+                self._record(recipients, "failed", error=f"{type(e).__name__}: {e}")
+                continue
+            retries = 0
+            item_id = getattr(result, "id", None)
+            self._record(recipients, "sent", item_id=str(item_id) if item_id else None)
+
+    def run(self) -> Dict:
+        """
+        Send to every pending recipient
+
+        Returns
+        -------
+        Dict
+            Progress, see ``progress``
+        """
+        batches = deque(self._batches())
+        self._stop.clear()
+        self._started_at = time.time()
+        self._sent_this_run = 0
+        if batches:
+            if self.message["kind"] in ("photo", "video"):
+                # Upload before fanning out, every batch configures the same upload_id
+                self._upload_id, _ = self.client._direct_upload(
+                    Path(self.message["path"]), self.message["kind"]
+                )
+            workers = min(self.workers, len(batches))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="instagrapi-broadcast"
+            ) as executor:
+                futures = [executor.submit(self._worker, batches) for _ in range(workers)]
+                errors = [future.exception() for future in futures]
+            errors = [error for error in errors if error is not None]
+            if errors:
+                raise errors[0]
+        return self.progress()
+
+    def stop(self):
+        """
+        Stop the running campaign after the requests in flight, it can be resumed with ``run``
+
+        Returns
+        -------
+        Void
+        """
+        self._stop.set()
+
+    def progress(self) -> Dict:
+        """
+        Campaign progress and throughput of the current run
+
+        Returns
+        -------
+        Dict
+            total, sent, failed, pending, elapsed (seconds), per_minute and eta (seconds)
+        """
+        with self._lock:
+            statuses = [self.status.get(r, {}).get("status") for r in self.recipients]
+            sent_this_run = self._sent_this_run
+        sent, failed = statuses.count("sent"), statuses.count("failed")
+        pending = len(self.recipients) - sent - (0 if self.retry_failed else failed)
+        elapsed = time.time() - self._started_at if self._started_at else 0
+        per_minute = sent_this_run * 60 / elapsed if elapsed else 0
+        return {
+            "total": len(self.recipients),
+            "sent": sent,
+            "failed": failed,
+            "pending": pending,
+            "elapsed": round(elapsed, 1),
+            "per_minute": round(per_minute, 2),
+            "eta": round(pending * 60 / per_minute) if per_minute else None,
+        }
@@ -0,0 +1,401 @@
+import csv
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NULL_INT = -1  # missing value in int64 and bool columns
+
+
+def _int(value) -> int:
+    return NULL_INT if value is None else int(value)
+
+
+def _bool(value) -> int:
+    return NULL_INT if value is None else int(bool(value))
+
+
+def _str(value) -> str:
+    return "" if value is None else str(value)
+
+
+def _timestamp(value) -> int:
+    """Unix seconds of an API timestamp (seconds or microseconds) or a datetime"""
+    if value is None:
+        return NULL_INT
+    if hasattr(value, "timestamp"):
+        return int(value.timestamp())
+    value = int(value)
+    return value // 1000000 if value > 10**12 else value
+
+
+def _sub(data: Dict, key: str, field: str):
+    return (data.get(key) or {}).get(field)
+
+
+def _attr(obj, key: str, field: str):
+    return getattr(getattr(obj, key, None), field, None)
+
+
+# Column name, type ("int", "bool" or "str"), getter on raw API dicts, getter on models
+COLUMNS = {
+    "media": [
+        ("pk", "int", lambda d: _int(d.get("pk")), lambda m: _int(m.pk)),
+        ("id", "str", lambda d: _str(d.get("id")), lambda m: _str(m.id)),
+        ("code", "str", lambda d: _str(d.get("code")), lambda m: _str(m.code)),
+        (
+            "taken_at",
+            "int",
+            lambda d: _timestamp(d.get("taken_at")),
+            lambda m: _timestamp(m.taken_at),
+        ),
+        ("media_type", "int", lambda d: _int(d.get("media_type")), lambda m: _int(m.media_type)),
+        (
+            "product_type",
+            "str",
+            lambda d: _str(d.get("product_type")),
+            lambda m: _str(m.product_type),
+        ),
+        ("user_pk", "int", lambda d: _int(_sub(d, "user", "pk")), lambda m: _int(m.user.pk)),
+        (
+            "username",
+            "str",
+            lambda d: _str(_sub(d, "user", "username")),
+            lambda m: _str(m.user.username),
+        ),
+        ("like_count", "int", lambda d: _int(d.get("like_count")), lambda m: _int(m.like_count)),
+        (
+            "comment_count",
+            "int",
+            lambda d: _int(d.get("comment_count")),
+            lambda m: _int(m.comment_count),
+        ),
+        (
+            "play_count",
+            "int",
+            lambda d: _int(d.get("play_count") or d.get("view_count")),
+            lambda m: _int(m.play_count or m.view_count),
+        ),
+        (
+            "location_pk",
+            "int",
+            lambda d: _int(_sub(d, "location", "pk")),
+            lambda m: _int(_attr(m, "location", "pk")),
+        ),
+        (
+            "caption_text",
+            "str",
+            lambda d: _str(_sub(d, "caption", "text")),
+            lambda m: _str(m.caption_text),
+        ),
+    ],
+    "comment": [
+        ("pk", "int", lambda d: _int(d.get("pk")), lambda c: _int(c.pk)),
+        (
+            "user_pk",
+            "int",
+            lambda d: _int(_sub(d, "user", "pk") or d.get("user_id")),
+            lambda c: _int(c.user.pk),
+        ),
+        (
+            "username",
+            "str",
+            lambda d: _str(_sub(d, "user", "username")),
+            lambda c: _str(c.user.username),
+        ),
+        (
+            "created_at",
+            "int",
+            lambda d: _timestamp(d.get("created_at_utc") or d.get("created_at")),
+            lambda c: _timestamp(c.created_at_utc),
+        ),
+        (
+            "like_count",
+            "int",
+            lambda d: _int(d.get("comment_like_count")),
+            lambda c: _int(c.like_count),
+        ),
+        (
+            "child_comment_count",
+            "int",
+            lambda d: _int(d.get("child_comment_count")),
+            lambda c: _int(c.child_comment_count),
+        ),
+        (
+            "replied_to_comment_id",
+            "int",
+            lambda d: _int(d.get("replied_to_comment_id") or d.get("parent_comment_id")),
+            lambda c: _int(c.replied_to_comment_id),
+        ),
+        ("text", "str", lambda d: _str(d.get("text")), lambda c: _str(c.text)),
+    ],
+    "user": [
+        ("pk", "int", lambda d: _int(d.get("pk")), lambda u: _int(u.pk)),
+        ("username", "str", lambda d: _str(d.get("username")), lambda u: _str(u.username)),
+        ("full_name", "str", lambda d: _str(d.get("full_name")), lambda u: _str(u.full_name)),
+        (
+            "is_private",
+            "bool",
+            lambda d: _bool(d.get("is_private")),
+            lambda u: _bool(u.is_private),
+        ),
+        (
+            "is_verified",
+            "bool",
+            lambda d: _bool(d.get("is_verified")),
+            lambda u: _bool(getattr(u, "is_verified", None)),
+        ),
+        (
+            "profile_pic_url",
+            "str",
+            lambda d: _str(d.get("profile_pic_url")),
+            lambda u: _str(u.profile_pic_url),
+        ),
+    ],
+}
+
+
+class ColumnBuffer:
+    """
+    Column-oriented buffer of medias, comments or users
+
+    Rows are appended straight from the dicts of Private API pages (as
+    passed to ``extract_media_v1``, ``extract_comment`` and
+    ``extract_user_short``), so no pydantic object is built per row.
+    Media, Comment and UserShort objects are accepted as well.
+
+    Ints (pks, counts, unix timestamps) and bools are kept in int64 / int8
+    ``array`` buffers with NULL_INT for missing values, strings in lists.
+    The buffers convert in bulk to NumPy arrays, a pyarrow Table or CSV.
+    """
+
+    def __init__(self, kind: str):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        kind: str
+            "media", "comment" or "user"
+
+        Returns
+        -------
+        Void
+        """
+        if kind not in COLUMNS:
+            raise ValueError(f'Unknown kind "{kind}", expected one of {tuple(COLUMNS)}')
+        self.kind = kind
+        self.columns = {}
+        for name, type_, _, _ in COLUMNS[kind]:
+            self.columns[name] = array({"int": "q", "bool": "b"}[type_]) if type_ != "str" else []
+        self._raw = [(self.columns[name].append, get) for name, _, get, _ in COLUMNS[kind]]
+        self._models = [(self.columns[name].append, get) for name, _, _, get in COLUMNS[kind]]
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def append(self, item):
+        """
+        Append one row
+
+        Parameters
+        ----------
+        item: Dict or model
+            Raw API dict, or Media / Comment / UserShort
+
+        Returns
+        -------
+        Void
+        """
+        getters = self._raw if isinstance(item, dict) else self._models
+        # Read the whole row first, a bad item must not leave the columns uneven
+        row = [(append, get(item)) for append, get in getters]
+        for append, value in row:
+            append(value)
+
+    def extend(self, items: Iterable):
+        """
+        Append rows, for example a page of a paginated endpoint
+
+        Parameters
+        ----------
+        items: Iterable
+            Raw API dicts, or Media / Comment / UserShort
+
+        Returns
+        -------
+        Void
+        """
+        items = list(items)
+        raw = sum(isinstance(item, dict) for item in items)
+        if 0 < raw < len(items):
+            for item in items:
+                self.append(item)
+            return
+        getters = [get if raw else get_model for _, _, get, get_model in COLUMNS[self.kind]]
+        # Column by column over the whole page, then extend the buffers together
+        values = [[get(item) for item in items] for get in getters]
+        for column, page in zip(self.columns.values(), values):
+            column.extend(page)
+
+    def to_numpy(self) -> Dict:
+        """
+        Columns as NumPy arrays, copied so the buffer can still grow afterwards
+
+        Returns
+        -------
+        Dict
+            Column name to int64, int8 or object (str) ndarray
+        """
+        if numpy is None:
+            raise Exception("Please install numpy and retry")
+        result = {}
+        for name, values in self.columns.items():
+            if isinstance(values, list):
+                result[name] = numpy.array(values, dtype=object)
+            else:
+                dtype = numpy.int64 if values.typecode == "q" else numpy.int8
+                # A view would export the array buffer and block later appends
+                result[name] = numpy.frombuffer(values, dtype=dtype).copy()
+        return result
+
+    def to_arrow(self):
+        """
+        Columns as a pyarrow Table, NULL_INT values become nulls
+
+        Returns
+        -------
+        pyarrow.Table
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise Exception("Please install pyarrow and retry")
+        data = {}
+        for name, values in self.to_numpy().items():
+            if values.dtype == object:
+                data[name] = pyarrow.array(values, type=pyarrow.string())
+            elif values.dtype == numpy.int8:
+                data[name] = pyarrow.array(values == 1, mask=values == NULL_INT)
+            else:
+                data[name] = pyarrow.array(values, mask=values == NULL_INT)
+        return pyarrow.table(data)
+
+    def to_csv(self, path: Path) -> Path:
+        """
+        Write the columns as a CSV file with a header row, missing values are empty
+
+        Parameters
+        ----------
+        path: Path
+            Destination file
+
+        Returns
+        -------
+        Path
+        """
+        columns = [
+            (
+                [None if value == NULL_INT else value for value in values]
+                if not isinstance(values, list)
+                else values
+            )
+            for values in self.columns.values()
+        ]
+        path = Path(path)
+        with open(path, "w", newline="", encoding="utf-8") as fp:
+            writer = csv.writer(fp)
+            writer.writerow(self.columns)
+            writer.writerows(zip(*columns))
+        return path
+
+
+def _export(
+    kind: str, fetch_page: Callable[[str], Tuple[List[Dict], str]], amount: int
+) -> ColumnBuffer:
+    buffer = ColumnBuffer(kind)
+    cursor = ""
+    while True:
+        items, cursor = fetch_page(cursor)
+        if amount:
+            items = items[: amount - len(buffer)]
+        buffer.extend(items)
+        if not cursor or (amount and len(buffer) >= amount):
+            return buffer
+
+
+def export_user_medias(client, user_id: str, amount: int = 0) -> ColumnBuffer:
+    """
+    Export user's medias by Private Mobile API into columns
+
+    Parameters
+    ----------
+    client: Client
+        Logged in instagrapi client
+    user_id: str
+        User id of an instagram account
+    amount: int, optional
+        Maximum number of medias, default is 0 (all medias)
+
+    Returns
+    -------
+    ColumnBuffer
+    """
+    return _export(
+        "media", lambda cursor: client._user_medias_v1_raw_page(user_id, 33, cursor), amount
+    )
+
+
+def export_media_comments(client, media_id: str, amount: int = 0) -> ColumnBuffer:
+    """
+    Export comments on a media into columns
+
+    Parameters
+    ----------
+    client: Client
+        Logged in instagrapi client
+    media_id: str
+        Unique identifier of a Media
+    amount: int, optional
+        Maximum number of comments, default is 0 (all comments)
+
+    Returns
+    -------
+    ColumnBuffer
+    """
+    media_id = client.media_id(media_id)
+    return _export(
+        "comment", lambda cursor: client._media_comments_v1_raw_page(media_id, cursor), amount
+    )
+
+
+def export_user_followers(
+    client, user_id: str, amount: int = 0, kind: str = "followers"
+) -> ColumnBuffer:
+    """
+    Export user's followers or following by Private Mobile API into columns
+
+    Parameters
+    ----------
+    client: Client
+        Logged in instagrapi client
+    user_id: str
+        User id of an instagram account
+    amount: int, optional
+        Maximum number of users, default is 0 (all users)
+    kind: str, optional
+        "followers" or "following", default value is "followers"
+
+    Returns
+    -------
+    ColumnBuffer
+    """
+    return _export(
+        "user",
+        lambda cursor: client._user_friendships_v1_raw_page(kind, user_id, cursor),
+        amount,
+    )
@@ -0,0 +1,636 @@
+import json
+import os
+import sqlite3
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+from instagrapi.exceptions import (
+    ClientThrottledError,
+    PleaseWaitFewMinutes,
+    RateLimitError,
+)
+from instagrapi.mixins.user import MAX_USER_COUNT
+from instagrapi.pkset import PkSet, PkSetBuilder
+from instagrapi.types import Comment, UserShort
+
+CRAWL_KINDS = ("followers", "following")
+COMMENT_OUTPUTS = ("ndjson", "sqlite")
+RATE_LIMIT_ERRORS = (ClientThrottledError, PleaseWaitFewMinutes, RateLimitError)
+
+
+class FollowCrawler:
+    """
+    Resumable crawler of user's followers or following
+
+    Progress is checkpointed to ``state_dir`` after every page:
+
+    - ``state.json``: cursor, counters and the size of the files below
+    - ``pks.bin``: int64 pks collected so far (dedupe state)
+    - ``users.ndjson``: one UserShort per line (output sink)
+
+    On start the files are truncated back to the last checkpoint, so a crawl
+    interrupted at any point resumes from the last completed page without
+    duplicates in the output.
+    """
+
+    def __init__(
+        self,
+        client,
+        user_id: str,
+        state_dir: Path,
+        kind: str = "followers",
+        page_size: int = MAX_USER_COUNT,
+        rate_limit_sleep: int = 300,
+        max_retries: int = 3,
+        sink: Callable[[List[UserShort]], None] = None,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        client: Client
+            Logged in instagrapi client
+        user_id: str
+            User id of an instagram account
+        state_dir: Path
+            Directory for the checkpoint and output files
+        kind: str, optional
+            "followers" or "following", default value is "followers"
+        page_size: int, optional
+            Page size requested from Instagram, default is 200
+        rate_limit_sleep: int, optional
+            Seconds to pause after a rate limit error, default is 300
+        max_retries: int, optional
+            Rate limit pauses allowed in a row before giving up, default is 3
+        sink: Callable[[List[UserShort]], None], optional
+            Extra callback receiving each page of new users after it is checkpointed
+
+        Returns
+        -------
+        Void
+        """
+        if kind not in CRAWL_KINDS:
+            raise ValueError(f'Unknown crawl kind "{kind}", expected one of {CRAWL_KINDS}')
+        self.client = client
+        self.user_id = str(user_id)
+        self.kind = kind
+        self.page_size = page_size
+        self.rate_limit_sleep = rate_limit_sleep
+        self.max_retries = max_retries
+        self.sink = sink
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.state_dir / "state.json"
+        self.pks_path = self.state_dir / "pks.bin"
+        self.users_path = self.state_dir / "users.ndjson"
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        state = {
+            "user_id": self.user_id,
+            "kind": self.kind,
+            "cursor": "",
+            "done": False,
+            "pages": 0,
+            "count": 0,
+            "pks_bytes": 0,
+            "users_bytes": 0,
+            "updated_at": 0,
+        }
+        if self.state_path.exists():
+            with open(self.state_path) as fp:
+                state.update(json.load(fp))
+            if (state["user_id"], state["kind"]) != (self.user_id, self.kind):
+                raise ValueError(
+                    f"{self.state_dir} holds a crawl of {state['kind']} "
+                    f"for user {state['user_id']}"
+                )
+        # Drop whatever was written after the last checkpoint
+        for path, size in (
+            (self.pks_path, state["pks_bytes"]),
+            (self.users_path, state["users_bytes"]),
+        ):
+            with open(path, "ab") as fp:
+                fp.truncate(size)
+        return state
+
+    def _save_state(self):
+        self.state["updated_at"] = int(time.time())
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump(self.state, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    @property
+    def done(self) -> bool:
+        return self.state["done"]
+
+    @property
+    def cursor(self) -> str:
+        return self.state["cursor"]
+
+    @property
+    def count(self) -> int:
+        return self.state["count"]
+
+    def pks(self) -> array:
+        """
+        Pks collected so far, in crawl order
+
+        Returns
+        -------
+        array
+            Array of int64 pks
+        """
+        pks = array("q")
+        with open(self.pks_path, "rb") as fp:
+            pks.frombytes(fp.read(self.state["pks_bytes"]))
+        return pks
+
+    def pkset(self, usernames: bool = False) -> PkSet:
+        """
+        Users collected so far as a compact pk set
+
+        Parameters
+        ----------
+        usernames: bool, optional
+            Whether to load the username side table from the output, default value is False
+
+        Returns
+        -------
+        PkSet
+        """
+        if not usernames:
+            return PkSet(self.pks())
+        builder = PkSetBuilder()
+        with open(self.users_path, encoding="utf-8") as fp:
+            for line in fp:
+                user = json.loads(line)
+                builder.add(user["pk"], user.get("username"))
+        return builder.build()
+
+    def users(self) -> Iterator[UserShort]:
+        """
+        Iterate over users collected so far
+
+        Returns
+        -------
+        Iterator[UserShort]
+            Users in crawl order
+        """
+        with open(self.users_path, encoding="utf-8") as fp:
+            for line in fp:
+                yield UserShort(**json.loads(line))
+
+    def _fetch_page(self, cursor: str):
+        fetch_page = getattr(self.client, f"user_{self.kind}_v1_page")
+        retries = 0
+        while True:
+            try:
+                return fetch_page(self.user_id, cursor, self.page_size)
+            except RATE_LIMIT_ERRORS as e:
+                retries += 1
+                if retries > self.max_retries:
+                    raise e
+                self.client.logger.warning(
+                    "%s crawl of %s rate limited at page %d, pause %ds (%s)",
+                    self.kind,
+                    self.user_id,
+                    self.state["pages"],
+                    self.rate_limit_sleep,
+                    e,
+                )
+                time.sleep(self.rate_limit_sleep)
+
+    def run(self, max_pages: int = 0) -> Dict:
+        """
+        Crawl until the list is exhausted, checkpointing after every page
+
+        Parameters
+        ----------
+        max_pages: int, optional
+            Stop after this many pages in this run, default is 0 (no limit)
+
+        Returns
+        -------
+        Dict
+            Crawl state (cursor, done, pages, count)
+        """
+        # Pks of earlier pages stay in a compact PkSet, the ones added since the
+        # last merge in a small set, merged once it grows past 1/8 of the PkSet
+        seen, recent = PkSet(self.pks()), set()
+        pages = 0
+        with open(self.pks_path, "ab") as pks_fp, open(
+            self.users_path, "ab"
+        ) as users_fp:
+            while not self.state["done"]:
+                if max_pages and pages >= max_pages:
+                    break
+                users, next_cursor = self._fetch_page(self.state["cursor"])
+                new_users = []
+                for user in users:
+                    pk = int(user.pk)
+                    if pk in recent or pk in seen:
+                        continue
+                    recent.add(pk)
+                    new_users.append(user)
+                if len(recent) > max(len(seen) // 8, 10000):
+                    seen, recent = seen.union(PkSet(recent)), set()
+                users_fp.write(
+                    "".join(
+                        json.dumps(user.dict(), default=str) + "\n"
+                        for user in new_users
+                    ).encode("utf-8")
+                )
+                pks_fp.write(array("q", (int(user.pk) for user in new_users)).tobytes())
+                users_fp.flush()
+                pks_fp.flush()
+                os.fsync(users_fp.fileno())
+                os.fsync(pks_fp.fileno())
+                pages += 1
+                self.state.update(
+                    cursor=next_cursor or "",
+                    done=not next_cursor,
+                    pages=self.state["pages"] + 1,
+                    count=self.state["count"] + len(new_users),
+                    pks_bytes=pks_fp.tell(),
+                    users_bytes=users_fp.tell(),
+                )
+                self._save_state()
+                if self.sink and new_users:
+                    self.sink(new_users)
+        return dict(self.state)
+
+
+class CommentCrawler:
+    """
+    Resumable streaming crawler of comments on a media
+
+    Comments are fetched one page at a time and written to the output as
+    they arrive, so memory use does not grow with the number of comments.
+    With ``expand_replies`` the reply threads of comments having at least
+    ``min_replies`` replies on a page are fetched on ``reply_workers``
+    threads (requests still keep the client ``delay_range``).
+
+    Files in ``state_dir``:
+
+    - ``state.json``: cursor, counters and the output size, saved after every page
+    - ``comments.ndjson`` or ``comments.db`` (SQLite): one Comment per line / row,
+      replies have ``replied_to_comment_id`` set
+    - ``metrics.ndjson``: timings of every page (fetch, replies and write in ms)
+
+    An interrupted crawl resumes from the last completed page without
+    duplicates in the output.
+    """
+
+    def __init__(
+        self,
+        client,
+        media_id: str,
+        state_dir: Path,
+        output: str = "ndjson",
+        expand_replies: bool = False,
+        min_replies: int = 1,
+        reply_workers: int = 4,
+        rate_limit_sleep: int = 300,
+        max_retries: int = 3,
+        sink: Callable[[List[Comment]], None] = None,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        client: Client
+            Logged in instagrapi client
+        media_id: str
+            Unique identifier of a Media
+        state_dir: Path
+            Directory for the checkpoint, output and metrics files
+        output: str, optional
+            "ndjson" or "sqlite", default value is "ndjson"
+        expand_replies: bool, optional
+            Fetch the reply threads of comments, default value is False
+        min_replies: int, optional
+            Replies a comment needs for its thread to be fetched, default is 1
+        reply_workers: int, optional
+            Reply threads fetched concurrently, default is 4
+        rate_limit_sleep: int, optional
+            Seconds to pause after a rate limit error, default is 300
+        max_retries: int, optional
+            Rate limit pauses allowed in a row before giving up, default is 3
+        sink: Callable[[List[Comment]], None], optional
+            Extra callback receiving each page of new comments and replies after it is checkpointed
+
+        Returns
+        -------
+        Void
+        """
+        if output not in COMMENT_OUTPUTS:
+            raise ValueError(f'Unknown output "{output}", expected one of {COMMENT_OUTPUTS}')
+        self.client = client
+        self.media_id = client.media_id(media_id)
+        self.output = output
+        self.expand_replies = expand_replies
+        self.min_replies = max(int(min_replies), 1)
+        self.reply_workers = max(int(reply_workers), 1)
+        self.rate_limit_sleep = rate_limit_sleep
+        self.max_retries = max_retries
+        self.sink = sink
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.state_dir / "state.json"
+        self.output_path = self.state_dir / (
+            "comments.ndjson" if output == "ndjson" else "comments.db"
+        )
+        self.metrics_path = self.state_dir / "metrics.ndjson"
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict:
+        state = {
+            "media_id": self.media_id,
+            "cursor": "",
+            "done": False,
+            "pages": 0,
+            "count": 0,
+            "replies": 0,
+            "output_bytes": 0,
+            "fetch_seconds": 0.0,
+            "updated_at": 0,
+        }
+        if self.state_path.exists():
+            with open(self.state_path) as fp:
+                state.update(json.load(fp))
+            if state["media_id"] != self.media_id:
+                raise ValueError(
+                    f"{self.state_dir} holds a crawl of comments on {state['media_id']}"
+                )
+        return state
+
+    def _save_state(self):
+        self.state["updated_at"] = int(time.time())
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as fp:
+            json.dump(self.state, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    @property
+    def done(self) -> bool:
+        return self.state["done"]
+
+    @property
+    def cursor(self) -> str:
+        return self.state["cursor"]
+
+    @property
+    def count(self) -> int:
+        return self.state["count"]
+
+    def comments(self) -> Iterator[Comment]:
+        """
+        Iterate over comments and replies collected so far
+
+        Returns
+        -------
+        Iterator[Comment]
+            Comments in crawl order, each page followed by its replies
+        """
+        if self.output == "sqlite":
+            db = sqlite3.connect(str(self.output_path))
+            try:
+                for (data,) in db.execute("SELECT data FROM comments ORDER BY rowid"):
+                    yield Comment(**json.loads(data))
+            finally:
+                db.close()
+            return
+        # Bytes past the checkpoint belong to an interrupted page and are skipped
+        remaining = self.state["output_bytes"]
+        with open(self.output_path, "rb") as fp:
+            for line in fp:
+                remaining -= len(line)
+                if remaining < 0:
+                    break
+                yield Comment(**json.loads(line))
+
+    def metrics(self) -> Iterator[Dict]:
+        """
+        Iterate over per page timings
+
+        Returns
+        -------
+        Iterator[Dict]
+            page, comments, replies, fetch_ms, replies_ms, write_ms and at (timestamp)
+        """
+        if not self.metrics_path.exists():
+            return
+        with open(self.metrics_path, encoding="utf-8") as fp:
+            for line in fp:
+                yield json.loads(line)
+
+    def _call(self, fetch_page: Callable, *args):
+        retries = 0
+        while True:
+            try:
+                return fetch_page(*args)
+            except RATE_LIMIT_ERRORS as e:
+                retries += 1
+                if retries > self.max_retries:
+                    raise e
+                self.client.logger.warning(
+                    "Comments crawl of %s rate limited at page %d, pause %ds (%s)",
+                    self.media_id,
+                    self.state["pages"],
+                    self.rate_limit_sleep,
+                    e,
+                )
+                time.sleep(self.rate_limit_sleep)
+
+    def _replies(self, comment: Comment) -> List[Comment]:
+        replies, cursor = [], ""
+        while True:
+            page, cursor = self._call(
+                self.client.comment_replies_v1_page, self.media_id, comment.pk, cursor
+            )
+            replies.extend(page)
+            if not cursor:
+                return replies
+
+    def _open_output(self):
+        if self.output == "sqlite":
+            return _SqliteCommentOutput(self.output_path, self.media_id)
+        return _NdjsonCommentOutput(self.output_path, self.state["output_bytes"])
+
+    def run(self, max_pages: int = 0) -> Dict:
+        """
+        Crawl until all comments are fetched, checkpointing after every page
+
+        Parameters
+        ----------
+        max_pages: int, optional
+            Stop after this many pages in this run, default is 0 (no limit)
+
+        Returns
+        -------
+        Dict
+            Crawl state (cursor, done, pages, count, replies)
+        """
+        pages = 0
+        output = self._open_output()
+        executor = None
+        if self.expand_replies:
+            executor = ThreadPoolExecutor(
+                max_workers=self.reply_workers, thread_name_prefix="instagrapi-comments"
+            )
+        try:
+            while not self.state["done"]:
+                if max_pages and pages >= max_pages:
+                    break
+                started = time.perf_counter()
+                comments, next_cursor = self._call(
+                    self.client.media_comments_v1_page, self.media_id, self.state["cursor"]
+                )
+                fetched = time.perf_counter()
+                replies = []
+                if executor:
+                    threads = [
+                        comment
+                        for comment in comments
+                        if (comment.child_comment_count or 0) >= self.min_replies
+                    ]
+                    for page in executor.map(self._replies, threads):
+                        replies.extend(page)
+                expanded = time.perf_counter()
+                new_comments = output.write(comments + replies)
+                written = time.perf_counter()
+                new_replies = sum(1 for comment in new_comments if comment.replied_to_comment_id)
+                pages += 1
+                self.state.update(
+                    cursor=next_cursor or "",
+                    done=not next_cursor,
+                    pages=self.state["pages"] + 1,
+                    count=self.state["count"] + len(new_comments) - new_replies,
+                    replies=self.state["replies"] + new_replies,
+                    output_bytes=output.tell(),
+                    fetch_seconds=round(self.state["fetch_seconds"] + expanded - started, 3),
+                )
+                self._save_state()
+                self._log_metrics(
+                    {
+                        "page": self.state["pages"],
+                        "comments": len(comments),
+                        "replies": len(replies),
+                        "fetch_ms": round((fetched - started) * 1000, 1),
+                        "replies_ms": round((expanded - fetched) * 1000, 1),
+                        "write_ms": round((written - expanded) * 1000, 1),
+                        "at": int(time.time()),
+                    }
+                )
+                if self.sink and new_comments:
+                    self.sink(new_comments)
+        finally:
+            if executor:
+                executor.shutdown()
+            output.close()
+        return dict(self.state)
+
+    def _log_metrics(self, record: Dict):
+        with open(self.metrics_path, "a", encoding="utf-8") as fp:
+            fp.write(json.dumps(record) + "\n")
+
+
+class _NdjsonCommentOutput:
+    """
+    Append-only NDJSON file truncated back to the last checkpoint on open
+
+    A replayed page was never part of the checkpointed output, so only
+    duplicates within one page (a reply also listed as a comment) are dropped.
+    """
+
+    def __init__(self, path: Path, size: int):
+        with open(path, "ab") as fp:
+            fp.truncate(size)
+        self.fp = open(path, "ab")
+
+    def write(self, comments: List[Comment]) -> List[Comment]:
+        new_comments, seen = [], set()
+        for comment in comments:
+            if comment.pk not in seen:
+                seen.add(comment.pk)
+                new_comments.append(comment)
+        self.fp.write(
+            "".join(
+                json.dumps(comment.dict(), default=str) + "\n" for comment in new_comments
+            ).encode("utf-8")
+        )
+        self.fp.flush()
+        os.fsync(self.fp.fileno())
+        return new_comments
+
+    def tell(self) -> int:
+        return self.fp.tell()
+
+    def close(self):
+        self.fp.close()
+
+
+class _SqliteCommentOutput:
+    """SQLite table keyed by comment pk, so a replayed page adds nothing"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS comments (
+        pk TEXT PRIMARY KEY,
+        media_id TEXT,
+        replied_to_comment_id TEXT,
+        user_pk TEXT,
+        username TEXT,
+        created_at INTEGER,
+        like_count INTEGER,
+        child_comment_count INTEGER,
+        text TEXT,
+        data TEXT  -- Comment JSON
+    );
+    CREATE INDEX IF NOT EXISTS comments_parent ON comments (replied_to_comment_id);
+    """
+
+    def __init__(self, path: Path, media_id: str):
+        self.media_id = media_id
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(self.SCHEMA)
+
+    def write(self, comments: List[Comment]) -> List[Comment]:
+        new_comments = []
+        with self.db:
+            for comment in comments:
+                cursor = self.db.execute(
+                    "INSERT OR IGNORE INTO comments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        comment.pk,
+                        self.media_id,
+                        comment.replied_to_comment_id,
+                        comment.user.pk,
+                        comment.user.username,
+                        int(comment.created_at_utc.timestamp()),
+                        comment.like_count,
+                        comment.child_comment_count,
+                        comment.text,
+                        json.dumps(comment.dict(), default=str),
+                    ),
+                )
+                if cursor.rowcount:
+                    new_comments.append(comment)
+        return new_comments
+
+    def tell(self) -> int:
+        return 0
+
+    def close(self):
+        self.db.close()
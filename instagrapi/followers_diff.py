@@ -0,0 +1,195 @@
+import shutil
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from instagrapi.crawler import CRAWL_KINDS, FollowCrawler
+from instagrapi.pkset import PkSet, PkSetBuilder
+
+
+class FollowersDiff(NamedTuple):
+    user_id: str
+    kind: str
+    new: PkSet  # with usernames
+    lost: PkSet
+    total: int
+    pages: int
+    full: bool  # whether the whole list was crawled
+
+
+class FollowersDiffTracker:
+    """
+    Tracks followers (or following) of accounts between runs
+
+    Every run stores a compact PkSet snapshot in ``state_dir``. The next run
+    reads the list newest-first and stops at the first page made only of
+    already-known users, so a daily diff usually costs a few pages. The
+    count from ``user_info_v1`` tells whether anybody left: only then the
+    full list is crawled (resumable, via FollowCrawler) to find who.
+
+    Any excess of known users over the counter means somebody left. With
+    ``count_tolerance`` (a fraction of the counter) a small excess is
+    accepted to ride out lagging counters, but users who left within it are
+    not reported and stay in the snapshot until a full crawl.
+    """
+
+    def __init__(
+        self,
+        client,
+        state_dir: Path,
+        kind: str = "followers",
+        keep_snapshots: int = 7,
+        verify_count: bool = True,
+        count_tolerance: float = 0,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        client: Client
+            Logged in instagrapi client
+        state_dir: Path
+            Directory for snapshots
+        kind: str, optional
+            "followers" or "following", default value is "followers"
+        keep_snapshots: int, optional
+            Snapshots kept per account, default is 7
+        verify_count: bool, optional
+            Compare with the profile counter to detect lost users, default value is True.
+            When False, lost users are only reported after a full crawl
+        count_tolerance: float, optional
+            Allowed excess of known users over the profile counter, as a fraction of it,
+            default is 0 (every excess triggers a full crawl)
+
+        Returns
+        -------
+        Void
+        """
+        if kind not in CRAWL_KINDS:
+            raise ValueError(f'Unknown kind "{kind}", expected one of {CRAWL_KINDS}')
+        self.client = client
+        self.state_dir = Path(state_dir)
+        self.kind = kind
+        self.keep_snapshots = max(int(keep_snapshots), 1)
+        self.verify_count = verify_count
+        self.count_tolerance = count_tolerance
+
+    def _user_dir(self, user_id: str) -> Path:
+        path = self.state_dir / str(user_id) / self.kind
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def snapshots(self, user_id: str) -> List[Path]:
+        """
+        Snapshot files of an account, oldest first
+
+        Parameters
+        ----------
+        user_id: str
+            User id of an instagram account
+
+        Returns
+        -------
+        List[Path]
+        """
+        return sorted(self._user_dir(user_id).glob("*.pkset"))
+
+    def last_snapshot(self, user_id: str) -> Optional[PkSet]:
+        """
+        Latest stored snapshot of an account
+
+        Parameters
+        ----------
+        user_id: str
+            User id of an instagram account
+
+        Returns
+        -------
+        Optional[PkSet]
+            None when the account was never tracked
+        """
+        snapshots = self.snapshots(user_id)
+        return PkSet.load(snapshots[-1]) if snapshots else None
+
+    def _save_snapshot(self, user_id: str, pks: PkSet):
+        path = self._user_dir(user_id) / time.strftime("%Y%m%dT%H%M%S.pkset", time.gmtime())
+        pks.save(path)
+        for stale in self.snapshots(user_id)[: -self.keep_snapshots]:
+            stale.unlink()
+
+    def _count(self, user_id: str) -> int:
+        user = self.client.user_info_v1(user_id)
+        return user.follower_count if self.kind == "followers" else user.following_count
+
+    def _somebody_left(self, user_id: str, known: int) -> bool:
+        count = self._count(user_id)
+        return known - count > int(count * self.count_tolerance)
+
+    def _full_crawl(self, user_id: str) -> Tuple[FollowCrawler, int]:
+        """Crawler after a complete crawl and the pages requested in this run"""
+        crawl_dir = self._user_dir(user_id) / "crawl"
+        crawler = FollowCrawler(self.client, user_id, crawl_dir, kind=self.kind)
+        resumed_pages = crawler.state["pages"]
+        crawler.run()
+        return crawler, crawler.state["pages"] - resumed_pages
+
+    def diff(self, user_id: str, full: bool = False) -> FollowersDiff:
+        """
+        Fetch the current list and compare it with the last snapshot
+
+        Parameters
+        ----------
+        user_id: str
+            User id of an instagram account
+        full: bool, optional
+            Crawl the whole list instead of stopping at known users, default value is False
+
+        Returns
+        -------
+        FollowersDiff
+            New and lost users, the new snapshot is stored.
+            The first run of an account only stores the baseline
+        """
+        user_id = str(user_id)
+        previous = self.last_snapshot(user_id)
+        if previous is None:
+            full = True
+        fetch_page = getattr(self.client, f"user_{self.kind}_v1_page")
+        head = PkSetBuilder()
+        pages = 0
+        if not full:
+            max_id = ""
+            while True:
+                users, max_id = fetch_page(user_id, max_id)
+                pages += 1
+                head.extend(users)
+                if not max_id or all(int(user.pk) in previous for user in users):
+                    break
+            head = head.build()
+            new = head.difference(previous)
+            current = previous.union(new)
+            if self.verify_count and self._somebody_left(user_id, len(current)):
+                full = True  # somebody left, find out who
+            else:
+                lost = PkSet()
+        if full:
+            crawler, crawl_pages = self._full_crawl(user_id)
+            pages += crawl_pages
+            current = crawler.pkset(usernames=True)
+            if previous is None:
+                new, lost = PkSet(), PkSet()
+            else:
+                new = current.difference(previous)
+                lost = previous.difference(current)
+            shutil.rmtree(crawler.state_dir)
+        self._save_snapshot(user_id, current)
+        return FollowersDiff(
+            user_id=user_id,
+            kind=self.kind,
+            new=new,
+            lost=lost,
+            total=len(current),
+            pages=pages,
+            full=full,
+        )
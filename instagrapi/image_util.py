@@ -3,11 +3,16 @@
 # This software is released under the MIT License.
 # https://opensource.org/licenses/MIT
 
+import atexit
 import io
+import mmap
 import os
 import re
 import shutil
+import subprocess
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Tuple
 
 try:
     from PIL import Image
@@ -16,6 +21,12 @@ except ImportError:
 
 import requests
 
+from instagrapi.video_probe import ProbeError, VideoInfo, extract_thumbnail, ffmpeg_exe, probe_mp4
+
+# Sources in these codecs are posted as they are when no crop, resize or trim is needed
+PASSTHROUGH_VIDEO_CODECS = ("avc1", "avc3")
+PASSTHROUGH_AUDIO_CODECS = (None, "mp4a")
+
 
 def calc_resize(max_size, curr_size, min_size=(0, 0)):
     """
@@ -107,6 +118,97 @@ def is_remote(media):
     return False
 
 
+class PreparedImage(NamedTuple):
+    data: bytes  # JPEG encoded
+    size: Tuple[int, int]  # of the encoded image
+    original_size: Tuple[int, int]
+    format: str  # format of the source, e.g. "JPEG"
+    mode: str  # mode of the source, e.g. "RGB"
+
+
+def process_image(
+    img,
+    max_size=(1080, 1350),
+    aspect_ratios=(4.0 / 5.0, 90.0 / 47.0),
+    min_size=(320, 167),
+    save_path=None,
+    draft=True,
+):
+    """
+    Crops, resizes and JPEG encodes an image with a single decode.
+
+    JPEG sources much larger than the target are decoded at 1/2, 1/4 or
+    1/8 scale directly from the DCT coefficients (``Image.draft``), and the
+    crop is folded into the resize (``box``) so no full-size copy is made.
+    Downscaling uses LANCZOS with ``reducing_gap``, upscaling BICUBIC.
+
+    :param img: file path or url
+    :param max_size: tuple of (max_width,  max_height)
+    :param aspect_ratios: single float value or tuple of (min_ratio, max_ratio)
+    :param min_size: tuple of (min_width,  min_height)
+    :param save_path: optional output file path
+    :param draft: allow reduced-scale JPEG decoding
+    :return: PreparedImage
+    """
+    if is_remote(img):
+        res = requests.get(img, timeout=5)
+        im = Image.open(io.BytesIO(res.content))
+    else:
+        im = Image.open(img)
+
+    with im:
+        original_size = im.size
+        source_format, source_mode = im.format, im.mode
+        box = (0, 0) + original_size
+        if aspect_ratios:
+            box = calc_crop(aspect_ratios, original_size) or box
+        box_size = (box[2] - box[0], box[3] - box[1])
+        new_size = calc_resize(max_size, box_size, min_size=min_size)
+
+        if draft and new_size and source_format == "JPEG":
+            # Ask for the smallest DCT scale that still covers the target
+            scale = max(new_size[0] / box_size[0], new_size[1] / box_size[1])
+            if scale < 0.5:
+                im.draft(
+                    "RGB",
+                    (int(original_size[0] * scale), int(original_size[1] * scale)),
+                )
+                ratio_x = im.size[0] / original_size[0]
+                ratio_y = im.size[1] / original_size[1]
+                box = (
+                    box[0] * ratio_x,
+                    box[1] * ratio_y,
+                    box[2] * ratio_x,
+                    box[3] * ratio_y,
+                )
+
+        if new_size:
+            downscale = new_size[0] < box[2] - box[0]
+            out = im.resize(
+                new_size,
+                resample=Image.LANCZOS if downscale else Image.BICUBIC,
+                box=box,
+                reducing_gap=3.0 if downscale else None,
+            )
+        elif box != (0, 0) + original_size:
+            out = im.crop(box)
+        else:
+            out = im.copy()
+
+    if out.mode != "RGB":
+        # Removes transparency (alpha)
+        out = out.convert("RGBA")
+        im2 = Image.new("RGB", out.size, (255, 255, 255))
+        im2.paste(out, (0, 0), out)
+        out = im2
+    if save_path:
+        out.save(save_path)
+
+    b = io.BytesIO()
+    out.save(b, "JPEG")
+    return PreparedImage(b.getvalue(), out.size, original_size, source_format, source_mode)
+
+
 def prepare_image(
     img,
     max_size=(1080, 1350),
@@ -127,33 +229,286 @@ def prepare_image(
     :return:
     """
     min_size = kwargs.pop("min_size", (320, 167))
-    if is_remote(img):
-        res = requests.get(img, timeout=5)
-        im = Image.open(io.BytesIO(res.content))
-    else:
-        im = Image.open(img)
+    prepared = process_image(
+        img,
+        max_size=max_size,
+        aspect_ratios=aspect_ratios,
+        min_size=min_size,
+        save_path=save_path,
+    )
+    return prepared.data, prepared.size
 
-    if aspect_ratios:
-        crop_box = calc_crop(aspect_ratios, im.size)
-        if crop_box:
-            im = im.crop(crop_box)
 
-    new_size = calc_resize(max_size, im.size, min_size=min_size)
-    if new_size:
-        im = im.resize(new_size)
+def _benchmark_images(paths, draft):
+    """CPU seconds and peak RSS (MB) of process_image over paths, run in a fresh process"""
+    import resource
+    import time
 
-    if im.mode != "RGB":
-        # Removes transparency (alpha)
-        im = im.convert("RGBA")
-        im2 = Image.new("RGB", im.size, (255, 255, 255))
-        im2.paste(im, (0, 0), im)
-        im = im2
-    if save_path:
-        im.save(save_path)
+    start = time.process_time()
+    for path in paths:
+        process_image(path, draft=draft)
+    cpu = time.process_time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return cpu, peak
 
-    b = io.BytesIO()
-    im.save(b, "JPEG")
-    return b.getvalue(), im.size
+
+# Temp files of PreparedVideo not cleaned up yet, removed at exit at the latest
+_temp_files = set()
+
+
+@atexit.register
+def _remove_temp_files():
+    for path in list(_temp_files):
+        _remove_temp_file(path)
+
+
+def _remove_temp_file(path):
+    _temp_files.discard(path)
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+class PreparedVideo(NamedTuple):
+    """
+    Result of transcode_video, file-backed so nothing is loaded into memory.
+
+    ``path`` and ``thumbnail`` can be passed straight to the upload methods
+    (``video_upload(Path(v.path), caption, thumbnail=Path(v.thumbnail))``),
+    which stream them from disk. Use it as a context manager, or call
+    ``cleanup``, to remove the temp files.
+    """
+
+    path: str  # MP4 ready for upload
+    size: Tuple[int, int]
+    duration: float
+    thumbnail: str  # JPEG
+    reencoded: bool
+    temp_files: Tuple[str, ...]  # created by transcode_video, removed by cleanup
+
+    def open(self):
+        """Binary file handle of the video"""
+        return open(self.path, "rb")
+
+    def map(self):
+        """Read-only memory map of the video, a bytes-like object backed by the page cache"""
+        with open(self.path, "rb") as fp:
+            return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def cleanup(self):
+        """Remove the temp files (the source and ``save_path`` are never removed)"""
+        for path in self.temp_files:
+            _remove_temp_file(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
+
+
+def _mkstemp(suffix):
+    fd, path = tempfile.mkstemp(prefix="ipae_", suffix=suffix)
+    os.close(fd)
+    _temp_files.add(path)
+    return path
+
+
+def download_video(url, timeout=30, chunk_size=256 * 1024):
+    """
+    Streams a remote video to a temporary file.
+
+    :param url: video url
+    :param timeout: seconds to connect / between received chunks
+    :param chunk_size: bytes per read
+    :return: temporary file path
+    """
+    path = _mkstemp(".mp4")
+    try:
+        with open(path, "wb") as fp, requests.get(url, stream=True, timeout=timeout) as res:
+            res.raise_for_status()
+            for chunk in res.iter_content(chunk_size=chunk_size):
+                fp.write(chunk)
+    except BaseException:
+        _remove_temp_file(path)
+        raise
+    return path
+
+
+def probe_video(path):
+    """
+    Size, duration and codecs of a video, from the MP4 container when possible.
+
+    :param path: file path
+    :return: VideoInfo
+    """
+    try:
+        return probe_mp4(path)
+    except ProbeError:
+        # not an ISO media file (webm, avi...), ask ffmpeg and always re-encode
+        from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+        infos = ffmpeg_parse_infos(path)
+        width, height = infos["video_size"]
+        return VideoInfo(width, height, infos["duration"], "", 0, ())
+
+
+def transcode_video(
+    vid,
+    thumbnail_frame_ts=0.0,
+    max_size=(1080, 1350),
+    aspect_ratios=(4.0 / 5.0, 90.0 / 47.0),
+    max_duration=60.0,
+    save_path=None,
+    skip_reencoding=True,
+    min_size=(612, 320),
+    preset="medium",
+    threads=0,
+    download_timeout=30,
+):
+    """
+    Prepares a video file for posting, re-encoding it only when needed.
+
+    The source is probed from its container (codec, size, rotation,
+    duration) without decoding. When it is already H.264/AAC within the
+    duration, aspect ratio and size limits it is used as it is, otherwise
+    ffmpeg trims, crops and scales it in one pass. Remote sources are
+    streamed to disk.
+
+    :param vid: file path or url
+    :param thumbnail_frame_ts: the frame of clip corresponding to time t (in seconds) to be used as the thumbnail
+    :param max_size: tuple of (max_width,  max_height)
+    :param aspect_ratios: single float value or tuple of (min_ratio, max_ratio)
+    :param max_duration: maximum video duration in seconds
+    :param save_path: optional output video file path
+    :param skip_reencoding: if set to False, the file is always re-encoded
+    :param min_size: tuple of (min_width,  min_height)
+    :param preset: x264 preset, see prepare_video
+    :param threads: ffmpeg threads, 0 lets ffmpeg decide
+    :param download_timeout: seconds to connect / between received chunks for urls
+    :return: PreparedVideo
+    """
+    if save_path and not save_path.lower().endswith(".mp4"):
+        raise ValueError("You must specify a .mp4 save path")
+    temp_files = []
+    try:
+        if is_remote(vid):
+            source = download_video(vid, timeout=download_timeout)
+            temp_files.append(source)
+        else:
+            source = vid
+        info = probe_video(source)
+
+        if info.duration < 3 * 1.0:
+            raise ValueError("Duration is too short")
+        duration = min(info.duration, max_duration)
+        if thumbnail_frame_ts > duration:
+            raise ValueError("Invalid thumbnail frame")
+
+        filters = []
+        size = (info.width, info.height)
+        if aspect_ratios:
+            crop_box = calc_crop(aspect_ratios, size)
+            if crop_box:
+                size = (crop_box[2] - crop_box[0], crop_box[3] - crop_box[1])
+                filters.append("crop={0}:{1}:{2}:{3}".format(*size, *crop_box[:2]))
+        new_size = None
+        if max_size or min_size:
+            new_size = calc_resize(max_size, size, min_size=min_size)
+        new_size = new_size or size
+        new_size = (new_size[0] - new_size[0] % 2, new_size[1] - new_size[1] % 2)  # for yuv420p
+        if new_size != size:
+            size = new_size
+            filters.append("scale={0}:{1},setsar=1".format(*size))
+
+        reencode = (
+            not skip_reencoding
+            or bool(filters)
+            or info.duration > max_duration
+            or info.rotation != 0
+            or info.codec not in PASSTHROUGH_VIDEO_CODECS
+            or info.audio_codec not in PASSTHROUGH_AUDIO_CODECS
+        )
+        if save_path:
+            output = save_path
+        elif reencode:
+            output = _mkstemp(".mp4")
+            temp_files.append(output)
+        else:
+            output = source
+        if reencode:
+            cmd = [ffmpeg_exe(), "-v", "error", "-y", "-i", source]
+            if info.duration > max_duration:
+                cmd += ["-t", "{0:.3f}".format(max_duration)]
+            cmd += ["-map", "0:v:0", "-map", "0:a:0?"]
+            if filters:
+                cmd += ["-vf", ",".join(filters)]
+            cmd += [
+                "-c:v", "libx264", "-preset", preset, "-pix_fmt", "yuv420p",
+                "-c:a", "aac", "-movflags", "+faststart",
+                "-threads", str(threads), output,
+            ]
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        elif output != source:
+            shutil.copyfile(source, output)
+
+        thumbnail = _mkstemp(".jpg")
+        temp_files.append(thumbnail)
+        extract_thumbnail(output, thumbnail, thumbnail_frame_ts)
+    except BaseException:
+        for path in temp_files:
+            _remove_temp_file(path)
+        raise
+    if source in temp_files and source != output:
+        # the downloaded source is not needed anymore
+        temp_files.remove(source)
+        _remove_temp_file(source)
+    return PreparedVideo(output, size, duration, thumbnail, reencode, tuple(temp_files))
+
+
+def _transcode_job(args):
+    vid, options = args
+    try:
+        prepared = transcode_video(vid, **options)
+    except Exception as e:
+        return e
+    # the parent process owns the temp files now, the worker must not remove them at exit
+    _temp_files.difference_update(prepared.temp_files)
+    return prepared
+
+
+def transcode_videos(videos, workers=None, return_exceptions=False, **options):
+    """
+    Prepares a batch of videos across a process pool.
+
+    Each worker runs one ffmpeg at a time, given ``cpu_count / workers``
+    threads, so the batch keeps every core busy.
+
+    :param videos: file paths or urls
+    :param workers: concurrent transcodes, default is the number of CPUs
+    :param return_exceptions: return errors in place of failed videos instead of raising the first one
+    :param options: transcode_video arguments
+    :return: list of PreparedVideo, in the order of ``videos``
+    """
+    videos = list(videos)
+    if not videos:
+        return []
+    cpus = os.cpu_count() or 1
+    workers = max(min(int(workers or cpus), len(videos)), 1)
+    options.setdefault("threads", max(cpus // workers, 1))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_transcode_job, [(vid, options) for vid in videos]))
+    for result in results:
+        if isinstance(result, PreparedVideo):
+            _temp_files.update(result.temp_files)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors and not return_exceptions:
+        for result in results:
+            if isinstance(result, PreparedVideo):
+                result.cleanup()
+        raise errors[0]
+    return results
 
 
 def prepare_video(
@@ -180,114 +535,56 @@ def prepare_video(
         if there are no modifications required. Default: False.
     :param kwargs:
          - **min_size**: tuple of (min_width,  min_height)
-         - **progress_bar**: bool flag to show/hide progress bar
+         - **progress_bar**: ignored, kept for compatibility
          - **save_only**: bool flag to return only the path to the saved video file. Requires save_path be set.
+         - **as_file**: bool flag to return the PreparedVideo (file paths) instead of
+           reading the video and the thumbnail into memory. Use it with ``with`` to
+           remove the temp files.
          - **preset**: Sets the time that FFMPEG will spend optimizing the compression.
          Choices are: ultrafast, superfast, veryfast, faster, fast, medium,
          slow, slower, veryslow, placebo. Note that this does not impact
          the quality of the video, only the size of the video file. So
          choose ultrafast when you are in a hurry and file size does not matter.
-    :return:
+    :return: (video content, size, duration, thumbnail content), or PreparedVideo with as_file
     """
-    from moviepy.video.fx.all import crop, resize
-    from moviepy.video.io.VideoFileClip import VideoFileClip
-
     min_size = kwargs.pop("min_size", (612, 320))
-    progress_bar = True if kwargs.pop("progress_bar", None) else False
+    kwargs.pop("progress_bar", None)
     save_only = kwargs.pop("save_only", False)
+    as_file = kwargs.pop("as_file", False)
     preset = kwargs.pop("preset", "medium")
     if save_only and not save_path:
         raise ValueError('"save_path" cannot be empty.')
-    if save_path:
-        if not save_path.lower().endswith(".mp4"):
-            raise ValueError("You must specify a .mp4 save path")
-
-    vid_is_modified = False  # flag to track if re-encoding can be skipped
-
-    temp_video_file = tempfile.NamedTemporaryFile(
-        prefix="ipae_", suffix=".mp4", delete=False
-    )
-
-    if is_remote(vid):
-        # Download remote file
-        res = requests.get(vid, timeout=5)
-        temp_video_file.write(res.content)
-        video_src_filename = temp_video_file.name
-    else:
-        shutil.copyfile(vid, temp_video_file.name)
-        video_src_filename = vid
-
-    vidclip = VideoFileClip(temp_video_file.name)
-
-    if vidclip.duration < 3 * 1.0:
-        raise ValueError("Duration is too short")
-
-    if vidclip.duration > max_duration * 1.0:
-        vidclip = vidclip.subclip(0, max_duration)
-        vid_is_modified = True
-
-    if thumbnail_frame_ts > vidclip.duration:
-        raise ValueError("Invalid thumbnail frame")
-
-    if aspect_ratios:
-        crop_box = calc_crop(aspect_ratios, vidclip.size)
-        if crop_box:
-            vidclip = crop(
-                vidclip, x1=crop_box[0], y1=crop_box[1], x2=crop_box[2], y2=crop_box[3]
-            )
-            vid_is_modified = True
-
-    if max_size or min_size:
-        new_size = calc_resize(max_size, vidclip.size, min_size=min_size)
-        if new_size:
-            vidclip = resize(vidclip, newsize=new_size)
-            vid_is_modified = True
 
-    temp_vid_output_file = tempfile.NamedTemporaryFile(
-        prefix="ipae_", suffix=".mp4", delete=False
+    prepared = transcode_video(
+        vid,
+        thumbnail_frame_ts=thumbnail_frame_ts,
+        max_size=max_size,
+        aspect_ratios=aspect_ratios,
+        max_duration=max_duration,
+        save_path=save_path,
+        skip_reencoding=skip_reencoding,
+        min_size=min_size,
+        preset=preset,
     )
-    if vid_is_modified or not skip_reencoding:
-        # write out
-        vidclip.write_videofile(
-            temp_vid_output_file.name,
-            codec="libx264",
-            audio=True,
-            audio_codec="aac",
-            verbose=False,
-            progress_bar=progress_bar,
-            preset=preset,
-            remove_temp=True,
-        )
-    else:
-        # no reencoding
-        shutil.copyfile(video_src_filename, temp_vid_output_file.name)
-
-    if save_path:
-        shutil.copyfile(temp_vid_output_file.name, save_path)
-
-    # Temp thumbnail img filename
-    temp_thumbnail_file = tempfile.NamedTemporaryFile(
-        prefix="ipae_", suffix=".jpg", delete=False
-    )
-    vidclip.save_frame(temp_thumbnail_file.name, t=thumbnail_frame_ts)
-
-    video_duration = vidclip.duration
-    video_size = vidclip.size
-    del vidclip  # clear it out
-
-    video_thumbnail_content = temp_thumbnail_file.read()
-
-    if not save_only:
-        video_content_len = os.path.getsize(temp_vid_output_file.name)
-        video_content = temp_vid_output_file.read()
-    else:
-        video_content_len = os.path.getsize(save_path)
-        video_content = save_path  # return the file path instead
-
-    if video_content_len > 50 * 1024 * 1000:
-        raise ValueError("Video file is too big.")
+    try:
+        video_content_len = os.path.getsize(prepared.path)
+        if video_content_len > 50 * 1024 * 1000:
+            raise ValueError("Video file is too big.")
+        if as_file:
+            return prepared
+        with open(prepared.thumbnail, "rb") as fp:
+            video_thumbnail_content = fp.read()
+        if save_only:
+            video_content = save_path  # return the file path instead
+        else:
+            with open(prepared.path, "rb") as fp:
+                video_content = fp.read()
+    except BaseException:
+        prepared.cleanup()
+        raise
+    prepared.cleanup()
 
-    return video_content, video_size, video_duration, video_thumbnail_content
+    return video_content, prepared.size, prepared.duration, video_thumbnail_content
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -298,9 +595,27 @@ if __name__ == "__main__":  # pragma: no cover
     parser.add_argument("-i", "--image", dest="image", type=str)
     parser.add_argument("-v", "--video", dest="video", type=str)
     parser.add_argument("-video-story", dest="videostory", type=str)
+    parser.add_argument("-b", "--benchmark", dest="benchmark", type=str,
+                        help="directory of phone camera images to time process_image on")
 
     args = parser.parse_args()
 
+    if args.benchmark:
+        paths = sorted(
+            os.path.join(args.benchmark, name)
+            for name in os.listdir(args.benchmark)
+            if name.lower().endswith((".jpg", ".jpeg", ".png", ".webp"))
+        )
+        print("Benchmark of {0:d} images".format(len(paths)))
+        for label, draft in (("full decode", False), ("draft decode", True)):
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                cpu, peak = executor.submit(_benchmark_images, paths, draft).result()
+            print(
+                "{0}: cpu {1:.2f}s ({2:.1f}ms/image), peak RSS {3:.0f}MB".format(
+                    label, cpu, 1000 * cpu / max(len(paths), 1), peak
+                )
+            )
+
     if args.image:
         photo_data, size = prepare_image(
             args.image, max_size=(1000, 800), aspect_ratios=0.9
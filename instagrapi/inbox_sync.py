@@ -0,0 +1,383 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from instagrapi.exceptions import ClientNotFoundError, DirectThreadNotFound
+from instagrapi.extractors import extract_direct_message
+from instagrapi.types import DirectMessage
+
+INBOX_PAGE_SIZE = 20
+THREAD_PAGE_SIZE = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    thread_v2_id TEXT,
+    thread_title TEXT,
+    is_group INTEGER,
+    users TEXT,  -- JSON list of {pk, username, full_name}
+    last_activity_at INTEGER,  -- microseconds, as sent by Instagram
+    newest_item_id TEXT,
+    newest_timestamp INTEGER,  -- microseconds
+    oldest_cursor TEXT,  -- to fetch older history, NULL when complete
+    synced_at INTEGER
+);
+CREATE TABLE IF NOT EXISTS messages (
+    item_id TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    user_id TEXT,
+    timestamp INTEGER,  -- microseconds
+    item_type TEXT,
+    text TEXT,
+    data TEXT  -- raw item JSON
+);
+CREATE INDEX IF NOT EXISTS messages_thread ON messages (thread_id, timestamp);
+"""
+
+# Full-text index over messages.text, kept up to date by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE messages_fts USING fts5 (
+    text, content='messages', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+CREATE TRIGGER messages_fts_update AFTER UPDATE OF text ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+    INSERT INTO messages_fts (rowid, text) VALUES (new.rowid, new.text);
+END;
+INSERT INTO messages_fts (messages_fts) VALUES ('rebuild');
+"""
+
+
+class InboxSync:
+    """
+    Incremental sync of the direct inbox into a local SQLite store
+
+    The inbox is ordered by ``last_activity_at``, so a sync pages through it
+    only until the first thread whose activity did not change since the
+    previous sync (pinned threads aside). For every changed thread only the
+    messages newer than the stored newest item are fetched: from the items
+    embedded in the inbox page when they reach back far enough, otherwise
+    from the thread endpoint, page by page, until the stored item is met.
+
+    Polling a large inbox with nothing new costs one request.
+
+    Message texts are indexed with SQLite FTS5 as they are stored, so
+    ``search`` answers locally, without API calls.
+    """
+
+    def __init__(
+        self,
+        client,
+        db_path: Path,
+        history: int = 100,
+        thread_message_limit: int = 20,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        client: Client
+            Logged in instagrapi client
+        db_path: Path
+            SQLite database file, created when missing
+        history: int, optional
+            Messages fetched for a thread seen for the first time, default is 100 (0 for all)
+        thread_message_limit: int, optional
+            Newest items embedded per thread in inbox pages, default is 20
+
+        Returns
+        -------
+        Void
+        """
+        self.client = client
+        self.db_path = Path(db_path)
+        self.history = history
+        self.thread_message_limit = thread_message_limit
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.lock = threading.RLock()
+        with self.lock, self.db:
+            self.db.executescript(SCHEMA)
+            exists = self.db.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'messages_fts'"
+            ).fetchone()
+            if not exists:
+                self.db.executescript(FTS_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _inbox_page(self, cursor: str = None) -> Dict:
+        params = {
+            "visual_message_return_type": "unseen",
+            "thread_message_limit": str(self.thread_message_limit),
+            "persistentBadging": "true",
+            "limit": str(INBOX_PAGE_SIZE),
+            "is_prefetching": "false",
+        }
+        if cursor:
+            params.update({"cursor": cursor, "direction": "older", "fetch_reason": "page_scroll"})
+        return self.client.private_request("direct_v2/inbox/", params=params).get("inbox", {})
+
+    def _thread_page(self, thread_id: str, cursor: str = None) -> Dict:
+        params = {
+            "visual_message_return_type": "unseen",
+            "direction": "older",
+            "limit": str(THREAD_PAGE_SIZE),
+        }
+        if cursor:
+            params["cursor"] = cursor
+        try:
+            return self.client.private_request(
+                f"direct_v2/threads/{thread_id}/", params=params
+            )["thread"]
+        except ClientNotFoundError as e:
+            raise DirectThreadNotFound(e, thread_id=thread_id, **self.client.last_json)
+
+    def _stored_thread(self, thread_id: str) -> Optional[sqlite3.Row]:
+        with self.lock:
+            return self.db.execute(
+                "SELECT * FROM threads WHERE thread_id = ?", (thread_id,)
+            ).fetchone()
+
+    def _new_items(self, thread: Dict, stored: Optional[sqlite3.Row]) -> List[Dict]:
+        """Items newer than the stored newest item, newest first"""
+        newest_id = stored["newest_item_id"] if stored else None
+        newest_ts = stored["newest_timestamp"] if stored else None
+        limit = 0 if stored else self.history
+        items, cursor = [], None
+        page = thread
+        while True:
+            for item in page.get("items", []):
+                if item.get("item_id") == newest_id or (
+                    newest_ts is not None and int(item["timestamp"]) <= newest_ts
+                ):
+                    return items
+                items.append(item)
+                if limit and len(items) >= limit:
+                    return items
+            cursor = page.get("oldest_cursor")
+            if not page.get("has_older", bool(cursor)) or not cursor:
+                return items
+            page = self._thread_page(thread["thread_id"], cursor)
+
+    def _save_thread(self, thread: Dict, items: List[Dict], stored: Optional[sqlite3.Row]):
+        rows = []
+        for item in items:
+            rows.append(
+                (
+                    str(item["item_id"]),
+                    str(thread["thread_id"]),
+                    str(item.get("user_id", "")),
+                    int(item["timestamp"]),
+                    item.get("item_type"),
+                    _item_text(item),
+                    json.dumps(item),
+                )
+            )
+        newest = max(items, key=lambda item: int(item["timestamp"]), default=None)
+        users = [
+            {"pk": str(u.get("pk")), "username": u.get("username"), "full_name": u.get("full_name")}
+            for u in thread.get("users", [])
+        ]
+        with self.lock, self.db:
+            # An upsert, not INSERT OR REPLACE, so the FTS update trigger fires
+            self.db.executemany(
+                "INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (item_id) "
+                "DO UPDATE SET user_id = excluded.user_id, timestamp = excluded.timestamp, "
+                "item_type = excluded.item_type, text = excluded.text, data = excluded.data",
+                rows,
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO threads VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(thread["thread_id"]),
+                    str(thread.get("thread_v2_id") or ""),
+                    thread.get("thread_title"),
+                    int(bool(thread.get("is_group"))),
+                    json.dumps(users),
+                    int(thread.get("last_activity_at") or 0),
+                    str(newest["item_id"]) if newest else (stored["newest_item_id"] if stored else None),
+                    int(newest["timestamp"]) if newest else (stored["newest_timestamp"] if stored else None),
+                    thread.get("oldest_cursor") if not stored else stored["oldest_cursor"],
+                    int(time.time()),
+                ),
+            )
+
+    def sync(self, max_pages: int = 0) -> Dict:
+        """
+        Fetch threads with new activity and their new messages
+
+        Parameters
+        ----------
+        max_pages: int, optional
+            Stop after this many inbox pages, default is 0 (until unchanged threads are reached)
+
+        Returns
+        -------
+        Dict
+            pages, threads_changed and messages_added of this sync
+        """
+        stats = {"pages": 0, "threads_changed": 0, "messages_added": 0}
+        cursor = None
+        while True:
+            inbox = self._inbox_page(cursor)
+            stats["pages"] += 1
+            reached_unchanged = False
+            for thread in inbox.get("threads", []):
+                thread_id = str(thread["thread_id"])
+                stored = self._stored_thread(thread_id)
+                activity = int(thread.get("last_activity_at") or 0)
+                if stored and stored["last_activity_at"] >= activity:
+                    if not thread.get("is_pin"):
+                        reached_unchanged = True
+                    continue
+                items = self._new_items(thread, stored)
+                self._save_thread(thread, items, stored)
+                stats["threads_changed"] += 1
+                stats["messages_added"] += len(items)
+            cursor = inbox.get("oldest_cursor")
+            if reached_unchanged or not cursor or not inbox.get("has_older", True):
+                break
+            if max_pages and stats["pages"] >= max_pages:
+                break
+        return stats
+
+    def threads(self, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """
+        Stored threads, most recent activity first
+
+        Parameters
+        ----------
+        limit: int, optional
+            Maximum number of threads, default is 20
+        offset: int, optional
+            Threads to skip, default is 0
+
+        Returns
+        -------
+        List[Dict]
+            Thread rows, users decoded
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT * FROM threads ORDER BY last_activity_at DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [dict(row, users=json.loads(row["users"])) for row in rows]
+
+    def messages(
+        self, thread_id: str, amount: int = 20, before: int = None
+    ) -> List[DirectMessage]:
+        """
+        Stored messages of a thread, newest first
+
+        Parameters
+        ----------
+        thread_id: str
+            Unique identifier of a Direct Message thread
+        amount: int, optional
+            Maximum number of messages, default is 20
+        before: int, optional
+            Only messages older than this timestamp in microseconds, default is None
+
+        Returns
+        -------
+        List[DirectMessage]
+            A list of objects of DirectMessage
+        """
+        query = "SELECT data FROM messages WHERE thread_id = ?"
+        args = [str(thread_id)]
+        if before is not None:
+            query += " AND timestamp < ?"
+            args.append(int(before))
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        args.append(amount)
+        with self.lock:
+            rows = self.db.execute(query, args).fetchall()
+        return [_message(row["data"], thread_id) for row in rows]
+
+    def search(
+        self, query: str, thread_id: str = None, amount: int = 20, prefix: bool = True
+    ) -> List[Tuple[DirectMessage, str]]:
+        """
+        Full-text search over stored messages, best matches first
+
+        Parameters
+        ----------
+        query: str
+            Words to find, all of them must match
+        thread_id: str, optional
+            Only search this thread, default is None (all threads)
+        amount: int, optional
+            Maximum number of results, default is 20
+        prefix: bool, optional
+            Match words starting with the last query word, default value is True
+
+        Returns
+        -------
+        List[Tuple[DirectMessage, str]]
+            Messages with a snippet of the match, ``[`` and ``]`` around matched words
+        """
+        match = _fts_query(query, prefix)
+        if not match:
+            return []
+        sql = (
+            "SELECT m.thread_id, m.data, snippet(messages_fts, 0, '[', ']', '...', 12) AS snippet "
+            "FROM messages_fts JOIN messages m ON m.rowid = messages_fts.rowid "
+            "WHERE messages_fts MATCH ?"
+        )
+        args = [match]
+        if thread_id is not None:
+            sql += " AND m.thread_id = ?"
+            args.append(str(thread_id))
+        sql += " ORDER BY rank LIMIT ?"
+        args.append(amount)
+        with self.lock:
+            rows = self.db.execute(sql, args).fetchall()
+        return [(_message(row["data"], row["thread_id"]), row["snippet"]) for row in rows]
+
+
+def _fts_query(query: str, prefix: bool = True) -> str:
+    """FTS5 MATCH expression with every word quoted, so user input is never parsed as syntax"""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _item_text(item: Dict) -> str:
+    """Searchable text of an item: message text, link text or shared media caption"""
+    if item.get("text"):
+        return item["text"]
+    link = item.get("link") or {}
+    if link.get("text"):
+        return link["text"]
+    for key in ("media_share", "clip"):
+        media = item.get(key) or {}
+        media = media.get("clip", media) if key == "clip" else media
+        caption = media.get("caption") or {}
+        if isinstance(caption, dict) and caption.get("text"):
+            return caption["text"]
+    return ""
+
+
+def _message(data: str, thread_id: str) -> DirectMessage:
+    item = json.loads(data)
+    item["thread_id"] = int(thread_id)
+    return extract_direct_message(item)
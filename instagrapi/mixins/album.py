@@ -1,6 +1,9 @@
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 from urllib.parse import urlparse
 
 from instagrapi.exceptions import (
@@ -9,8 +12,13 @@ from instagrapi.exceptions import (
     AlbumUnknownFormat,
 )
 from instagrapi.extractors import extract_media_v1
+from instagrapi.image_util import process_image
 from instagrapi.types import Location, Media, Usertag
 from instagrapi.utils import date_time_original, dumps
+from instagrapi.video_probe import analyze_video
+
+ALBUM_PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".webp")
+ALBUM_VIDEO_EXTENSIONS = (".mp4",)
 
 
 class DownloadAlbumMixin:
@@ -18,7 +26,61 @@ class DownloadAlbumMixin:
     Helper class to download album
     """
 
-    def album_download(self, media_pk: int, folder: Path = "") -> List[Path]:
+    album_download_workers = 4  # concurrent resource downloads
+
+    def _album_downloads(
+        self, tasks: List[Callable[[], Any]], workers: int = None
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Run download tasks on a bounded pool, yielding (index, result) as they complete
+
+        Dropped connections are retried by the download engine (``download_retries``).
+        """
+        workers = max(int(workers or self.album_download_workers), 1)
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(workers, len(tasks) or 1),
+            thread_name_prefix="instagrapi-album",
+        )
+        try:
+            futures = {executor.submit(task): i for i, task in enumerate(tasks)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _album_resource_tasks(
+        self, media: Media, folder: Path = "", origin: bool = False
+    ) -> List[Callable[[], Any]]:
+        assert media.media_type == 8, "Must been album"
+        tasks = []
+        for resource in media.resources:
+            filename = f"{media.user.username}_{resource.pk}"
+            if resource.media_type == 1:
+                url, download, download_origin = (
+                    resource.thumbnail_url,
+                    self.photo_download_by_url,
+                    self.photo_download_by_url_origin,
+                )
+            elif resource.media_type == 2:
+                url, download, download_origin = (
+                    resource.video_url,
+                    self.video_download_by_url,
+                    self.video_download_by_url_origin,
+                )
+            else:
+                raise AlbumNotDownload(
+                    f'Media type "{resource.media_type}" unknown for album (resource={resource.pk})'
+                )
+            if origin:
+                tasks.append(partial(download_origin, url))
+            else:
+                tasks.append(partial(download, url, filename, folder))
+        return tasks
+
+    def album_download(
+        self, media_pk: int, folder: Path = "", workers: int = None
+    ) -> List[Path]:
         """
         Download your album
 
@@ -29,32 +91,47 @@ class DownloadAlbumMixin:
         folder: Path, optional
             Directory in which you want to download the album, default is ""
             and will download the files to working directory.
+        workers: int, optional
+            Concurrent downloads, default is album_download_workers
 
         Returns
         -------
         List[Path]
-            List of path for all the files downloaded
+            List of path for all the files downloaded, in album order
         """
-        media = self.media_info(media_pk)
-        assert media.media_type == 8, "Must been album"
-        paths = []
-        for resource in media.resources:
-            filename = f"{media.user.username}_{resource.pk}"
-            if resource.media_type == 1:
-                paths.append(
-                    self.photo_download_by_url(resource.thumbnail_url, filename, folder)
-                )
-            elif resource.media_type == 2:
-                paths.append(
-                    self.video_download_by_url(resource.video_url, filename, folder)
-                )
-            else:
-                raise AlbumNotDownload(
-                    'Media type "{resource.media_type}" unknown for album (resource={resource.pk})'
-                )
+        tasks = self._album_resource_tasks(self.media_info(media_pk), folder)
+        paths = [None] * len(tasks)
+        for i, path in self._album_downloads(tasks, workers):
+            paths[i] = path
         return paths
 
-    def album_download_by_urls(self, urls: List[str], folder: Path = "") -> List[Path]:
+    def album_download_iter(
+        self, media_pk: int, folder: Path = "", workers: int = None
+    ) -> Iterator[Tuple[int, Path]]:
+        """
+        Download your album, yielding every file as soon as it is downloaded
+
+        Parameters
+        ----------
+        media_pk: int
+            PK for the album you want to download
+        folder: Path, optional
+            Directory in which you want to download the album, default is ""
+            and will download the files to working directory.
+        workers: int, optional
+            Concurrent downloads, default is album_download_workers
+
+        Returns
+        -------
+        Iterator[Tuple[int, Path]]
+            Position in the album and path, in completion order
+        """
+        tasks = self._album_resource_tasks(self.media_info(media_pk), folder)
+        return self._album_downloads(tasks, workers)
+
+    def album_download_by_urls(
+        self, urls: List[str], folder: Path = "", workers: int = None
+    ) -> List[Path]:
         """
         Download your album using specified URLs
 
@@ -65,24 +142,29 @@ class DownloadAlbumMixin:
         folder: Path, optional
             Directory in which you want to download the album, default is ""
             and will download the files to working directory.
+        workers: int, optional
+            Concurrent downloads, default is album_download_workers
 
         Returns
         -------
         List[Path]
-            List of path for all the files downloaded
+            List of path for all the files downloaded, in the order of urls
         """
-        paths = []
+        tasks = []
         for url in urls:
             file_name = urlparse(url).path.rsplit("/", 1)[1]
             if file_name.lower().endswith((".jpg", ".jpeg")):
-                paths.append(self.photo_download_by_url(url, file_name, folder))
+                tasks.append(partial(self.photo_download_by_url, url, file_name, folder))
             elif file_name.lower().endswith(".mp4"):
-                paths.append(self.video_download_by_url(url, file_name, folder))
+                tasks.append(partial(self.video_download_by_url, url, file_name, folder))
             else:
                 raise AlbumUnknownFormat()
+        paths = [None] * len(tasks)
+        for i, path in self._album_downloads(tasks, workers):
+            paths[i] = path
         return paths
 
-    def album_download_origin(self, media_pk: int) -> List[bytes]:
+    def album_download_origin(self, media_pk: int, workers: int = None) -> List[bytes]:
         """
         Download your album
 
@@ -90,27 +172,135 @@ class DownloadAlbumMixin:
         ----------
         media_pk: int
             PK for the album you want to download
+        workers: int, optional
+            Concurrent downloads, default is album_download_workers
+
         Returns
         -------
-        List[Path]
-            List of path for all the files downloaded
+        List[bytes]
+            Content of all the files, in album order
         """
-        media = self.media_info(media_pk)
-        assert media.media_type == 8, "Must been album"
-        files = []
-        for resource in media.resources:
-            if resource.media_type == 1:
-                files.append(self.photo_download_by_url_origin(resource.thumbnail_url))
-            elif resource.media_type == 2:
-                files.append(self.video_download_by_url_origin(resource.video_url))
-            else:
-                raise AlbumNotDownload(
-                    'Media type "{resource.media_type}" unknown for album (resource={resource.pk})'
-                )
+        tasks = self._album_resource_tasks(self.media_info(media_pk), origin=True)
+        files = [None] * len(tasks)
+        for i, content in self._album_downloads(tasks, workers):
+            files[i] = content
         return files
 
 
 class UploadAlbumMixin:
+    album_upload_workers = 4  # concurrent child uploads
+    album_upload_retries = 2  # extra attempts per child upload
+    album_prepare_workers = min(os.cpu_count() or 1, 4)  # image resize / video probe
+
+    def _album_prepare(self, path: Path) -> Tuple[str, Any]:
+        """Resize a photo or probe a video (thumbnail included), CPU bound"""
+        if path.suffix.lower() in ALBUM_PHOTO_EXTENSIONS:
+            return "photo", process_image(str(path))
+        return "video", analyze_video(path)
+
+    def _album_upload_child(
+        self, path: Path, kind: str, prepared: Any, upload_id: str
+    ) -> Dict:
+        """Upload one prepared child, retrying it alone on failure"""
+        for retry in range(self.album_upload_retries + 1):
+            try:
+                if kind == "photo":
+                    upload_id, width, height = self.photo_rupload(
+                        path, upload_id, to_album=True, prepared=prepared
+                    )
+                    return {
+                        "upload_id": upload_id,
+                        "edits": dumps(
+                            {
+                                "crop_original_size": [width, height],
+                                "crop_center": [0.0, -0.0],
+                                "crop_zoom": 1.0,
+                            }
+                        ),
+                        "extra": dumps({"source_width": width, "source_height": height}),
+                        "scene_capture_type": "",
+                        "scene_type": None,
+                    }
+                upload_id, width, height, duration, thumbnail = self.video_rupload(
+                    path, prepared[3], to_album=True, upload_id=upload_id
+                )
+                self.photo_rupload(thumbnail, upload_id)
+                return {
+                    "upload_id": upload_id,
+                    "clips": dumps([{"length": duration, "source_type": "4"}]),
+                    "extra": dumps({"source_width": width, "source_height": height}),
+                    "length": duration,
+                    "poster_frame_index": "0",
+                    "filter_type": "0",
+                    "video_result": "",
+                    "date_time_original": date_time_original(time.localtime()),
+                    "audio_muted": "false",
+                }
+            except Exception as e:
+                if retry == self.album_upload_retries:
+                    raise e
+                self.logger.warning("Album item %s upload failed, retry (%s)", path, e)
+                time.sleep(2 ** retry)
+
+    def album_upload_children(self, paths: List[Path], workers: int = None) -> List[Dict]:
+        """
+        Upload album children concurrently
+
+        Photos are resized and videos probed on a CPU pool of
+        ``album_prepare_workers`` threads, each prepared child is handed to an
+        upload pool of ``workers`` threads as soon as it is ready, so the whole
+        album takes about as long as its slowest item.
+
+        Parameters
+        ----------
+        paths: List[Path]
+            List of paths for media to upload
+        workers: int, optional
+            Concurrent uploads, default is ``album_upload_workers``
+
+        Returns
+        -------
+        List[Dict]
+            Children metadata for ``album_configure``, in the order of ``paths``
+        """
+        paths = [Path(path) for path in paths]
+        for path in paths:
+            if path.suffix.lower() not in ALBUM_PHOTO_EXTENSIONS + ALBUM_VIDEO_EXTENSIONS:
+                raise AlbumUnknownFormat()
+        if not paths:
+            return []
+        workers = max(int(workers or self.album_upload_workers), 1)
+        # Children are uploaded at the same time, one millisecond apart keeps the ids unique
+        first_id = int(time.time() * 1000)
+        children = [None] * len(paths)
+        prepare_pool = ThreadPoolExecutor(
+            max_workers=min(max(self.album_prepare_workers, 1), len(paths)),
+            thread_name_prefix="instagrapi-album-prepare",
+        )
+        upload_pool = ThreadPoolExecutor(
+            max_workers=min(workers, len(paths)),
+            thread_name_prefix="instagrapi-album-upload",
+        )
+        try:
+            prepares = {
+                prepare_pool.submit(self._album_prepare, path): i
+                for i, path in enumerate(paths)
+            }
+            uploads = {}
+            for future in as_completed(prepares):
+                i = prepares[future]
+                kind, prepared = future.result()
+                upload = upload_pool.submit(
+                    self._album_upload_child, paths[i], kind, prepared, str(first_id + i)
+                )
+                uploads[upload] = i
+            for future in as_completed(uploads):
+                children[uploads[future]] = future.result()
+        finally:
+            prepare_pool.shutdown(wait=True, cancel_futures=True)
+            upload_pool.shutdown(wait=True, cancel_futures=True)
+        return children
+
     def album_upload(
         self,
         paths: List[Path],
@@ -122,6 +312,7 @@ class UploadAlbumMixin:
         configure_exception=None,
         to_story=False,
         extra_data: Dict[str, str] = {},
+        workers: int = None,
     ) -> Media:
         """
         Upload album to feed
@@ -146,56 +337,15 @@ class UploadAlbumMixin:
             Currently not used, default is False
         extra_data: Dict[str, str], optional
             Dict of extra data, if you need to add your params, like {"share_to_facebook": 1}.
+        workers: int, optional
+            Concurrent child uploads, default is ``album_upload_workers``
 
         Returns
         -------
         Media
             An object of Media class
         """
-        children = []
-        for path in paths:
-            path = Path(path)
-            if path.suffix.lower() in (".jpg", ".jpeg", ".webp"):
-                upload_id, width, height = self.photo_rupload(path, to_album=True)
-                children.append(
-                    {
-                        "upload_id": upload_id,
-                        "edits": dumps(
-                            {
-                                "crop_original_size": [width, height],
-                                "crop_center": [0.0, -0.0],
-                                "crop_zoom": 1.0,
-                            }
-                        ),
-                        "extra": dumps(
-                            {"source_width": width, "source_height": height}
-                        ),
-                        "scene_capture_type": "",
-                        "scene_type": None,
-                    }
-                )
-            elif path.suffix.lower() == ".mp4":
-                upload_id, width, height, duration, thumbnail = self.video_rupload(
-                    path, to_album=True
-                )
-                children.append(
-                    {
-                        "upload_id": upload_id,
-                        "clips": dumps([{"length": duration, "source_type": "4"}]),
-                        "extra": dumps(
-                            {"source_width": width, "source_height": height}
-                        ),
-                        "length": duration,
-                        "poster_frame_index": "0",
-                        "filter_type": "0",
-                        "video_result": "",
-                        "date_time_original": date_time_original(time.localtime()),
-                        "audio_muted": "false",
-                    }
-                )
-                self.photo_rupload(thumbnail, upload_id)
-            else:
-                raise AlbumUnknownFormat()
+        children = self.album_upload_children(paths, workers)
 
         for attempt in range(50):
             self.logger.debug(f"Attempt #{attempt} to configure Album: {paths}")
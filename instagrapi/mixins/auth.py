@@ -309,6 +309,7 @@ class LoginMixin(PreLoginFlowMixin, PostLoginFlowMixin):
         self.user_agent = None
         self.settings = None
         self.temp_settings_path = None  # For Vercel compatibility
+        super().__init__()
 
     def init(self) -> bool:
         """
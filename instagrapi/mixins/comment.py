@@ -1,5 +1,5 @@
 import random
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 from instagrapi.exceptions import ClientError, ClientNotFoundError, MediaNotFound
 from instagrapi.extractors import extract_comment
@@ -27,45 +27,145 @@ class CommentMixin:
         List[Comment]
             A list of objects of Comment
         """
+        return list(self.media_comments_gen(media_id, amount))
 
-        # TODO: to public or private
-        def get_comments():
-            if result.get("comments"):
-                for comment in result.get("comments"):
-                    comments.append(extract_comment(comment))
+    def media_comments_gen(self, media_id: str, amount: int = 0) -> Iterator[Comment]:
+        """
+        Iterate over comments on a media, fetching one page at a time
 
+        Parameters
+        ----------
+        media_id: str
+            Unique identifier of a Media
+        amount: int, optional
+            Maximum number of comments to yield, default is 0 - Inf
+
+        Returns
+        -------
+        Iterator[Comment]
+            Objects of Comment
+        """
         media_id = self.media_id(media_id)
-        params = None
-        comments = []
-        result = self.private_request(f"media/{media_id}/comments/", params)
-        get_comments()
-        while (result.get("has_more_comments") and result.get("next_max_id")) or (
-            result.get("has_more_headload_comments") and result.get("next_min_id")
-        ):
-            try:
-                if result.get("has_more_comments"):
-                    params = {"max_id": result.get("next_max_id")}
-                else:
-                    params = {"min_id": result.get("next_min_id")}
-                if not (
-                    result.get("next_max_id")
-                    or result.get("next_min_id")
-                    or result.get("comments")
-                ):
-                    break
-                result = self.private_request(f"media/{media_id}/comments/", params)
-                get_comments()
-            except ClientNotFoundError as e:
-                raise MediaNotFound(e, media_id=media_id, **self.last_json)
-            except ClientError as e:
-                if "Media not found" in str(e):
-                    raise MediaNotFound(e, media_id=media_id, **self.last_json)
-                raise e
-            if amount and len(comments) >= amount:
+        cursor, count = "", 0
+        while True:
+            comments, cursor = self.media_comments_v1_page(media_id, cursor)
+            for comment in comments:
+                yield comment
+                count += 1
+                if amount and count >= amount:
+                    return
+            if not cursor:
+                return
+
+    def media_comments_v1_page(
+        self, media_id: str, cursor: str = ""
+    ) -> Tuple[List[Comment], str]:
+        """
+        Get one page of comments on a media
+
+        Parameters
+        ----------
+        media_id: str
+            Unique identifier of a Media
+        cursor: str, optional
+            Cursor of the previous page, default value is empty String (first page)
+
+        Returns
+        -------
+        Tuple[List[Comment], str]
+            Tuple of List of comments and next cursor (empty when there are no more pages)
+        """
+        comments, cursor = self._media_comments_v1_raw_page(media_id, cursor)
+        return [extract_comment(comment) for comment in comments], cursor
+
+    def _media_comments_v1_raw_page(
+        self, media_id: str, cursor: str = ""
+    ) -> Tuple[List[dict], str]:
+        """Comments of a page as sent by Instagram, before extract_comment"""
+        result = self._comments_request(
+            media_id, f"media/{media_id}/comments/", _cursor_params(cursor)
+        )
+        comments = result.get("comments") or []
+        if result.get("has_more_comments") and result.get("next_max_id"):
+            return comments, f"max_id:{result['next_max_id']}"
+        if result.get("has_more_headload_comments") and result.get("next_min_id"):
+            return comments, f"min_id:{result['next_min_id']}"
+        return comments, ""
+
+    def comment_replies_v1_page(
+        self, media_id: str, comment_pk: int, cursor: str = ""
+    ) -> Tuple[List[Comment], str]:
+        """
+        Get one page of replies to a comment
+
+        Parameters
+        ----------
+        media_id: str
+            Unique identifier of a Media
+        comment_pk: int
+            Unique identifier of the parent Comment
+        cursor: str, optional
+            Cursor of the previous page, default value is empty String (first page)
+
+        Returns
+        -------
+        Tuple[List[Comment], str]
+            Tuple of List of replies and next cursor (empty when there are no more pages)
+        """
+        result = self._comments_request(
+            media_id,
+            f"media/{media_id}/comments/{comment_pk}/child_comments/",
+            _cursor_params(cursor),
+        )
+        replies = []
+        for reply in result.get("child_comments") or []:
+            if not reply.get("replied_to_comment_id"):
+                reply["replied_to_comment_id"] = str(comment_pk)
+            replies.append(extract_comment(reply))
+        if result.get("has_more_tail_child_comments") and result.get("next_max_child_cursor"):
+            return replies, f"max_id:{result['next_max_child_cursor']}"
+        if result.get("has_more_head_child_comments") and result.get("next_min_child_cursor"):
+            return replies, f"min_id:{result['next_min_child_cursor']}"
+        return replies, ""
+
+    def comment_replies(self, media_id: str, comment_pk: int, amount: int = 0) -> List[Comment]:
+        """
+        Get replies to a comment
+
+        Parameters
+        ----------
+        media_id: str
+            Unique identifier of a Media
+        comment_pk: int
+            Unique identifier of the parent Comment
+        amount: int, optional
+            Maximum number of replies to return, default is 0 - Inf
+
+        Returns
+        -------
+        List[Comment]
+            A list of objects of Comment
+        """
+        media_id = self.media_id(media_id)
+        replies, cursor = [], ""
+        while True:
+            page, cursor = self.comment_replies_v1_page(media_id, comment_pk, cursor)
+            replies.extend(page)
+            if not cursor or (amount and len(replies) >= amount):
                 break
         if amount:
-            comments = comments[:amount]
-        return comments
+            replies = replies[:amount]
+        return replies
+
+    def _comments_request(self, media_id: str, endpoint: str, params: Optional[dict]) -> dict:
+        try:
+            return self.private_request(endpoint, params)
+        except ClientNotFoundError as e:
+            raise MediaNotFound(e, media_id=media_id, **self.last_json)
+        except ClientError as e:
+            if "Media not found" in str(e):
+                raise MediaNotFound(e, media_id=media_id, **self.last_json)
+            raise e
 
     def media_comments_chunk(
         self, media_id: str, max_amount: int, min_id: str = None
@@ -294,3 +394,11 @@ class CommentMixin:
             f"media/{media_id}/comment/bulk_delete/", self.with_action_data(data)
         )
         return result["status"] == "ok"
+
+
+def _cursor_params(cursor: str) -> Optional[dict]:
+    """Request params of a "max_id:<id>" or "min_id:<id>" comments cursor"""
+    if not cursor:
+        return None
+    key, _, value = cursor.partition(":")
+    return {key: value}
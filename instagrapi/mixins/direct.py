@@ -1,10 +1,13 @@
 import random
 import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from instagrapi.exceptions import ClientNotFoundError, DirectThreadNotFound
+from instagrapi.exceptions import ClientError, ClientNotFoundError, DirectThreadNotFound
 from instagrapi.extractors import (
     extract_direct_media,
     extract_direct_message,
@@ -12,6 +15,7 @@ from instagrapi.extractors import (
     extract_direct_thread,
     extract_user_short,
 )
+from instagrapi.image_util import process_image
 from instagrapi.types import (
     DirectMessage,
     DirectShortThread,
@@ -20,6 +24,7 @@ from instagrapi.types import (
     UserShort,
 )
 from instagrapi.utils import dumps
+from instagrapi.video_probe import file_hash
 
 SELECTED_FILTERS = ("flagged", "unread")
 SEARCH_MODES = ("raven", "universal")
@@ -54,6 +59,18 @@ class DirectMixin:
     Helpers for managing Direct Messaging
     """
 
+    direct_upload_ttl = 0  # seconds an uploaded file is reused for more direct sends, 0 is off
+    direct_broadcast_workers = 4  # concurrent configure requests of a broadcast
+    direct_broadcast_chunk = 10  # threads per configure request
+
+    def __init__(self, *args, **kwargs):
+        # (file hash, content type) -> (upload_id, uploaded_at)
+        self._direct_uploads = OrderedDict()
+        self._direct_prepared = OrderedDict()  # file hash -> PreparedImage
+        self._direct_upload_locks = {}
+        self._direct_upload_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
     def direct_threads(
         self,
         amount: int = 20,
@@ -534,6 +551,130 @@ class DirectMixin:
         assert (user_ids or thread_ids) and not (
             user_ids and thread_ids
         ), "Specify user_ids or thread_ids, but not both"
+        return self._direct_send_uploaded(Path(path), content_type, user_ids, thread_ids)
+
+    def direct_send_file_broadcast(
+        self,
+        path: Path,
+        user_ids: List[int] = [],
+        thread_ids: List[int] = [],
+        content_type: str = "photo",
+        workers: int = None,
+        chunk_size: int = None,
+    ) -> List[DirectMessage]:
+        """
+        Send one file to many users (one thread each) or threads, uploading it once
+
+        Parameters
+        ----------
+        path: Path
+            Path to file that will be posted on the threads
+        user_ids: List[int]
+            List of unique identifier of Users id, every user gets the file in a private thread
+        thread_ids: List[int]
+            List of unique identifier of Direct Message thread id
+        content_type: str, optional
+            "photo" or "video", default value is "photo"
+        workers: int, optional
+            Concurrent configure requests, default is ``direct_broadcast_workers``
+        chunk_size: int, optional
+            Threads per configure request, default is ``direct_broadcast_chunk``
+
+        Returns
+        -------
+        List[DirectMessage]
+            One message per configure request, in the order of the recipients
+        """
+        assert self.user_id, "Login required"
+        path = Path(path)
+        chunk_size = max(int(chunk_size or self.direct_broadcast_chunk), 1)
+        batches = [([int(uid)], []) for uid in user_ids]
+        thread_ids = [int(tid) for tid in thread_ids]
+        batches += [
+            ([], thread_ids[i:i + chunk_size]) for i in range(0, len(thread_ids), chunk_size)
+        ]
+        if not batches:
+            return []
+        # Upload before fanning out, the configure requests all reuse it
+        upload_id, _ = self._direct_upload(path, content_type)
+        workers = max(min(int(workers or self.direct_broadcast_workers), len(batches)), 1)
+        # Configure requests go through private_request, which keeps delay_range between them
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="instagrapi-direct"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self._direct_send_uploaded, path, content_type, users, threads, upload_id
+                )
+                for users, threads in batches
+            ]
+            return [future.result() for future in futures]
+
+    def _direct_upload(
+        self, path: Path, content_type: str, stale: str = None
+    ) -> Tuple[str, bool]:
+        """
+        Upload a file for direct, reusing the upload_id for ``direct_upload_ttl``
+
+        ``stale`` is an upload_id that failed to configure: it is replaced by a
+        fresh upload once, concurrent callers get that replacement. Prepared
+        photos are kept by file hash and videos are probed once by
+        analyze_video, so a fresh upload does not prepare the file again.
+        Returns the upload_id and whether it was reused.
+        """
+        digest = file_hash(path)
+        key = (digest, content_type)
+        with self._direct_upload_lock:
+            lock = self._direct_upload_locks.setdefault(key, threading.Lock())
+        with lock:
+            cached = self._direct_uploads.get(key)
+            if cached and stale and cached[0] != stale:
+                return cached[0], True
+            if cached and not stale and time.time() - cached[1] < self.direct_upload_ttl:
+                return cached[0], True
+            upload_id = str(int(time.time() * 1000))
+            if content_type == "photo":
+                prepared = self._direct_prepared.get(digest)
+                if prepared is None:
+                    prepared = self._direct_prepared[digest] = process_image(str(path))
+                    while len(self._direct_prepared) > 16:
+                        self._direct_prepared.popitem(last=False)
+                upload_id = self.photo_rupload(path, upload_id, prepared=prepared)[0]
+            else:
+                upload_id = self.video_rupload(path, to_direct=True, upload_id=upload_id)[0]
+            self._direct_uploads[key] = (upload_id, time.time())
+            while len(self._direct_uploads) > 256:
+                self._direct_uploads.popitem(last=False)
+            return upload_id, False
+
+    def _direct_send_uploaded(
+        self,
+        path: Path,
+        content_type: str,
+        user_ids: List[int],
+        thread_ids: List[int],
+        upload_id: str = None,
+    ) -> DirectMessage:
+        reused = upload_id is not None
+        if not reused:
+            upload_id, reused = self._direct_upload(path, content_type)
+        try:
+            return self._direct_configure_file(upload_id, content_type, user_ids, thread_ids)
+        except ClientError as e:
+            if not reused:
+                raise e
+            # The upload expired or can not be sent again, upload a fresh copy once
+            self.logger.warning("Direct configure of %s failed, upload again (%s)", path, e)
+            upload_id, _ = self._direct_upload(path, content_type, stale=upload_id)
+            return self._direct_configure_file(upload_id, content_type, user_ids, thread_ids)
+
+    def _direct_configure_file(
+        self,
+        upload_id: str,
+        content_type: str,
+        user_ids: List[int] = [],
+        thread_ids: List[int] = [],
+    ) -> DirectMessage:
         method = f"configure_{content_type}"
         token = self.generate_mutation_token()
         nav_chains = [
@@ -550,7 +691,6 @@ class DirectMixin:
                 "6xQ:direct_media_picker_photos_fragment:8,5rG:direct_thread:9"
             ),
         ]
-        kwargs = {}
         data = {
             "action": "send_item",
             "is_shh_mode": "0",
@@ -562,7 +702,6 @@ class DirectMixin:
         }
         if content_type == "video":
             data["video_result"] = ""
-            kwargs["to_direct"] = True
         if content_type == "photo":
             data["send_attribution"] = "inbox"
             data["allow_full_aspect_ratio"] = "true"
@@ -570,11 +709,6 @@ class DirectMixin:
             data["recipient_users"] = dumps([[int(uid) for uid in user_ids]])
         if thread_ids:
             data["thread_ids"] = dumps([int(tid) for tid in thread_ids])
-        path = Path(path)
-        upload_id = str(int(time.time() * 1000))
-        upload_id, width, height = getattr(self, f"{content_type}_rupload")(
-            path, upload_id, **kwargs
-        )[:3]
         data["upload_id"] = upload_id
         # data['content_type'] = content_type
         result = self.private_request(
@@ -0,0 +1,157 @@
+import io
+import os
+import time
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import requests
+
+from instagrapi.exceptions import ClientIncompleteReadError
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # at most one chunk is lost when a connection drops
+DOWNLOAD_RETRY_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class DownloadMixin:
+    """
+    Shared engine for media downloads
+
+    Downloads go through the keep-alive ``public`` session (connection
+    reuse, proxy), are streamed in chunks to a temporary ``.part`` file and
+    renamed into place only when complete. A dropped connection resumes with
+    an HTTP Range request from the last written byte.
+    """
+
+    download_timeout = 30  # seconds to connect / between received chunks
+    download_retries = 5  # resumes after dropped connections
+
+    def _download_stream(self, url: str, fp: BinaryIO, verify_size: bool = True) -> int:
+        offset = 0
+        total = validator = None
+        retries = 0
+        while True:
+            # Identity encoding keeps Range offsets and Content-Length in raw bytes
+            headers = {"Accept-Encoding": "identity"}
+            if offset:
+                headers["Range"] = f"bytes={offset}-"
+                if validator:
+                    headers["If-Range"] = validator
+            try:
+                with self.public.get(
+                    url, headers=headers, stream=True, timeout=self.download_timeout
+                ) as response:
+                    response.raise_for_status()
+                    if offset and response.status_code != 206:
+                        # Range ignored or the file changed, start over
+                        fp.seek(0)
+                        fp.truncate()
+                        offset = 0
+                    if not offset:
+                        total = _content_total(response)
+                        validator = response.headers.get("ETag") or response.headers.get(
+                            "Last-Modified"
+                        )
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        fp.write(chunk)
+                        offset += len(chunk)
+                if total is None or offset >= total:
+                    break
+                error = ClientIncompleteReadError(
+                    f"Connection closed at {offset} of {total} bytes"
+                )
+            except DOWNLOAD_RETRY_ERRORS as e:
+                error = e
+            retries += 1
+            if retries > self.download_retries:
+                raise error
+            self.logger.warning(
+                "Download of %s interrupted at %d bytes, resume (%s)", url, offset, error
+            )
+            time.sleep(min(2 ** retries, 30))
+        if verify_size and total is not None and offset != total:
+            raise ClientIncompleteReadError(
+                f'Broken file from url "{url}" (Content-length={total}, but file length={offset})'
+            )
+        return offset
+
+    def download_to_path(self, url: str, path: Path, verify_size: bool = True) -> Path:
+        """
+        Download URL to a file, resuming after dropped connections
+
+        Parameters
+        ----------
+        url: str
+            URL for a media
+        path: Path
+            Destination file, written atomically
+        verify_size: bool, optional
+            Compare the file length with Content-Length, default value is True
+
+        Returns
+        -------
+        Path
+            Path for the file downloaded
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".part")
+        try:
+            with open(tmp_path, "wb") as fp:
+                self._download_stream(str(url), fp, verify_size)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return path.resolve()
+
+    def download_to_fileobj(self, url: str, fp: BinaryIO, verify_size: bool = True) -> int:
+        """
+        Download URL into a seekable binary file object, resuming after dropped connections
+
+        Parameters
+        ----------
+        url: str
+            URL for a media
+        fp: BinaryIO
+            File object, e.g. a SpooledTemporaryFile
+        verify_size: bool, optional
+            Compare the length with Content-Length, default value is True
+
+        Returns
+        -------
+        int
+            Number of bytes written
+        """
+        return self._download_stream(str(url), fp, verify_size)
+
+    def download_to_bytes(self, url: str, verify_size: bool = True) -> bytes:
+        """
+        Download URL into memory, resuming after dropped connections
+
+        Parameters
+        ----------
+        url: str
+            URL for a media
+        verify_size: bool, optional
+            Compare the length with Content-Length, default value is True
+
+        Returns
+        -------
+        bytes
+        """
+        buffer = io.BytesIO()
+        self._download_stream(str(url), buffer, verify_size)
+        return buffer.getvalue()
+
+
+def _content_total(response: requests.Response) -> Optional[int]:
+    """Full size of the resource from Content-Range or Content-Length"""
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
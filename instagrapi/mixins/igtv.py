@@ -1,4 +1,3 @@
-import contextlib
 import json
 import random
 import time
@@ -6,16 +5,12 @@ from pathlib import Path
 from typing import Dict, List
 from uuid import uuid4
 
-from instagrapi import config
 from instagrapi.exceptions import ClientError, IGTVConfigureError, IGTVNotUpload
 from instagrapi.extractors import extract_media_v1
 from instagrapi.types import Location, Media, Usertag
 from instagrapi.utils import date_time_original
-
-try:
-    from PIL import Image
-except ImportError:
-    raise Exception("You don't have PIL installed. Please install PIL or Pillow>=8.1.1")
+from instagrapi.video_probe import analyze_video as probe_video
+from instagrapi.video_probe import crop_thumbnail  # noqa: F401
 
 
 class DownloadIGTVMixin:
@@ -135,36 +130,7 @@ class UploadIGTVMixin:
             "X_FB_VIDEO_WATERFALL_ID": waterfall_id,
             "X-Entity-Type": "video/mp4",
         }
-        response = self.private.get(
-            "https://{domain}/rupload_igvideo/{name}".format(
-                domain=config.API_DOMAIN, name=upload_name
-            ),
-            headers=headers,
-        )
-        self.request_log(response)
-        if response.status_code != 200:
-            raise IGTVNotUpload(response=self.last_response, **self.last_json)
-        with open(path, "rb") as fp:
-            igtv_data = fp.read()
-            igtv_len = str(len(igtv_data))
-        headers = {
-            "Offset": "0",
-            "X-Entity-Name": upload_name,
-            "X-Entity-Length": igtv_len,
-            "Content-Type": "application/octet-stream",
-            "Content-Length": igtv_len,
-            **headers,
-        }
-        response = self.private.post(
-            "https://{domain}/rupload_igvideo/{name}".format(
-                domain=config.API_DOMAIN, name=upload_name
-            ),
-            data=igtv_data,
-            headers=headers,
-        )
-        self.request_log(response)
-        if response.status_code != 200:
-            raise IGTVNotUpload(response=self.last_response, **self.last_json)
+        self.rupload_igvideo(path, upload_name, headers, IGTVNotUpload)
         # CONFIGURE
         self.igtv_composer_session_id = self.generate_uuid()
         for attempt in range(50):
@@ -292,48 +258,5 @@ def analyze_video(path: Path, thumbnail: Path = None) -> tuple:
     Tuple
         A tuple with (thumbail path, width, height, duration)
     """
-    try:
-        import moviepy.editor as mp
-    except ImportError:
-        try:
-            import moviepy as mp
-        except ImportError:
-            raise Exception("Please install moviepy>=1.0.3 and retry")
-
-    print(f'Analyzing IGTV file "{path}"')
-    with contextlib.ExitStack() as stack:
-        video = mp.VideoFileClip(str(path))
-        width, height = video.size
-        if not thumbnail:
-            thumbnail = f"{path}.jpg"
-            print(f'Generating thumbnail "{thumbnail}"...')
-            video.save_frame(thumbnail, t=(video.duration / 2))
-            crop_thumbnail(thumbnail)
-        stack.enter_context(contextlib.closing(video))
-    return thumbnail, width, height, video.duration
-
-
-def crop_thumbnail(path: Path) -> bool:
-    """
-    Analyze and crop thumbnail if need
-
-    Parameters
-    ----------
-    path: Path
-        Path to the video
-
-    Returns
-    -------
-    bool
-        A boolean value
-    """
-    im = Image.open(str(path))
-    width, height = im.size
-    offset = (height / 1.78) / 2
-    center = width / 2
-    # Crop the center of the image
-    im = im.crop((center - offset, 0, center + offset, height))
-    with open(path, "w") as fp:
-        im.save(fp)
-        im.close()
-    return True
+    width, height, duration, thumbnail = probe_video(path, thumbnail, crop=True)
+    return thumbnail, width, height, duration
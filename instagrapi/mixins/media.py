@@ -3,7 +3,8 @@ import random
 import time
 from copy import deepcopy
 from datetime import datetime
-from typing import Dict, List, Tuple
+from functools import partial
+from typing import Dict, Iterator, List, Tuple
 from urllib.parse import urlparse
 
 from instagrapi.exceptions import (
@@ -20,6 +21,7 @@ from instagrapi.extractors import (
     extract_media_v1,
     extract_user_short,
 )
+from instagrapi.pagination import PagePrefetcher
 from instagrapi.types import Location, Media, UserShort, Usertag
 from instagrapi.utils import InstagramIdCodec, json_value
 
@@ -609,7 +611,11 @@ class MediaMixin:
         return medias
 
     def user_medias_paginated_v1(
-        self, user_id: str, amount: int = 33, end_cursor: str = ""
+        self,
+        user_id: str,
+        amount: int = 33,
+        end_cursor: str = "",
+        min_timestamp: int = None,
     ) -> Tuple[List[Media], str]:
         """
         Get a page of user's media by Private Mobile API
@@ -621,6 +627,8 @@ class MediaMixin:
             Maximum number of media to return, default is 0 (all medias)
         end_cursor: str, optional
             Cursor value to start at, obtained from previous call to this method
+        min_timestamp: int, optional
+            Only media posted after this unix timestamp, default is None (all medias)
 
         Returns
         -------
@@ -629,31 +637,74 @@ class MediaMixin:
         """
         amount = int(amount)
         user_id = int(user_id)
-        medias = []
-        next_max_id = end_cursor
-        min_timestamp = None
         try:
-            items = self.private_request(
-                f"feed/user/{user_id}/",
-                params={
-                    "max_id": next_max_id,
-                    "count": amount,
-                    "min_timestamp": min_timestamp,
-                    "rank_token": self.rank_token,
-                    "ranked_content": "true",
-                },
-            )["items"]
+            medias, next_max_id = self._user_medias_v1_raw_page(
+                user_id, amount, end_cursor, min_timestamp
+            )
         except PrivateError as e:
             raise e
         except Exception as e:
             self.logger.exception(e)
             return [], None
-        medias.extend(items)
-        next_max_id = self.last_json.get("next_max_id", "")
         if amount:
             medias = medias[:amount]
         return ([extract_media_v1(media) for media in medias], next_max_id)
 
+    def _user_medias_v1_raw_page(
+        self,
+        user_id: str,
+        amount: int = 33,
+        end_cursor: str = "",
+        min_timestamp: int = None,
+    ) -> Tuple[List[dict], str]:
+        """Feed items of a page as sent by Instagram, before extract_media_v1"""
+        result = self.private_request(
+            f"feed/user/{int(user_id)}/",
+            params={
+                "max_id": end_cursor,
+                "count": int(amount),
+                "min_timestamp": min_timestamp,
+                "rank_token": self.rank_token,
+                "ranked_content": "true",
+            },
+        )
+        return result["items"], result.get("next_max_id", "")
+
+    def user_medias_pages_v1(
+        self,
+        user_id: str,
+        amount: int = 33,
+        end_cursor: str = "",
+        prefetch: int = 0,
+        min_timestamp: int = None,
+    ) -> Iterator[Tuple[List[Media], str]]:
+        """
+        Iterate over pages of user's media by Private Mobile API
+
+        Parameters
+        ----------
+        user_id: str
+        amount: int, optional
+            Number of media per page, default is 33
+        end_cursor: str, optional
+            Cursor value to start at, obtained from previous call to this method
+        prefetch: int, optional
+            How many pages to fetch in the background ahead of the consumer, default is 0
+        min_timestamp: int, optional
+            Only media posted after this unix timestamp, default is None (all medias)
+
+        Returns
+        -------
+        Iterator[Tuple[List[Media], str]]
+            Pages of medias with the next end_cursor value
+        """
+        fetch_page = partial(
+            self.user_medias_paginated_v1, user_id, amount, min_timestamp=min_timestamp
+        )
+        return PagePrefetcher(
+            lambda cursor: fetch_page(end_cursor=cursor), prefetch=prefetch
+        ).pages(end_cursor)
+
     def user_medias_v1(self, user_id: str, amount: int = 0) -> List[Media]:
         """
         Get a user's media by Private Mobile API
@@ -810,6 +861,73 @@ class MediaMixin:
             medias = self.user_medias_v1(user_id, amount)
         return medias
 
+    def _medias_since(
+        self,
+        pages: Iterator[Tuple[List[Media], str]],
+        min_timestamp: int = None,
+        last_pk: str = None,
+    ) -> List[Media]:
+        """
+        Collect newest-first pages until the last synced marker is passed
+
+        Pinned posts sit on top of the first page regardless of their age,
+        so a known item alone does not stop the sync: paging stops after the
+        page whose last item is not newer than the marker.
+
+        ``pages`` must raise on failed requests: a page swallowed as empty
+        would end the sync early and move the caller's marker past unseen medias.
+        """
+        since = min_timestamp
+        medias = []
+        try:
+            for page, _ in pages:
+                for media in page:
+                    if last_pk and str(media.pk) == str(last_pk):
+                        since = max(since or 0, media.taken_at.timestamp())
+                medias.extend(page)
+                if since is not None and page and page[-1].taken_at.timestamp() <= since:
+                    break
+        finally:
+            pages.close()
+        return [
+            media
+            for media in medias
+            if (since is None or media.taken_at.timestamp() > since)
+            and str(media.pk) != str(last_pk)
+        ]
+
+    def user_medias_since(
+        self, user_id: str, min_timestamp=None, last_pk: str = None
+    ) -> List[Media]:
+        """
+        Get user's media posted after the last sync (by Private Mobile API)
+
+        Parameters
+        ----------
+        user_id: str
+        min_timestamp: datetime or int, optional
+            Time of the last synced media, default is None
+        last_pk: str, optional
+            Pk of the last synced media, default is None
+
+        Returns
+        -------
+        List[Media]
+            New medias, newest first. All medias when the marker is not found
+        """
+        min_timestamp = _timestamp(min_timestamp)
+
+        def fetch_page(cursor: str) -> Tuple[List[Media], str]:
+            # Not user_medias_paginated_v1, which logs errors and returns an empty last page
+            items, cursor = self._user_medias_v1_raw_page(user_id, 33, cursor, min_timestamp)
+            return [extract_media_v1(item) for item in items], cursor
+
+        return self._medias_since(
+            PagePrefetcher(fetch_page, prefetch=0).pages(),
+            min_timestamp,
+            last_pk,
+        )
+
     def user_clips_paginated_v1(
         self, user_id: str, amount: int = 50, end_cursor: str = ""
     ) -> Tuple[List[Media], str]:
@@ -831,29 +949,58 @@ class MediaMixin:
         """
         amount = int(amount)
         user_id = int(user_id)
-        medias = []
-        next_max_id = end_cursor
         try:
-            items = self.private_request(
-                "clips/user/",
-                data={
-                    "target_user_id": user_id,
-                    "max_id": next_max_id,
-                    "page_size": amount,  # default from app: 12
-                    "include_feed_video": "true",
-                },
-            )["items"]
+            medias, next_max_id = self._user_clips_v1_raw_page(user_id, amount, end_cursor)
         except PrivateError as e:
             raise e
         except Exception as e:
             self.logger.exception(e)
             return [], None
-        medias.extend(items)
-        next_max_id = json_value(self.last_json, "paging_info", "max_id", default="")
         if amount:
             medias = medias[:amount]
         return ([extract_media_v1(media["media"]) for media in medias], next_max_id)
 
+    def _user_clips_v1_raw_page(
+        self, user_id: str, amount: int = 50, end_cursor: str = ""
+    ) -> Tuple[List[dict], str]:
+        """Clips items of a page as sent by Instagram, before extract_media_v1"""
+        result = self.private_request(
+            "clips/user/",
+            data={
+                "target_user_id": int(user_id),
+                "max_id": end_cursor,
+                "page_size": int(amount),  # default from app: 12
+                "include_feed_video": "true",
+            },
+        )
+        return result["items"], json_value(result, "paging_info", "max_id", default="")
+
+    def user_clips_pages_v1(
+        self, user_id: str, amount: int = 50, end_cursor: str = "", prefetch: int = 0
+    ) -> Iterator[Tuple[List[Media], str]]:
+        """
+        Iterate over pages of user's clip (reels) by Private Mobile API
+
+        Parameters
+        ----------
+        user_id: str
+        amount: int, optional
+            Number of media per page, default is 50
+        end_cursor: str, optional
+            Cursor value to start at, obtained from previous call to this method
+        prefetch: int, optional
+            How many pages to fetch in the background ahead of the consumer, default is 0
+
+        Returns
+        -------
+        Iterator[Tuple[List[Media], str]]
+            Pages of medias with the next end_cursor value
+        """
+        fetch_page = partial(self.user_clips_paginated_v1, user_id, amount)
+        return PagePrefetcher(
+            lambda cursor: fetch_page(end_cursor=cursor), prefetch=prefetch
+        ).pages(end_cursor)
+
     def user_clips_v1(self, user_id: str, amount: int = 0) -> List[Media]:
         """
         Get a user's clip (reels) by Private Mobile API
@@ -911,6 +1058,37 @@ class MediaMixin:
         user_id = int(user_id)
         return self.user_clips_v1(user_id, amount)
 
+    def user_clips_since(
+        self, user_id: str, min_timestamp=None, last_pk: str = None
+    ) -> List[Media]:
+        """
+        Get user's clips (reels) posted after the last sync (by Private Mobile API)
+
+        Parameters
+        ----------
+        user_id: str
+        min_timestamp: datetime or int, optional
+            Time of the last synced clip, default is None
+        last_pk: str, optional
+            Pk of the last synced clip, default is None
+
+        Returns
+        -------
+        List[Media]
+            New clips, newest first. All clips when the marker is not found
+        """
+
+        def fetch_page(cursor: str) -> Tuple[List[Media], str]:
+            # Not user_clips_paginated_v1, which logs errors and returns an empty last page
+            items, cursor = self._user_clips_v1_raw_page(user_id, 50, cursor)
+            return [extract_media_v1(item["media"]) for item in items], cursor
+
+        return self._medias_since(
+            PagePrefetcher(fetch_page, prefetch=0).pages(),
+            _timestamp(min_timestamp),
+            last_pk,
+        )
+
     def media_seen(self, media_ids: List[str], skipped_media_ids: List[str] = []):
         """
         Mark a media as seen
@@ -1056,6 +1234,30 @@ class MediaMixin:
             medias = medias[:amount]
         return [extract_media_gql(media) for media in medias]
 
+    def usertag_medias_paginated_v1(
+        self, user_id: str, end_cursor: str = ""
+    ) -> Tuple[List[Media], str]:
+        """
+        Get a page of medias where a user is tagged (by Private Mobile API)
+
+        Parameters
+        ----------
+        user_id: str
+        end_cursor: str, optional
+            Cursor value to start at, obtained from previous call to this method
+
+        Returns
+        -------
+        Tuple[List[Media], str]
+            A tuple containing a list of medias and the next end_cursor value
+        """
+        user_id = int(user_id)
+        result = self.private_request(
+            f"usertags/{user_id}/feed/", params={"max_id": end_cursor}
+        )
+        next_max_id = result.get("next_max_id", "") if result.get("more_available") else ""
+        return [extract_media_v1(media) for media in result["items"]], next_max_id
+
     def usertag_medias_v1(self, user_id: str, amount: int = 0) -> List[Media]:
         """
         Get medias where a user is tagged (by Private Mobile API)
@@ -1077,23 +1279,50 @@ class MediaMixin:
         next_max_id = ""
         while True:
             try:
-                items = self.private_request(
-                    f"usertags/{user_id}/feed/", params={"max_id": next_max_id}
-                )["items"]
+                medias_page, next_max_id = self.usertag_medias_paginated_v1(
+                    user_id, end_cursor=next_max_id
+                )
             except PrivateError as e:
                 raise e
             except Exception as e:
                 self.logger.exception(e)
                 break
-            medias.extend(items)
-            if not self.last_json.get("more_available"):
+            medias.extend(medias_page)
+            if not next_max_id:
                 break
             if amount and len(medias) >= amount:
                 break
-            next_max_id = self.last_json.get("next_max_id", "")
         if amount:
             medias = medias[:amount]
-        return [extract_media_v1(media) for media in medias]
+        return medias
+
+    def usertag_medias_since(
+        self, user_id: str, min_timestamp=None, last_pk: str = None
+    ) -> List[Media]:
+        """
+        Get medias where a user was tagged after the last sync (by Private Mobile API)
+
+        Parameters
+        ----------
+        user_id: str
+        min_timestamp: datetime or int, optional
+            Time of the last synced media, default is None
+        last_pk: str, optional
+            Pk of the last synced media, default is None
+
+        Returns
+        -------
+        List[Media]
+            New medias, newest first. All medias when the marker is not found
+        """
+        fetch_page = partial(self.usertag_medias_paginated_v1, user_id)
+        return self._medias_since(
+            PagePrefetcher(
+                lambda cursor: fetch_page(end_cursor=cursor), prefetch=0
+            ).pages(),
+            _timestamp(min_timestamp),
+            last_pk,
+        )
 
     def usertag_medias(self, user_id: str, amount: int = 0) -> List[Media]:
         """
@@ -1311,3 +1540,12 @@ class MediaMixin:
         except Exception as e:
             self.logger.error(f"Error retrieving live viewers: {e}")
             raise
+
+
+def _timestamp(value) -> int:
+    """Unix timestamp from a datetime or a number, None stays None"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
@@ -1,14 +1,11 @@
 import json
 import random
-import shutil
 import time
 from pathlib import Path
 from typing import Dict, List
 from urllib.parse import urlparse
 from uuid import uuid4
 
-import requests
-
 from instagrapi import config
 from instagrapi.exceptions import (
     PhotoConfigureError,
@@ -16,7 +13,7 @@ from instagrapi.exceptions import (
     PhotoNotUpload,
 )
 from instagrapi.extractors import extract_media_v1
-from instagrapi.image_util import prepare_image
+from instagrapi.image_util import PreparedImage, process_image
 from instagrapi.types import (
     Location,
     Media,
@@ -32,11 +29,6 @@ from instagrapi.types import (
 )
 from instagrapi.utils import date_time_original, dumps
 
-try:
-    from PIL import Image
-except ImportError:
-    raise Exception("You don't have PIL installed. Please install PIL or Pillow>=8.1.1")
-
 
 class DownloadPhotoMixin:
     """
@@ -92,12 +84,7 @@ class DownloadPhotoMixin:
         fname = urlparse(url).path.rsplit("/", 1)[1]
         filename = "%s.%s" % (filename, fname.rsplit(".", 1)[1]) if filename else fname
         path = Path(folder) / filename
-        response = requests.get(url, stream=True, timeout=self.request_timeout)
-        response.raise_for_status()
-        with open(path, "wb") as f:
-            response.raw.decode_content = True
-            shutil.copyfileobj(response.raw, f)
-        return path.resolve()
+        return self.download_to_path(url, path)
 
     def photo_download_by_url_origin(self, url: str) -> bytes:
         """
@@ -112,11 +99,7 @@ class DownloadPhotoMixin:
         -------
         bytes
         """
-        url = str(url)
-        response = requests.get(url, stream=True, timeout=self.request_timeout)
-        response.raise_for_status()
-        response.raw.decode_content = True
-        return response.content
+        return self.download_to_bytes(url)
 
 
 class UploadPhotoMixin:
@@ -130,6 +113,7 @@ class UploadPhotoMixin:
         upload_id: str = "",
         to_album: bool = False,
         for_story: bool = False,
+        prepared: PreparedImage = None,
     ) -> tuple:
         """
         Upload photo to Instagram
@@ -143,6 +127,8 @@ class UploadPhotoMixin:
         to_album: bool, optional
         for_story: bool, optional
             Useful for resize util only
+        prepared: PreparedImage, optional
+            Result of ``process_image`` for this path when it was already prepared, default is None
 
         Returns
         -------
@@ -181,15 +167,15 @@ class UploadPhotoMixin:
         }
         if to_album:
             rupload_params["is_sidecar"] = "1"
-        if for_story:
-            photo_data, photo_size = prepare_image(
+        if prepared is None and for_story:
+            prepared = process_image(
                 str(path),
-                max_side=1080,
                 aspect_ratios=(9 / 16, 90 / 47),
                 max_size=(1080, 1920),
             )
-        else:
-            photo_data, photo_size = prepare_image(str(path), max_side=1080)
+        elif prepared is None:
+            prepared = process_image(str(path))
+        photo_data = prepared.data
         photo_len = str(len(photo_data))
         headers = {
             "Accept-Encoding": "gzip",
@@ -216,8 +202,7 @@ class UploadPhotoMixin:
             )
             last_json = self.last_json  # local variable for read in sentry
             raise PhotoNotUpload(response.text, response=response, **last_json)
-        with Image.open(path) as im:
-            width, height = im.size
+        width, height = prepared.original_size
         return upload_id, width, height
 
     def photo_upload(
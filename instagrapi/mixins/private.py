@@ -1,8 +1,10 @@
 import json
 import logging
 import random
+import threading
 import time
 from json.decoder import JSONDecodeError
+from typing import Dict
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -35,7 +37,7 @@ from instagrapi.exceptions import (
     UserNotFound,
     VideoTooLongException,
 )
-from instagrapi.utils import dumps, generate_signature, random_delay
+from instagrapi.utils import dumps, generate_signature
 
 
 def manual_input_code(self, username: str, choice=None):
@@ -81,8 +83,6 @@ class PrivateRequestMixin:
     private_request_logger = logging.getLogger("private_request")
     request_timeout = 1
     domain = config.API_DOMAIN
-    last_response = None
-    last_json = {}
 
     def __init__(self, *args, **kwargs):
         # setup request session with retries
@@ -105,12 +105,48 @@ class PrivateRequestMixin:
         session.mount("https://", adapter)
         session.mount("http://", adapter)
         self.private = session
+        self.private_lock = threading.Lock()  # request pacing and shared session headers
+        self._private_local = threading.local()  # last_json/last_response of each thread
+        self._next_request_at = 0.0
         self.private.verify = False  # fix SSLError/HTTPSConnectionPool
         self.email = kwargs.pop("email", None)
         self.phone_number = kwargs.pop("phone_number", None)
         self.request_timeout = kwargs.pop("request_timeout", self.request_timeout)
         super().__init__(*args, **kwargs)
 
+    @property
+    def last_json(self) -> Dict:
+        """Json of the last private request made by the calling thread"""
+        return getattr(self._private_local, "last_json", {})
+
+    @last_json.setter
+    def last_json(self, value: Dict):
+        self._private_local.last_json = value
+
+    @property
+    def last_response(self):
+        """Response of the last private request made by the calling thread"""
+        return getattr(self._private_local, "last_response", None)
+
+    @last_response.setter
+    def last_response(self, value):
+        self._private_local.last_response = value
+
+    def _wait_request_slot(self):
+        """
+        Sleep ``delay_range`` since the previous private request of any thread
+
+        Every thread using the client (foreground and prefetch) shares one
+        pace, so concurrent callers do not multiply the request rate.
+        """
+        if not self.delay_range:
+            return
+        with self.private_lock:
+            now = time.monotonic()
+            start = max(now, self._next_request_at) + random.uniform(*self.delay_range)
+            self._next_request_at = start
+        time.sleep(start - now)
+
     def small_delay(self):
         """
         Small Delay
@@ -310,9 +346,10 @@ class PrivateRequestMixin:
     ):
         self.last_response = None
         self.last_json = last_json = {}  # for Sentry context in traceback
-        self.private.headers.update(self.base_headers)
-        if headers:
-            self.private.headers.update(headers)
+        with self.private_lock:
+            self.private.headers.update(self.base_headers)
+        # Per request headers are not stored on the session shared by all threads
+        headers = dict(headers or {})
         if not login:
             time.sleep(self.request_timeout)
         # if self.user_id and login:
@@ -329,21 +366,23 @@ class PrivateRequestMixin:
             if data:  # POST
                 # Client.direct_answer raw dict
                 # data = json.dumps(data)
-                self.private.headers[
-                    "Content-Type"
-                ] = "application/x-www-form-urlencoded; charset=UTF-8"
+                headers["Content-Type"] = "application/x-www-form-urlencoded; charset=UTF-8"
                 if with_signature:
                     # Client.direct_answer doesn't need a signature
                     data = generate_signature(dumps(data))
                     if extra_sig:
                         data += "&".join(extra_sig)
                 response = self.private.post(
-                    api_url, data=data, params=params, proxies=self.private.proxies
+                    api_url,
+                    data=data,
+                    params=params,
+                    headers=headers,
+                    proxies=self.private.proxies,
                 )
             else:  # GET
-                self.private.headers.pop("Content-Type", None)
+                headers["Content-Type"] = None
                 response = self.private.get(
-                    api_url, params=params, proxies=self.private.proxies
+                    api_url, params=params, headers=headers, proxies=self.private.proxies
                 )
             self.logger.debug(
                 "private_request %s: %s (%s)",
@@ -529,10 +568,10 @@ class PrivateRequestMixin:
             domain=domain,
         )
         try:
-            if self.delay_range:
-                random_delay(delay_range=self.delay_range)
-            self.private_requests_count += 1
-            self._send_private_request(endpoint, **kwargs)
+            self._wait_request_slot()
+            with self.private_lock:
+                self.private_requests_count += 1
+            return self._send_private_request(endpoint, **kwargs)
         except ClientRequestTimeout:
             self.logger.info(
                 "Wait 60 seconds and try one more time (ClientRequestTimeout)"
@@ -552,4 +591,3 @@ class PrivateRequestMixin:
                 # After challenge resolve return last_json
                 return self.last_json
             return self._send_private_request(endpoint, **kwargs)
-        return self.last_json
@@ -1,12 +1,16 @@
 import json
-import shutil
 from copy import deepcopy
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 from urllib.parse import urlparse
 
 from instagrapi import config
-from instagrapi.exceptions import ClientNotFoundError, StoryNotFound, UserNotFound
+from instagrapi.exceptions import (
+    ClientError,
+    ClientNotFoundError,
+    StoryNotFound,
+    UserNotFound,
+)
 from instagrapi.extractors import (
     extract_story_gql,
     extract_story_v1,
@@ -14,6 +18,8 @@ from instagrapi.extractors import (
 )
 from instagrapi.types import Story, UserShort
 
+STORIES_BATCH_SIZE = 50  # reels per feed/reels_media/ or GraphQL call
+
 
 class StoryMixin:
     _stories_cache = {}  # pk -> object
@@ -124,24 +130,8 @@ class StoryMixin:
             A list of objects of UserShort for each user_id
         """
         assert isinstance(user_ids, list), "user_ids should be a list of user_id"
-        self.inject_sessionid_to_public()
-
-        def _userid_chunks():
-            assert user_ids is not None
-            user_ids_per_query = 50
-            for i in range(0, len(user_ids), user_ids_per_query):
-                end = i + user_ids_per_query
-                yield user_ids[i:end]
-
-        stories_un = {}
-        for userid_chunk in _userid_chunks():
-            res = self.public_graphql_request(
-                query_hash="303a4ae99711322310f25250d988f3b7",
-                variables={"reel_ids": userid_chunk, "precomposed_overlay": False},
-            )
-            stories_un.update(res)
         users = []
-        for media in stories_un["reels_media"]:
+        for media in self._reels_media_gql(user_ids):
             user = extract_user_short(media["owner"])
             items = media["items"]
             if amount:
@@ -150,6 +140,113 @@ class StoryMixin:
             users.append(user)
         return users
 
+    def _reels_media_gql(self, user_ids: List[int]) -> List[Dict]:
+        self.inject_sessionid_to_public()
+        reels_media = []
+        for i in range(0, len(user_ids), STORIES_BATCH_SIZE):
+            res = self.public_graphql_request(
+                query_hash="303a4ae99711322310f25250d988f3b7",
+                variables={
+                    "reel_ids": user_ids[i : i + STORIES_BATCH_SIZE],
+                    "precomposed_overlay": False,
+                },
+            )
+            reels_media.extend(res.get("reels_media") or [])
+        return reels_media
+
+    def users_stories_v1(
+        self, user_ids: List[str], amount: int = 0
+    ) -> Dict[str, List[Story]]:
+        """
+        Get stories of many users, 50 users per request (Private API)
+
+        Parameters
+        ----------
+        user_ids: List[str]
+            List of user ids
+        amount: int, optional
+            Maximum number of stories per user, default is 0 (all)
+
+        Returns
+        -------
+        Dict[str, List[Story]]
+            User id -> stories, an empty list for users without active stories
+        """
+        user_ids = [str(user_id) for user_id in user_ids]
+        stories = {user_id: [] for user_id in user_ids}
+        for i in range(0, len(user_ids), STORIES_BATCH_SIZE):
+            result = self.private_request(
+                "feed/reels_media/",
+                {
+                    "exclude_media_ids": "[]",
+                    "supported_capabilities_new": json.dumps(config.SUPPORTED_CAPABILITIES),
+                    "source": "feed_timeline",
+                    "_uid": str(self.user_id),
+                    "_uuid": self.uuid,
+                    "user_ids": user_ids[i : i + STORIES_BATCH_SIZE],
+                },
+            )
+            for reel_id, reel in (result.get("reels") or {}).items():
+                items = reel.get("items") or []
+                if amount:
+                    items = items[: int(amount)]
+                for item in items:
+                    item.setdefault("user", reel.get("user"))
+                stories[str(reel_id)] = [extract_story_v1(item) for item in items]
+        return stories
+
+    def users_stories_gql_batch(
+        self, user_ids: List[str], amount: int = 0
+    ) -> Dict[str, List[Story]]:
+        """
+        Get stories of many users, 50 users per request (Public API)
+
+        Parameters
+        ----------
+        user_ids: List[str]
+            List of user ids
+        amount: int, optional
+            Maximum number of stories per user, default is 0 (all)
+
+        Returns
+        -------
+        Dict[str, List[Story]]
+            User id -> stories, an empty list for users without active stories
+        """
+        user_ids = [str(user_id) for user_id in user_ids]
+        stories = {user_id: [] for user_id in user_ids}
+        for reel in self._reels_media_gql(user_ids):
+            items = reel.get("items") or []
+            if amount:
+                items = items[: int(amount)]
+            stories[str(reel["owner"]["id"])] = [extract_story_gql(m) for m in items]
+        return stories
+
+    def users_stories(
+        self, user_ids: List[str], amount: int = 0
+    ) -> Dict[str, List[Story]]:
+        """
+        Get stories of many users in batches instead of one request per user
+
+        Parameters
+        ----------
+        user_ids: List[str]
+            List of user ids
+        amount: int, optional
+            Maximum number of stories per user, default is 0 (all)
+
+        Returns
+        -------
+        Dict[str, List[Story]]
+            User id -> stories, an empty list for users without active stories
+        """
+        try:
+            return self.users_stories_gql_batch(user_ids, amount)
+        except Exception as e:
+            if not isinstance(e, ClientError):
+                self.logger.exception(e)
+            return self.users_stories_v1(user_ids, amount)
+
     def user_stories_gql(self, user_id: str, amount: int = None) -> List[Story]:
         """
         Get a user's stories (Public API)
@@ -294,16 +391,7 @@ class StoryMixin:
         )
         filename = "%s.%s" % (filename, fname.rsplit(".", 1)[1]) if filename else fname
         path = Path(folder) / filename
-
-        response = self._send_public_request(
-            url, stream=True, timeout=self.request_timeout
-        )
-        response.raise_for_status()
-
-        with open(path, "wb") as f:
-            response.raw.decode_content = True
-            shutil.copyfileobj(response.raw, f)
-        return path.resolve()
+        return self.download_to_path(url, path)
 
     def story_viewers(self, story_pk: int, amount: int = 0) -> List[UserShort]:
         """
@@ -1,10 +1,7 @@
-import shutil
 from pathlib import Path
 from typing import Any, Dict
 from urllib.parse import urlparse
 
-import requests
-
 from instagrapi.exceptions import ClientError, TrackNotFound
 from instagrapi.extractors import extract_track
 from instagrapi.types import Track
@@ -38,12 +35,7 @@ class TrackMixin:
         assert fname, """The URL must contain the path to the file (m4a or mp3)."""
         filename = "%s.%s" % (filename, fname.rsplit(".", 1)[1]) if filename else fname
         path = Path(folder) / filename
-        response = requests.get(url, stream=True, timeout=self.request_timeout)
-        response.raise_for_status()
-        with open(path, "wb") as f:
-            response.raw.decode_content = True
-            shutil.copyfileobj(response.raw, f)
-        return path.resolve()
+        return self.download_to_path(url, path)
 
     def _track_request(self, data: Dict[str, Any]) -> Dict:
         try:
@@ -11,6 +11,7 @@ from instagrapi.exceptions import (
     UserNotFound,
 )
 from instagrapi.extractors import extract_user_gql, extract_user_short, extract_user_v1
+from instagrapi.pkset import PkSet, PkSetBuilder
 from instagrapi.types import Relationship, RelationshipShort, User, UserShort
 from instagrapi.utils import json_value
 
@@ -35,6 +36,8 @@ class UserMixin:
     _usernames_cache = {}  # username -> user_pk
     _users_following = {}  # user_pk -> dict(user_pk -> "short user object")
     _users_followers = {}  # user_pk -> dict(user_pk -> "short user object")
+    _users_following_pks = {}  # user_pk -> PkSet
+    _users_followers_pks = {}  # user_pk -> PkSet
 
     def user_id_from_username(self, username: str) -> str:
         """
@@ -583,6 +586,46 @@ class UserMixin:
             users = users[:amount]
         return users
 
+    def user_following_v1_page(
+        self, user_id: str, max_id: str = "", count: int = MAX_USER_COUNT
+    ) -> Tuple[List[UserShort], str]:
+        """
+        Get one page of user's following users by Private Mobile API and max_id (cursor)
+
+        Parameters
+        ----------
+        user_id: str
+            User id of an instagram account
+        max_id: str, optional
+            Max ID, default value is empty String
+        count: int, optional
+            Page size requested from Instagram, default is 200
+
+        Returns
+        -------
+        Tuple[List[UserShort], str]
+            Tuple of List of users and next max_id (empty when there are no more pages)
+        """
+        users, max_id = self._user_friendships_v1_raw_page("following", user_id, max_id, count)
+        return [extract_user_short(user) for user in users], max_id
+
+    def _user_friendships_v1_raw_page(
+        self, kind: str, user_id: str, max_id: str = "", count: int = MAX_USER_COUNT
+    ) -> Tuple[List[dict], str]:
+        """Users of a followers or following page as sent by Instagram, before extract_user_short"""
+        result = self.private_request(
+            f"friendships/{user_id}/{kind}/",
+            params={
+                "max_id": max_id,
+                "count": count,
+                "rank_token": self.rank_token,
+                "search_surface": "follow_list_page",
+                "query": "",
+                "enable_groups": "true",
+            },
+        )
+        return result["users"], result.get("next_max_id")
+
     def user_following_v1_chunk(
         self, user_id: str, max_amount: int = 0, max_id: str = ""
     ) -> Tuple[List[UserShort], str]:
@@ -606,24 +649,14 @@ class UserMixin:
         unique_set = set()
         users = []
         while True:
-            result = self.private_request(
-                f"friendships/{user_id}/following/",
-                params={
-                    "max_id": max_id,
-                    "count": max_amount or MAX_USER_COUNT,
-                    "rank_token": self.rank_token,
-                    "search_surface": "follow_list_page",
-                    "query": "",
-                    "enable_groups": "true",
-                },
+            page, max_id = self.user_following_v1_page(
+                user_id, max_id, max_amount or MAX_USER_COUNT
             )
-            for user in result["users"]:
-                user = extract_user_short(user)
+            for user in page:
                 if user.pk in unique_set:
                     continue
                 unique_set.add(user.pk)
                 users.append(user)
-            max_id = result.get("next_max_id")
             if not max_id or (max_amount and len(users) >= max_amount):
                 break
         return users, max_id
@@ -687,6 +720,42 @@ class UserMixin:
             following = dict(list(following.items())[:amount])
         return following
 
+    def user_following_pks(
+        self, user_id: str, use_cache: bool = True, usernames: bool = True
+    ) -> PkSet:
+        """
+        Get user's following users as a compact pk set
+
+        Unlike ``user_following``, pages are folded into int64 arrays as they
+        arrive, so no UserShort objects are kept for the whole list.
+
+        Parameters
+        ----------
+        user_id: str
+            User id of an instagram account
+        use_cache: bool, optional
+            Whether or not to use information from cache, default value is True
+        usernames: bool, optional
+            Whether to keep the username side table, default value is True
+
+        Returns
+        -------
+        PkSet
+            Sorted set of user pks
+        """
+        user_id = str(user_id)
+        pks = self._users_following_pks.get(user_id)
+        if not use_cache or pks is None or (usernames and not pks.has_usernames):
+            builder = PkSetBuilder(usernames)
+            max_id = ""
+            while True:
+                page, max_id = self.user_following_v1_page(user_id, max_id)
+                builder.extend(page)
+                if not max_id:
+                    break
+            pks = self._users_following_pks[user_id] = builder.build()
+        return pks
+
     def user_followers_gql_chunk(
         self, user_id: str, max_amount: int = 0, end_cursor: str = None
     ) -> Tuple[List[UserShort], str]:
@@ -758,6 +827,29 @@ class UserMixin:
             users = users[:amount]
         return users
 
+    def user_followers_v1_page(
+        self, user_id: str, max_id: str = "", count: int = MAX_USER_COUNT
+    ) -> Tuple[List[UserShort], str]:
+        """
+        Get one page of user's followers by Private Mobile API and max_id (cursor)
+
+        Parameters
+        ----------
+        user_id: str
+            User id of an instagram account
+        max_id: str, optional
+            Max ID, default value is empty String
+        count: int, optional
+            Page size requested from Instagram, default is 200
+
+        Returns
+        -------
+        Tuple[List[UserShort], str]
+            Tuple of List of users and next max_id (empty when there are no more pages)
+        """
+        users, max_id = self._user_friendships_v1_raw_page("followers", user_id, max_id, count)
+        return [extract_user_short(user) for user in users], max_id
+
     def user_followers_v1_chunk(
         self, user_id: str, max_amount: int = 0, max_id: str = ""
     ) -> Tuple[List[UserShort], str]:
@@ -781,24 +873,14 @@ class UserMixin:
         unique_set = set()
         users = []
         while True:
-            result = self.private_request(
-                f"friendships/{user_id}/followers/",
-                params={
-                    "max_id": max_id,
-                    "count": max_amount or MAX_USER_COUNT,
-                    "rank_token": self.rank_token,
-                    "search_surface": "follow_list_page",
-                    "query": "",
-                    "enable_groups": "true",
-                },
+            page, max_id = self.user_followers_v1_page(
+                user_id, max_id, max_amount or MAX_USER_COUNT
             )
-            for user in result["users"]:
-                user = extract_user_short(user)
+            for user in page:
                 if user.pk in unique_set:
                     continue
                 unique_set.add(user.pk)
                 users.append(user)
-            max_id = result.get("next_max_id")
             if not max_id or (max_amount and len(users) >= max_amount):
                 break
         return users, max_id
@@ -859,6 +941,42 @@ class UserMixin:
             followers = dict(list(followers.items())[:amount])
         return followers
 
+    def user_followers_pks(
+        self, user_id: str, use_cache: bool = True, usernames: bool = True
+    ) -> PkSet:
+        """
+        Get user's followers as a compact pk set
+
+        Unlike ``user_followers``, pages are folded into int64 arrays as they
+        arrive, so no UserShort objects are kept for the whole list.
+
+        Parameters
+        ----------
+        user_id: str
+            User id of an instagram account
+        use_cache: bool, optional
+            Whether or not to use information from cache, default value is True
+        usernames: bool, optional
+            Whether to keep the username side table, default value is True
+
+        Returns
+        -------
+        PkSet
+            Sorted set of user pks
+        """
+        user_id = str(user_id)
+        pks = self._users_followers_pks.get(user_id)
+        if not use_cache or pks is None or (usernames and not pks.has_usernames):
+            builder = PkSetBuilder(usernames)
+            max_id = ""
+            while True:
+                page, max_id = self.user_followers_v1_page(user_id, max_id)
+                builder.extend(page)
+                if not max_id:
+                    break
+            pks = self._users_followers_pks[user_id] = builder.build()
+        return pks
+
     def user_follow(self, user_id: str) -> bool:
         """
         Follow a user
@@ -881,6 +999,7 @@ class UserMixin:
         result = self.private_request(f"friendships/create/{user_id}/", data)
         if self.user_id in self._users_following:
             self._users_following.pop(self.user_id)  # reset
+        self._users_following_pks.pop(str(self.user_id), None)
         return result["friendship_status"]["following"] is True
 
     def user_unfollow(self, user_id: str) -> bool:
@@ -902,6 +1021,7 @@ class UserMixin:
         result = self.private_request(f"friendships/destroy/{user_id}/", data)
         if self.user_id in self._users_following:
             self._users_following[self.user_id].pop(user_id, None)
+        self._users_following_pks.pop(str(self.user_id), None)
         return result["friendship_status"]["following"] is False
 
     def user_block(self, user_id: str, surface: str = "profile") -> bool:
@@ -984,6 +1104,7 @@ class UserMixin:
         result = self.private_request(f"friendships/remove_follower/{user_id}/", data)
         if self.user_id in self._users_followers:
             self._users_followers[self.user_id].pop(user_id, None)
+        self._users_followers_pks.pop(str(self.user_id), None)
         return result["friendship_status"]["followed_by"] is False
 
     def mute_posts_from_follow(self, user_id: str, revert: bool = False) -> bool:
@@ -9,6 +9,7 @@ import requests
 
 from instagrapi import config
 from instagrapi.exceptions import (
+    ClientIncompleteReadError,
     VideoConfigureError,
     VideoConfigureStoryError,
     VideoNotDownload,
@@ -30,6 +31,7 @@ from instagrapi.types import (
     Usertag,
 )
 from instagrapi.utils import date_time_original, dumps
+from instagrapi.video_probe import analyze_video
 
 
 class DownloadVideoMixin:
@@ -85,31 +87,10 @@ class DownloadVideoMixin:
         fname = urlparse(url).path.rsplit("/", 1)[1]
         filename = "%s.%s" % (filename, fname.rsplit(".", 1)[1]) if filename else fname
         path = Path(folder) / filename
-        response = requests.get(url, stream=True, timeout=self.request_timeout)
-        response.raise_for_status()
         try:
-            content_length = int(response.headers.get("Content-Length"))
-        except TypeError:
-            print(
-                """
-                The program detected an mis-formatted link, and hence can't download it.
-                This problem occurs when the URL is passed into
-                    'video_download_by_url()' or the 'clip_download_by_url()'.
-                The raw URL needs to be re-formatted into one that is recognizable by the methods.
-                Use this code: url=self.cl.media_info(self.cl.media_pk_from_url('insert the url here')).video_url
-                You can remove the 'self' from the code above if needed.
-                """
-            )
-            raise Exception("The program detected an mis-formatted link.")
-        file_length = len(response.content)
-        if content_length != file_length:
-            raise VideoNotDownload(
-                f'Broken file "{path}" (Content-length={content_length}, but file length={file_length})'
-            )
-        with open(path, "wb") as f:
-            f.write(response.content)
-            f.close()
-        return path.resolve()
+            return self.download_to_path(url, path)
+        except ClientIncompleteReadError as e:
+            raise VideoNotDownload(f'Broken file "{path}" ({e})')
 
     def video_download_by_url_origin(self, url: str) -> bytes:
         """
@@ -125,15 +106,10 @@ class DownloadVideoMixin:
         bytes
             Bytes for the file downloaded
         """
-        response = requests.get(url, stream=True, timeout=self.request_timeout)
-        response.raise_for_status()
-        content_length = int(response.headers.get("Content-Length"))
-        file_length = len(response.content)
-        if content_length != file_length:
-            raise VideoNotDownload(
-                f'Broken file from url "{url}" (Content-length={content_length}, but file length={file_length})'
-            )
-        return response.content
+        try:
+            return self.download_to_bytes(url)
+        except ClientIncompleteReadError as e:
+            raise VideoNotDownload(str(e))
 
 
 class UploadVideoMixin:
@@ -141,6 +117,8 @@ class UploadVideoMixin:
     Helpers for downloading video
     """
 
+    rupload_retries = 5  # resumes of an interrupted video upload
+
     def video_rupload(
         self,
         path: Path,
@@ -148,6 +126,7 @@ class UploadVideoMixin:
         to_album: bool = False,
         to_story: bool = False,
         to_direct: bool = False,
+        upload_id: str = "",
     ) -> tuple:
         """
         Upload video to Instagram
@@ -161,6 +140,8 @@ class UploadVideoMixin:
         to_album: bool, optional
         to_story: bool, optional
         to_direct: bool, optional
+        upload_id: str, optional
+            Unique upload_id (String). When None, then generate automatically
 
         Returns
         -------
@@ -168,7 +149,7 @@ class UploadVideoMixin:
             (Upload ID for the media, width, height)
         """
         assert isinstance(path, Path), f"Path must been Path, now {path} ({type(path)})"
-        upload_id = str(int(time.time() * 1000))
+        upload_id = upload_id or str(int(time.time() * 1000))
         width, height, duration, thumbnail = analyze_video(path, thumbnail)
         waterfall_id = str(uuid4())
         # upload_name example: '1576102477530_0_7823256191'
@@ -206,39 +187,86 @@ class UploadVideoMixin:
         }
         if to_album:
             headers = {"Segment-Start-Offset": "0", "Segment-Type": "3", **headers}
-        response = self.private.get(
-            "https://{domain}/rupload_igvideo/{name}".format(
-                domain=config.API_DOMAIN, name=upload_name
-            ),
-            headers=headers,
-        )
-        self.request_log(response)
-        if response.status_code != 200:
-            raise VideoNotUpload(response.text, response=response, **self.last_json)
-        with open(path, "rb") as fp:
-            video_data = fp.read()
-            video_len = str(len(video_data))
-        headers = {
-            "Offset": "0",
-            "X-Entity-Name": upload_name,
-            "X-Entity-Length": video_len,
-            "Content-Type": "application/octet-stream",
-            "Content-Length": video_len,
-            "X-Entity-Type": "video/mp4",
-            **headers,
-        }
-        response = self.private.post(
-            "https://{domain}/rupload_igvideo/{name}".format(
-                domain=config.API_DOMAIN, name=upload_name
-            ),
-            data=video_data,
-            headers=headers,
-        )
-        self.request_log(response)
-        if response.status_code != 200:
-            raise VideoNotUpload(response.text, response=response, **self.last_json)
+        headers["X-Entity-Type"] = "video/mp4"
+        self.rupload_igvideo(path, upload_name, headers, VideoNotUpload)
         return upload_id, width, height, duration, Path(thumbnail)
 
+    def rupload_igvideo(
+        self,
+        path: Path,
+        upload_name: str,
+        headers: Dict[str, str],
+        error: type = VideoNotUpload,
+        retries: int = None,
+    ) -> requests.Response:
+        """
+        Resumable upload of a video file to rupload_igvideo
+
+        The GET reports how many bytes the server already has (``offset``).
+        The rest of the file is streamed from disk from that offset, so memory
+        use does not depend on the file size. After a dropped connection or a
+        server error the offset is queried again and only the missing tail is
+        sent.
+
+        Parameters
+        ----------
+        path: Path
+            Path to the video
+        upload_name: str
+            Entity name of the upload
+        headers: Dict[str, str]
+            Rupload headers (X-Instagram-Rupload-Params, waterfall id, ...)
+        error: type, optional
+            Exception raised on failure, default is VideoNotUpload
+        retries: int, optional
+            Resume attempts, default is rupload_retries
+
+        Returns
+        -------
+        requests.Response
+            Response of the final POST
+        """
+        url = "https://{domain}/rupload_igvideo/{name}".format(
+            domain=config.API_DOMAIN, name=upload_name
+        )
+        retries = self.rupload_retries if retries is None else retries
+        length = Path(path).stat().st_size
+        for attempt in range(retries + 1):
+            response = self.private.get(url, headers=headers)
+            self.request_log(response)
+            if response.status_code != 200:
+                raise error(response.text, response=response, **_rupload_json(response))
+            offset = _rupload_offset(response)
+            try:
+                with open(path, "rb") as fp:
+                    fp.seek(offset)
+                    response = self.private.post(
+                        url,
+                        data=fp,
+                        headers={
+                            "Offset": str(offset),
+                            "X-Entity-Name": upload_name,
+                            "X-Entity-Length": str(length),
+                            "Content-Type": "application/octet-stream",
+                            "Content-Length": str(length - offset),
+                            **headers,
+                        },
+                    )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == retries:
+                    raise e
+                self.logger.warning(
+                    "Upload %s interrupted after offset %d, resume (%s)", upload_name, offset, e
+                )
+                time.sleep(2 ** attempt)
+                continue
+            self.request_log(response)
+            if response.status_code == 200:
+                return response
+            if response.status_code < 500 or attempt == retries:
+                raise error(response.text, response=response, **_rupload_json(response))
+            time.sleep(2 ** attempt)
+
     def video_upload(
         self,
         path: Path,
@@ -918,41 +946,18 @@ class UploadVideoMixin:
         raise VideoConfigureStoryError(response=self.last_response, **self.last_json)
 
 
-def analyze_video(path: Path, thumbnail: Path = None) -> tuple:
-    """
-    Story Configure for Photo
-
-    Parameters
-    ----------
-    path: Path
-        Path to the media
-    thumbnail: str
-        Path to thumbnail for video. When None, then thumbnail is generate automatically
-
-    Returns
-    -------
-    Tuple
-        (width, height, duration, thumbnail)
-    """
-
+def _rupload_offset(response: requests.Response) -> int:
+    """Bytes of the upload the server already has, from the rupload GET"""
     try:
-        import moviepy.editor as mp
-    except ImportError:
-        try:
-            import moviepy as mp
-        except ImportError:
-            raise Exception("Please install moviepy>=1.0.3 and retry")
-
-    print(f'Analyzing video file "{path}"')
-    video = mp.VideoFileClip(str(path))
-    width, height = video.size
-    if not thumbnail:
-        thumbnail = f"{path}.jpg"
-        print(f'Generating thumbnail "{thumbnail}"...')
-        video.save_frame(thumbnail, t=(video.duration / 2))
-    # duration = round(video.duration + 0.001, 3)
+        return int(response.json().get("offset") or 0)
+    except (ValueError, AttributeError):
+        return 0
+
+
+def _rupload_json(response: requests.Response) -> Dict:
+    """Json body of a failed rupload response, empty when it is not a json object"""
     try:
-        video.close()
-    except AttributeError:
-        pass
-    return width, height, video.duration, thumbnail
+        data = response.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
@@ -0,0 +1,164 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Tuple
+
+Page = Tuple[List[Any], str]
+
+
+class PagePrefetcher:
+    """
+    Helpers for cursor pagination with background prefetching
+
+    Wraps a page function such as ``user_medias_paginated_v1`` and, every
+    time a page is handed out, schedules the next ``prefetch`` pages on a
+    single background worker. Because there is only one worker, requests
+    are still sent one after another through ``private_request``, so the
+    client ``delay_range`` budget is never exceeded.
+
+    Many prefetchers can share one bounded ``executor`` instead of each
+    starting its own worker thread. Prefetched pages older than ``ttl``
+    seconds are fetched again.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[str], Page],
+        prefetch: int = 1,
+        max_pages: int = 16,
+        ttl: float = 0,
+        executor: ThreadPoolExecutor = None,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        fetch_page: Callable[[str], Tuple[List, str]]
+            Function which takes a cursor and returns a page and the next cursor
+        prefetch: int, optional
+            How many pages to fetch ahead of the consumer, default is 1 (0 disables prefetching)
+        max_pages: int, optional
+            Maximum number of fetched pages kept in memory, default is 16
+        ttl: float, optional
+            Seconds a prefetched page may be served, default is 0 (no expiry)
+        executor: ThreadPoolExecutor, optional
+            Shared executor to fetch on, default is None (one worker owned by this prefetcher)
+
+        Returns
+        -------
+        Void
+        """
+        self.fetch_page = fetch_page
+        self.prefetch = max(int(prefetch), 0)
+        self.max_pages = max(int(max_pages), self.prefetch + 1)
+        self.ttl = ttl
+        self._pages = OrderedDict()  # cursor -> (Future, submitted at)
+        self._lock = threading.Lock()
+        self._shared_executor = executor
+        self._executor = None
+        self._closed = False
+
+    def _submit(self, end_cursor: str, depth: int) -> Future:
+        with self._lock:
+            entry = self._pages.get(end_cursor)
+            if entry is not None:
+                future, submitted_at = entry
+                if not self.ttl or time.monotonic() - submitted_at < self.ttl:
+                    return future
+                del self._pages[end_cursor]
+                future.cancel()
+            executor = self._shared_executor
+            if executor is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="instagrapi-prefetch"
+                    )
+                executor = self._executor
+            future = executor.submit(self._fetch, end_cursor, depth)
+            self._pages[end_cursor] = (future, time.monotonic())
+            while len(self._pages) > self.max_pages:
+                _, (stale, _) = self._pages.popitem(last=False)
+                stale.cancel()
+            return future
+
+    def _fetch(self, end_cursor: str, depth: int) -> Page:
+        items, next_cursor = self.fetch_page(end_cursor)
+        if depth > 0 and next_cursor and not self._closed:
+            self._submit(next_cursor, depth - 1)
+        return items, next_cursor
+
+    def page(self, end_cursor: str = "") -> Page:
+        """
+        Get a page by cursor, served from the prefetched pages when warm
+
+        Parameters
+        ----------
+        end_cursor: str, optional
+            Cursor value to start at, default value is empty String
+
+        Returns
+        -------
+        Tuple[List, str]
+            A tuple containing a page of items and the next cursor value
+        """
+        end_cursor = end_cursor or ""
+        if not self.prefetch:
+            return self.fetch_page(end_cursor)
+        self._closed = False
+        future = self._submit(end_cursor, 0)
+        try:
+            items, next_cursor = future.result()
+        finally:
+            with self._lock:
+                if self._pages.get(end_cursor, (None,))[0] is future:
+                    del self._pages[end_cursor]
+        if next_cursor:
+            self._submit(next_cursor, self.prefetch - 1)
+        return items, next_cursor
+
+    def pages(self, end_cursor: str = "") -> Iterator[Page]:
+        """
+        Iterate over pages until the cursor is exhausted
+
+        Parameters
+        ----------
+        end_cursor: str, optional
+            Cursor value to start at, default value is empty String
+
+        Returns
+        -------
+        Iterator[Tuple[List, str]]
+            Pages with the cursor of the following page
+        """
+        try:
+            while True:
+                items, end_cursor = self.page(end_cursor)
+                yield items, end_cursor
+                if not end_cursor:
+                    break
+        finally:
+            self.close(wait=False)
+
+    def close(self, wait: bool = True):
+        """
+        Drop prefetched pages and stop the background worker (a shared executor is left running)
+
+        Parameters
+        ----------
+        wait: bool, optional
+            Whether to wait for an in-flight request, default value is True
+
+        Returns
+        -------
+        Void
+        """
+        with self._lock:
+            self._closed = True
+            for future, _ in self._pages.values():
+                future.cancel()
+            self._pages.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -0,0 +1,432 @@
+import json
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAGIC = b"PKSET1\n"
+
+
+class PkSet:
+    """
+    Compact, immutable set of user pks
+
+    Pks are kept as a sorted array of unique int64 (8 bytes per user), so a
+    5M followers list takes about 40MB instead of gigabytes of UserShort
+    objects. An optional username side table stores every username once in
+    a single UTF-8 blob. Set operations run as merges over the sorted arrays
+    and are vectorized with NumPy when it is installed.
+    """
+
+    __slots__ = ("_pks", "_slots", "_offsets", "_names")
+
+    def __init__(self, pks: Iterable = (), usernames: Iterable[str] = None):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        pks: Iterable
+            User pks (int or str), duplicates are dropped
+        usernames: Iterable[str], optional
+            Usernames aligned with ``pks``, default is None (no side table)
+
+        Returns
+        -------
+        Void
+        """
+        raw = array("q", (int(pk) for pk in pks))
+        names = offsets = None
+        if usernames is not None:
+            names = bytearray()
+            offsets = array("Q", [0])
+            for username in usernames:
+                names += (username or "").encode("utf-8")
+                offsets.append(len(names))
+            if len(offsets) != len(raw) + 1:
+                raise ValueError("pks and usernames must have the same length")
+        self._build(raw, names, offsets)
+
+    def _build(self, raw: array, names: bytearray = None, offsets: array = None):
+        pks, slots = _sort_unique(raw)
+        self._pks = pks
+        self._slots = slots if names is not None else None
+        self._offsets = offsets
+        self._names = bytes(names) if names is not None else None
+
+    @classmethod
+    def from_users(cls, users: Iterable, usernames: bool = True) -> "PkSet":
+        """
+        Build from UserShort objects (or any objects with pk and username)
+
+        Parameters
+        ----------
+        users: Iterable
+            Users, for example the values of ``user_followers``
+        usernames: bool, optional
+            Whether to keep the username side table, default value is True
+
+        Returns
+        -------
+        PkSet
+        """
+        builder = PkSetBuilder(usernames)
+        builder.extend(users)
+        return builder.build()
+
+    @classmethod
+    def from_sorted(cls, pks) -> "PkSet":
+        """
+        Wrap pks which are already sorted and unique, without a username side table
+
+        Parameters
+        ----------
+        pks: array or numpy.ndarray
+            Sorted unique int64 pks
+
+        Returns
+        -------
+        PkSet
+        """
+        if not isinstance(pks, array):
+            pks = array("q", pks.astype("int64").tobytes())
+        return cls._from_sorted(pks)
+
+    @classmethod
+    def _from_sorted(cls, pks: array, source: "PkSet" = None, slots=None) -> "PkSet":
+        pkset = cls.__new__(cls)
+        pkset._pks = pks
+        pkset._slots = slots
+        pkset._offsets = source._offsets if slots is not None else None
+        pkset._names = source._names if slots is not None else None
+        return pkset
+
+    def __len__(self) -> int:
+        return len(self._pks)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._pks)
+
+    def __contains__(self, pk) -> bool:
+        pk = int(pk)
+        i = bisect_left(self._pks, pk)
+        return i < len(self._pks) and self._pks[i] == pk
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PkSet):
+            return NotImplemented
+        return self._pks == other._pks
+
+    def __repr__(self) -> str:
+        return f"<PkSet {len(self)} pks{' with usernames' if self.has_usernames else ''}>"
+
+    @property
+    def has_usernames(self) -> bool:
+        return self._slots is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays and the username blob"""
+        size = self._pks.itemsize * len(self._pks)
+        if self.has_usernames:
+            size += self._slots.itemsize * len(self._slots)
+            size += self._offsets.itemsize * len(self._offsets) + len(self._names)
+        return size
+
+    def array(self):
+        """
+        Sorted pks as a NumPy int64 array (zero-copy) or as ``array('q')`` without NumPy
+        """
+        if numpy is not None:
+            return numpy.frombuffer(self._pks, dtype=numpy.int64)
+        return self._pks
+
+    def username(self, pk) -> Optional[str]:
+        """
+        Get username by pk from the side table
+
+        Parameters
+        ----------
+        pk: int or str
+            User pk
+
+        Returns
+        -------
+        Optional[str]
+            Username, None when the pk is missing or there is no side table
+        """
+        if not self.has_usernames:
+            return None
+        pk = int(pk)
+        i = bisect_left(self._pks, pk)
+        if i == len(self._pks) or self._pks[i] != pk:
+            return None
+        return self._username_at(i)
+
+    def _username_at(self, i: int) -> str:
+        slot = self._slots[i]
+        return self._names[self._offsets[slot]:self._offsets[slot + 1]].decode("utf-8")
+
+    def items(self) -> Iterator[Tuple[int, Optional[str]]]:
+        """
+        Iterate over (pk, username) pairs in pk order
+        """
+        for i, pk in enumerate(self._pks):
+            yield pk, self._username_at(i) if self.has_usernames else None
+
+    def _take(self, positions) -> "PkSet":
+        if numpy is not None:
+            positions = numpy.asarray(positions, dtype=numpy.int64)
+            pks = array("q", self.array()[positions].tobytes())
+            slots = None
+            if self.has_usernames:
+                slots = array(
+                    "Q",
+                    numpy.frombuffer(self._slots, dtype=numpy.uint64)[positions].tobytes(),
+                )
+        else:
+            pks = array("q", (self._pks[i] for i in positions))
+            slots = None
+            if self.has_usernames:
+                slots = array("Q", (self._slots[i] for i in positions))
+        return self._from_sorted(pks, self, slots)
+
+    def intersection(self, other: "PkSet") -> "PkSet":
+        """
+        Pks present in both sets, usernames are kept from this set
+        """
+        other = _as_pkset(other)
+        if numpy is not None:
+            _, positions, _ = numpy.intersect1d(
+                self.array(), other.array(), assume_unique=True, return_indices=True
+            )
+            return self._take(positions)
+        positions = array("Q")
+        a, b = self._pks, other._pks
+        i = j = 0
+        while i < len(a) and j < len(b):
+            if a[i] < b[j]:
+                i += 1
+            elif a[i] > b[j]:
+                j += 1
+            else:
+                positions.append(i)
+                i += 1
+                j += 1
+        return self._take(positions)
+
+    def difference(self, other: "PkSet") -> "PkSet":
+        """
+        Pks present in this set but not in ``other``, usernames are kept from this set
+        """
+        other = _as_pkset(other)
+        if numpy is not None:
+            mask = numpy.isin(self.array(), other.array(), assume_unique=True, invert=True)
+            return self._take(numpy.flatnonzero(mask))
+        positions = array("Q")
+        a, b = self._pks, other._pks
+        j = 0
+        for i, pk in enumerate(a):
+            while j < len(b) and b[j] < pk:
+                j += 1
+            if j == len(b) or b[j] != pk:
+                positions.append(i)
+        return self._take(positions)
+
+    def union(self, other: "PkSet") -> "PkSet":
+        """
+        Pks present in either set
+
+        Usernames are kept when both sets have a side table (this set wins
+        for pks in both), the new side table holds only the kept usernames.
+        """
+        other = _as_pkset(other)
+        usernames = self.has_usernames and other.has_usernames
+        if numpy is not None:
+            if not usernames:
+                return self.from_sorted(numpy.union1d(self.array(), other.array()))
+            return self._union_numpy(other)
+        pks = array("q")
+        names = bytearray() if usernames else None
+        offsets = array("Q", [0]) if usernames else None
+        a, b = self._pks, other._pks
+        i = j = 0
+        while i < len(a) or j < len(b):
+            if j == len(b) or (i < len(a) and a[i] <= b[j]):
+                source, k = self, i
+                if j < len(b) and a[i] == b[j]:
+                    j += 1
+                i += 1
+            else:
+                source, k = other, j
+                j += 1
+            pks.append(source._pks[k])
+            if usernames:
+                names += source._username_at(k).encode("utf-8")
+                offsets.append(len(names))
+        if not usernames:
+            return self._from_sorted(pks)
+        source = PkSet.__new__(PkSet)
+        source._offsets, source._names = offsets, bytes(names)
+        return self._from_sorted(pks, source, array("Q", range(len(pks))))
+
+    def _union_numpy(self, other: "PkSet") -> "PkSet":
+        # Both inputs are sorted, a stable sort of the two runs is a merge
+        raw = numpy.concatenate([self.array(), other.array()])
+        order = numpy.argsort(raw, kind="stable")
+        ordered = raw[order]
+        keep = numpy.ones(len(ordered), dtype=bool)
+        keep[1:] = ordered[1:] != ordered[:-1]
+        order = order[keep]
+        # One blob of both side tables, then gather the kept usernames into a new one
+        blob = numpy.frombuffer(self._names + other._names, dtype=numpy.uint8)
+        self_offsets = numpy.frombuffer(self._offsets, dtype=numpy.uint64).astype(numpy.int64)
+        other_offsets = numpy.frombuffer(other._offsets, dtype=numpy.uint64).astype(numpy.int64)
+        offsets = numpy.concatenate([self_offsets, other_offsets[1:] + len(self._names)])
+        slots = numpy.concatenate(
+            [
+                numpy.frombuffer(self._slots, dtype=numpy.uint64).astype(numpy.int64),
+                numpy.frombuffer(other._slots, dtype=numpy.uint64).astype(numpy.int64)
+                + len(self._offsets)
+                - 1,
+            ]
+        )[order]
+        starts = offsets[slots]
+        lengths = offsets[slots + 1] - starts
+        new_offsets = numpy.zeros(len(slots) + 1, dtype=numpy.int64)
+        numpy.cumsum(lengths, out=new_offsets[1:])
+        positions = numpy.repeat(starts - new_offsets[:-1], lengths)
+        positions += numpy.arange(len(positions), dtype=numpy.int64)
+        source = PkSet.__new__(PkSet)
+        source._offsets = array("Q", new_offsets.astype(numpy.uint64).tobytes())
+        source._names = blob[positions].tobytes()
+        return self._from_sorted(
+            array("q", ordered[keep].tobytes()),
+            source,
+            array("Q", numpy.arange(len(slots), dtype=numpy.uint64).tobytes()),
+        )
+
+    __and__ = intersection
+    __sub__ = difference
+    __or__ = union
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Save to a binary file
+
+        Parameters
+        ----------
+        path: Path
+            File path
+
+        Returns
+        -------
+        Path
+            Path of the file
+        """
+        path = Path(path)
+        header = {"count": len(self._pks), "usernames": self.has_usernames}
+        if self.has_usernames:
+            header["names"] = len(self._names)
+            header["offsets"] = len(self._offsets)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as fp:
+            fp.write(MAGIC)
+            fp.write(json.dumps(header).encode() + b"\n")
+            self._pks.tofile(fp)
+            if self.has_usernames:
+                self._slots.tofile(fp)
+                self._offsets.tofile(fp)
+                fp.write(self._names)
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "PkSet":
+        """
+        Load from a file written by ``save``
+
+        Parameters
+        ----------
+        path: Path
+            File path
+
+        Returns
+        -------
+        PkSet
+        """
+        with open(path, "rb") as fp:
+            if fp.readline() != MAGIC:
+                raise ValueError(f"{path} is not a PkSet file")
+            header = json.loads(fp.readline())
+            pks = array("q")
+            pks.fromfile(fp, header["count"])
+            if not header["usernames"]:
+                return cls._from_sorted(pks)
+            slots, offsets = array("Q"), array("Q")
+            slots.fromfile(fp, header["count"])
+            offsets.fromfile(fp, header["offsets"])
+            source = cls.__new__(cls)
+            source._offsets = offsets
+            source._names = fp.read(header["names"])
+            return cls._from_sorted(pks, source, slots)
+
+
+class PkSetBuilder:
+    """
+    Accumulates users page by page into the compact arrays of a PkSet
+    """
+
+    def __init__(self, usernames: bool = True):
+        self.pks = array("q")
+        self.names = bytearray() if usernames else None
+        self.offsets = array("Q", [0]) if usernames else None
+
+    def __len__(self) -> int:
+        return len(self.pks)
+
+    def add(self, pk, username: str = None):
+        self.pks.append(int(pk))
+        if self.names is not None:
+            self.names += (username or "").encode("utf-8")
+            self.offsets.append(len(self.names))
+
+    def extend(self, users: Iterable):
+        for user in users:
+            self.add(user.pk, user.username)
+
+    def build(self) -> PkSet:
+        pkset = PkSet.__new__(PkSet)
+        pkset._build(self.pks, self.names, self.offsets)
+        return pkset
+
+
+def _as_pkset(pks) -> PkSet:
+    return pks if isinstance(pks, PkSet) else PkSet(pks)
+
+
+def _sort_unique(values: array) -> Tuple[array, array]:
+    """Sorted unique pks and, for each of them, the position of its first occurrence"""
+    if numpy is not None and len(values):
+        raw = numpy.frombuffer(values, dtype=numpy.int64)
+        order = numpy.argsort(raw, kind="stable")
+        ordered = raw[order]
+        keep = numpy.ones(len(ordered), dtype=bool)
+        keep[1:] = ordered[1:] != ordered[:-1]
+        return (
+            array("q", ordered[keep].tobytes()),
+            array("Q", order[keep].astype(numpy.uint64).tobytes()),
+        )
+    pks, slots = array("q"), array("Q")
+    for slot in sorted(range(len(values)), key=values.__getitem__):
+        pk = values[slot]
+        if pks and pks[-1] == pk:
+            continue  # keep the first occurrence
+        pks.append(pk)
+        slots.append(slot)
+    return pks, slots
@@ -0,0 +1,349 @@
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from instagrapi.crawler import RATE_LIMIT_ERRORS
+
+# Base refresh interval (seconds) per content type: stories are hot, highlights are cold
+REFRESH_INTERVALS = {
+    "stories": 600,
+    "profile": 3600,
+    "posts": 3600,
+    "reels": 3600,
+    "highlights": 6 * 3600,
+}
+
+logger = logging.getLogger("instagrapi.refresh")
+
+
+class RefreshCache:
+    """
+    Thread-safe LRU cache of refreshed content, keyed by (kind, profile)
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, max_age: float = None) -> Optional[Any]:
+        """
+        Get a cached value
+
+        Parameters
+        ----------
+        key: Hashable
+            Cache key
+        max_age: float, optional
+            Ignore values refreshed more than this many seconds ago, default is None (any age)
+
+        Returns
+        -------
+        Optional[Any]
+            None when missing or stale
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, refreshed_at = entry
+            if max_age is not None and time.time() - refreshed_at > max_age:
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """Seconds since the value was refreshed, None when missing"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return time.time() - entry[1] if entry else None
+
+
+class RefreshScheduler:
+    """
+    Background refresh of frequently viewed profiles within a global API budget
+
+    Every (profile, kind) pair seen by ``view`` becomes a job in a priority
+    queue ordered by its next due time. The due time is the base interval
+    of the content type (see REFRESH_INTERVALS) shortened by how often the
+    profile is viewed, views decaying with ``half_life``. Jobs are executed
+    by one worker thread, at most ``budget`` refreshes per ``period``
+    (token bucket), and their results are written into ``cache``. Profiles
+    nobody looks at anymore drop out of the queue.
+    """
+
+    def __init__(
+        self,
+        refreshers: Dict[str, Callable[..., Any]],
+        cache: RefreshCache = None,
+        intervals: Dict[str, int] = None,
+        budget: int = 120,
+        period: int = 3600,
+        half_life: int = 6 * 3600,
+        min_score: float = 0.25,
+        max_jobs: int = 1000,
+        rate_limit_sleep: int = 300,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        refreshers: Dict[str, Callable[..., Any]]
+            Kind -> function called as ``refresher(profile, **params)``, returning the value to cache
+        cache: RefreshCache, optional
+            Where results are written, default is a new RefreshCache
+        intervals: Dict[str, int], optional
+            Base refresh interval per kind, default is REFRESH_INTERVALS
+        budget: int, optional
+            Refreshes allowed per ``period``, default is 120
+        period: int, optional
+            Budget period in seconds, default is 3600
+        half_life: int, optional
+            Seconds after which a view counts half, default is 6 hours
+        min_score: float, optional
+            Jobs whose decayed view score falls below this are dropped, default is 0.25
+        max_jobs: int, optional
+            Queue size limit, the least viewed jobs are dropped first, default is 1000
+        rate_limit_sleep: int, optional
+            Seconds to pause all refreshes after a rate limit error, default is 300
+
+        Returns
+        -------
+        Void
+        """
+        self.refreshers = refreshers
+        self.cache = cache if cache is not None else RefreshCache()
+        self.intervals = dict(REFRESH_INTERVALS, **(intervals or {}))
+        self.budget = budget
+        self.period = period
+        self.half_life = half_life
+        self.min_score = min_score
+        self.max_jobs = max_jobs
+        self.rate_limit_sleep = rate_limit_sleep
+        self.jobs = {}  # (profile, kind) -> job dict
+        self._queue = []  # (due, seq, key), stale entries are skipped
+        self._seq = 0
+        self._tokens = float(budget)
+        self._tokens_at = time.time()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _score(self, job: Dict, now: float) -> float:
+        return job["score"] * 0.5 ** ((now - job["viewed_at"]) / self.half_life)
+
+    def _interval(self, job: Dict, now: float) -> float:
+        base = self.intervals.get(job["kind"], REFRESH_INTERVALS["profile"])
+        # Hot profiles are refreshed up to 8 times more often
+        return base / min(1 + math.log2(1 + self._score(job, now)), 8)
+
+    def _push(self, key: Tuple, due: float):
+        self.jobs[key]["due"] = due
+        self._seq += 1
+        heapq.heappush(self._queue, (due, self._seq, key))
+
+    def view(self, profile: Hashable, kind: str, **params):
+        """
+        Record a visitor view, scheduling the (profile, kind) refresh job
+
+        The job is due ``interval`` after the cached value was last set, so
+        a caller which loads a miss itself should call ``view`` after
+        writing the value to ``cache`` (or call ``touch``) to avoid a second
+        fetch by the worker.
+
+        Parameters
+        ----------
+        profile: Hashable
+            Profile key, passed to the refresher (e.g. username)
+        kind: str
+            Content type, one of ``refreshers``
+        params: optional
+            Extra keyword arguments for the refresher (e.g. user_id)
+
+        Returns
+        -------
+        Void
+        """
+        if kind not in self.refreshers:
+            raise ValueError(f'No refresher for "{kind}"')
+        now = time.time()
+        key = (profile, kind)
+        with self._lock:
+            job = self.jobs.get(key)
+            if job is None:
+                job = self.jobs[key] = {
+                    "profile": profile,
+                    "kind": kind,
+                    "params": params,
+                    "score": 0.0,
+                    "viewed_at": now,
+                    "refreshed_at": -math.inf,
+                    "due": -math.inf,
+                }
+            age = self.cache.age((kind, profile))
+            if age is not None:
+                job["refreshed_at"] = max(job["refreshed_at"], now - age)
+            job["params"].update(params)
+            job["score"] = self._score(job, now) + 1
+            job["viewed_at"] = now
+            if job["due"] is not None:  # a running job is rescheduled when it finishes
+                self._push(key, job["refreshed_at"] + self._interval(job, now))
+            if len(self.jobs) > self.max_jobs:
+                coldest = min(self.jobs, key=lambda k: self._score(self.jobs[k], now))
+                del self.jobs[coldest]
+        self._wakeup.set()
+
+    def touch(self, profile: Hashable, kind: str):
+        """
+        Mark the (profile, kind) job as just refreshed, e.g. after the caller loaded it itself
+
+        Parameters
+        ----------
+        profile: Hashable
+            Profile key
+        kind: str
+            Content type
+
+        Returns
+        -------
+        Void
+        """
+        now = time.time()
+        key = (profile, kind)
+        with self._lock:
+            job = self.jobs.get(key)
+            if job is None:
+                return
+            job["refreshed_at"] = now
+            if job["due"] is not None:
+                self._push(key, now + self._interval(job, now))
+
+    def _take_token(self, now: float) -> bool:
+        rate = self.budget / self.period
+        self._tokens = min(self.budget, self._tokens + (now - self._tokens_at) * rate)
+        self._tokens_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _next_job(self, now: float) -> Tuple[Optional[Dict], float]:
+        """Pop the most urgent due job within the budget, or the seconds to wait"""
+        with self._lock:
+            if now < self._paused_until:
+                return None, self._paused_until - now
+            while self._queue:
+                due, _, key = self._queue[0]
+                job = self.jobs.get(key)
+                if job is None or job["due"] != due:
+                    heapq.heappop(self._queue)  # dropped or rescheduled
+                    continue
+                if self._score(job, now) < self.min_score:
+                    heapq.heappop(self._queue)
+                    del self.jobs[key]
+                    continue
+                if due > now:
+                    return None, due - now
+                if not self._take_token(now):
+                    return None, (1 - self._tokens) * self.period / self.budget
+                heapq.heappop(self._queue)
+                job["due"] = None  # running
+                return job, 0
+            return None, self.period
+
+    def run_pending(self) -> int:
+        """
+        Execute due jobs while the budget allows
+
+        Returns
+        -------
+        int
+            Number of refreshes executed
+        """
+        done = 0
+        while not self._stop.is_set():
+            job, _ = self._next_job(time.time())
+            if job is None:
+                break
+            self._refresh(job)
+            done += 1
+        return done
+
+    def _refresh(self, job: Dict):
+        key = (job["profile"], job["kind"])
+        try:
+            value = self.refreshers[job["kind"]](job["profile"], **job["params"])
+        except RATE_LIMIT_ERRORS as e:
+            logger.warning("Refresh of %s rate limited, pause %ds (%s)", key, self.rate_limit_sleep, e)
+            with self._lock:
+                self._paused_until = time.time() + self.rate_limit_sleep
+                if key in self.jobs:
+                    self._push(key, self._paused_until)
+            return
+        except Exception as e:
+            logger.warning("Refresh of %s failed: %s", key, e)
+        else:
+            self.cache.set((job["kind"], job["profile"]), value)
+        now = time.time()
+        with self._lock:
+            job["refreshed_at"] = now
+            if key in self.jobs:
+                self._push(key, now + self._interval(job, now))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            job, wait = self._next_job(time.time())
+            if job is not None:
+                self._refresh(job)
+            else:
+                self._wakeup.wait(max(wait, 0.1))
+
+    def start(self) -> "RefreshScheduler":
+        """
+        Start the worker thread (idempotent)
+
+        Returns
+        -------
+        RefreshScheduler
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="instagrapi-refresh", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True):
+        """
+        Stop the worker thread after the running refresh
+
+        Parameters
+        ----------
+        wait: bool, optional
+            Wait for the thread to exit, default value is True
+
+        Returns
+        -------
+        Void
+        """
+        self._stop.set()
+        self._wakeup.set()
+        if wait and self._thread is not None:
+            self._thread.join()
@@ -1,9 +1,16 @@
+import hashlib
+import json
+import os
 import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 from .types import StoryBuild, StoryMention, StorySticker
+from .video_probe import file_hash
 
 try:
     from moviepy import CompositeVideoClip, ImageClip, TextClip, VideoFileClip
@@ -23,14 +30,27 @@ try:
 except ImportError:
     raise Exception("You don't have PIL installed. Please install PIL or Pillow>=8.1.1")
 
+PHOTO_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
 
 class StoryBuilder:
     """
     Helpers for Story building
+
+    Renders are cached in ``render_cache_dir``: text overlays as PNG layers
+    keyed by text and style, whole stories by their inputs (media and
+    background content hash, caption, mentions, font, link, duration), so
+    building the same story again returns the previous files. Files unused
+    for ``render_cache_max_age`` seconds are evicted, then the least
+    recently used ones while the cache exceeds ``render_cache_max_bytes``.
     """
 
     width = 720
     height = 1280
+    render_cache = True
+    render_cache_dir = None  # default is <tmp>/instagrapi-stories
+    render_cache_max_bytes = 2 * 1024**3
+    render_cache_max_age = 7 * 86400
 
     def __init__(
         self,
@@ -62,6 +82,123 @@ class StoryBuilder:
         self.mentions = mentions
         self.bgpath = Path(bgpath) if bgpath else None
 
+    def _cache_dir(self) -> Path:
+        path = Path(self.render_cache_dir or Path(tempfile.gettempdir()) / "instagrapi-stories")
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _render_key(self, kind: str, **options) -> str:
+        """Digest of everything a rendered story depends on"""
+        return _digest(
+            {
+                "kind": kind,
+                "media": file_hash(self.path),
+                "background": file_hash(self.bgpath) if self.bgpath else None,
+                "caption": self.caption,
+                "mentions": [
+                    getattr(getattr(mention, "user", None), "username", None)
+                    for mention in self.mentions
+                ],
+                "size": [self.width, self.height],
+                **options,
+            }
+        )
+
+    def _cached_build(self, key: str) -> Optional[StoryBuild]:
+        """StoryBuild of a previous render with the same key, when its files still exist"""
+        manifest = self._cache_dir() / f"story-{key}.json"
+        if not manifest.exists():
+            return None
+        with open(manifest) as fp:
+            data = json.load(fp)
+        files = [manifest, data["path"], *data["paths"]]
+        if not all(os.path.exists(path) for path in files):
+            return None
+        for path in files:
+            _touch(path)  # recently used, evicted last
+        mentions = []
+        if data["mention"] and self.mentions:
+            mention = self.mentions[0]
+            for name, value in data["mention"].items():
+                setattr(mention, name, value)
+            mentions = [mention]
+        return StoryBuild(
+            mentions=mentions,
+            path=data["path"],
+            paths=data["paths"],
+            stickers=[StorySticker(**sticker) for sticker in data["stickers"]],
+        )
+
+    def _save_build(self, key: str, build: StoryBuild):
+        mention = build.mentions[0] if build.mentions else None
+        data = {
+            "path": str(build.path),
+            "paths": [str(path) for path in build.paths],
+            "stickers": [sticker.dict() for sticker in build.stickers],
+            "mention": {
+                name: getattr(mention, name) for name in ("x", "y", "width", "height")
+            }
+            if mention
+            else None,
+        }
+        manifest = self._cache_dir() / f"story-{key}.json"
+        _replace_with(manifest, lambda tmp: tmp.write_text(json.dumps(data)))
+        self._evict_cache()
+
+    def _evict_cache(self):
+        """Drop expired files, then the least recently used ones over the size limit"""
+        now = time.time()
+        files = []
+        for entry in os.scandir(self._cache_dir()):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue  # temp files of renders in progress
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in files:
+            if now - mtime <= self.render_cache_max_age and total <= self.render_cache_max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _text_layer(self, text: str, **style):
+        """TextClip rendered once per text and style, then loaded from a PNG layer"""
+        if not self.render_cache:
+            return TextClip(text, **style)
+        layer = self._cache_dir() / f"text-{_digest({'text': text, **style})}.png"
+        if layer.exists():
+            _touch(layer)
+        else:
+            text_clip = TextClip(text, **style)
+            _replace_with(layer, lambda tmp: text_clip.save_frame(str(tmp), withmask=True))
+            text_clip.close()
+        return ImageClip(str(layer))
+
+    def build(self, **options) -> StoryBuild:
+        """
+        Build story from a photo or a video, chosen by the file extension
+
+        Parameters
+        ----------
+        options: optional
+            Arguments of ``photo`` / ``video``
+
+        Returns
+        -------
+        StoryBuild
+            An object of StoryBuild
+        """
+        if self.path.suffix.lower() in PHOTO_EXTENSIONS:
+            return self.photo(**options)
+        return self.video(**options)
+
     def build_main(
         self,
         clip,
@@ -70,6 +207,7 @@ class StoryBuilder:
         fontsize: int = 100,
         color: str = "white",
         link: str = "",
+        cache_key: str = None,
     ) -> StoryBuild:
         """
         Build clip
@@ -86,6 +224,10 @@ class StoryBuilder:
             Size of font
         color: str, optional
             Color of text
+        link: str, optional
+            URL for a link sticker
+        cache_key: str, optional
+            Render cache key, the result is saved in the cache when set
 
         Returns
         -------
@@ -114,7 +256,7 @@ class StoryBuilder:
             if getattr(mention, "user", None):
                 caption = f"@{mention.user.username}"
         if caption:
-            text_clip = TextClip(
+            text_clip = self._text_layer(
                 caption,
                 color=color,
                 font=font,
@@ -135,7 +277,7 @@ class StoryBuilder:
             clips.append(text_clip)
         if link:
             url = urlparse(link)
-            link_clip = TextClip(
+            link_clip = self._text_layer(
                 url.netloc,
                 color="blue",
                 bg_color="white",
@@ -181,28 +323,35 @@ class StoryBuilder:
         if getattr(clip, "duration", None):
             if duration > int(clip.duration) or not duration:
                 duration = int(clip.duration)
-        destination = tempfile.mktemp(".mp4")
+        if cache_key:
+            destination = str(self._cache_dir() / f"story-{cache_key}.mp4")
+        else:
+            destination = tempfile.mktemp(".mp4")
         cvc = (
             CompositeVideoClip(clips, size=(self.width, self.height))
             .set_fps(24)
             .set_duration(duration)
         )
-        cvc.write_videofile(destination, codec="libx264", audio=True, audio_codec="aac")
+        _write_videofile(cvc, destination)
         paths = []
         if duration > 15:
             for i in range(duration // 15 + (1 if duration % 15 else 0)):
-                path = tempfile.mktemp(".mp4")
+                if cache_key:
+                    path = str(self._cache_dir() / f"story-{cache_key}-{i}.mp4")
+                else:
+                    path = tempfile.mktemp(".mp4")
                 start = i * 15
                 rest = duration - start
                 end = start + (rest if rest < 15 else 15)
                 sub = cvc.subclip(start, end)
-                sub.write_videofile(
-                    path, codec="libx264", audio=True, audio_codec="aac"
-                )
+                _write_videofile(sub, path)
                 paths.append(path)
-        return StoryBuild(
+        build = StoryBuild(
             mentions=mentions, path=destination, paths=paths, stickers=stickers
         )
+        if cache_key:
+            self._save_build(cache_key, build)
+        return build
 
     def video(
         self,
@@ -231,8 +380,17 @@ class StoryBuilder:
         StoryBuild
             An object of StoryBuild
         """
+        cache_key = None
+        if self.render_cache:
+            cache_key = self._render_key(
+                "video", max_duration=max_duration, font=font, fontsize=fontsize,
+                color=color, link=link,
+            )
+            build = self._cached_build(cache_key)
+            if build:
+                return build
         clip = VideoFileClip(str(self.path), has_mask=True)
-        build = self.build_main(clip, max_duration, font, fontsize, color, link)
+        build = self.build_main(clip, max_duration, font, fontsize, color, link, cache_key)
         clip.close()
         return build
 
@@ -263,7 +421,16 @@ class StoryBuilder:
         StoryBuild
             An object of StoryBuild
         """
-
+        max_duration = max_duration or 15
+        cache_key = None
+        if self.render_cache:
+            cache_key = self._render_key(
+                "photo", max_duration=max_duration, font=font, fontsize=fontsize,
+                color=color, link=link,
+            )
+            build = self._cached_build(cache_key)
+            if build:
+                return build
         with Image.open(self.path) as im:
             image_width, image_height = im.size
 
@@ -273,4 +440,73 @@ class StoryBuilder:
         clip = ImageClip(str(self.path)).resize(
             width=self.width, height=height_in_ratio
         )
-        return self.build_main(clip, max_duration or 15, font, fontsize, color, link)
+        return self.build_main(clip, max_duration, font, fontsize, color, link, cache_key)
+
+
+def _digest(data: Dict) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _replace_with(path: Path, write):
+    """Write through a temp file and rename, so concurrent renders never see partial files"""
+    # Unique per process and thread, the extension is kept for moviepy
+    tmp = path.with_name(f".{os.getpid()}.{threading.get_ident()}.{path.name}")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_videofile(clip, path: str):
+    _replace_with(
+        Path(path),
+        lambda tmp: clip.write_videofile(
+            str(tmp), codec="libx264", audio=True, audio_codec="aac"
+        ),
+    )
+
+
+def _build_story(job) -> StoryBuild:
+    builder, options = job
+    return builder.build(**options)
+
+
+def build_stories(builders: List, workers: int = None, **options) -> List[StoryBuild]:
+    """
+    Render many stories across worker processes
+
+    Parameters
+    ----------
+    builders: List
+        StoryBuilder objects, or (StoryBuilder, options dict) pairs to override ``options``
+    workers: int, optional
+        Worker processes, default is the number of CPUs
+    options: optional
+        Arguments of ``StoryBuilder.build`` for every story (font, link, max_duration...)
+
+    Returns
+    -------
+    List[StoryBuild]
+        Builds in the order of ``builders``
+    """
+    jobs = []
+    for item in builders:
+        if isinstance(item, StoryBuilder):
+            jobs.append((item, options))
+        else:
+            builder, extra = item
+            jobs.append((builder, {**options, **extra}))
+    if not jobs:
+        return []
+    workers = max(min(int(workers or os.cpu_count() or 1), len(jobs)), 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_build_story, jobs))
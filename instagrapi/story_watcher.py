@@ -0,0 +1,159 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from instagrapi.types import Story
+
+STORY_TTL = 86400  # stories expire after 24 hours
+
+
+class StoryWatcher:
+    """
+    Incremental watcher of new stories
+
+    One ``feed/reels_tray/`` call tells, for every followed account with
+    active stories, the timestamp of its newest story (``latest_reel_media``).
+    Only accounts whose timestamp moved since the last poll are fetched, in
+    batches through ``users_stories_v1``, and only story pks which were not
+    reported before are returned. Seen state is persisted to ``state_path``.
+
+    Watched accounts which are not followed never show up in the tray, they
+    are checked with one batched call every ``fallback_interval`` seconds.
+    The tray is requested with ``get_reels_tray_feed`` (page size 50) and is
+    not paged, so followed accounts beyond what the tray returns are only
+    seen through the fallback check as well.
+
+    The seen state belongs to one consumer: watchers sharing a
+    ``state_path`` report each new story to only one of them. Polls of the
+    same ``state_path`` are serialized within the process.
+    """
+
+    _locks = {}  # resolved state path -> Lock
+    _locks_lock = threading.Lock()
+
+    def __init__(
+        self,
+        client,
+        state_path: Path,
+        user_ids: Iterable[str] = None,
+        fallback_interval: int = 900,
+    ):
+        """
+        Initialization function
+
+        Parameters
+        ----------
+        client: Client
+            Logged in instagrapi client
+        state_path: Path
+            JSON file with the seen state
+        user_ids: Iterable[str], optional
+            Accounts to watch, default is None (everybody in the reels tray)
+        fallback_interval: int, optional
+            Seconds between checks of watched accounts missing from the tray, default is 900
+
+        Returns
+        -------
+        Void
+        """
+        self.client = client
+        self.state_path = Path(state_path)
+        self.user_ids = {str(user_id) for user_id in user_ids} if user_ids else None
+        self.fallback_interval = fallback_interval
+        with self._locks_lock:
+            self.lock = self._locks.setdefault(str(self.state_path.resolve()), threading.Lock())
+        self._load_state()
+
+    def _load_state(self):
+        self.state = {"users": {}, "fallback_at": 0}
+        if self.state_path.exists():
+            with open(self.state_path) as fp:
+                self.state.update(json.load(fp))
+
+    def _save_state(self):
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.state_path.parent, prefix=f".{self.state_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump(self.state, fp)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _user_state(self, user_id: str) -> Dict:
+        return self.state["users"].setdefault(
+            user_id, {"latest_reel_media": 0, "seen": {}}
+        )
+
+    def changed_user_ids(self) -> Dict[str, int]:
+        """
+        Accounts with stories newer than the last poll, by one reels tray call
+
+        Returns
+        -------
+        Dict[str, int]
+            User id -> latest_reel_media from the tray (0 for fallback checks)
+        """
+        tray = self.client.get_reels_tray_feed().get("tray") or []
+        changed, in_tray = {}, set()
+        for reel in tray:
+            user_id = str(reel.get("id"))
+            if self.user_ids is not None and user_id not in self.user_ids:
+                continue
+            in_tray.add(user_id)
+            latest = int(reel.get("latest_reel_media") or 0)
+            if latest > self._user_state(user_id)["latest_reel_media"]:
+                changed[user_id] = latest
+        now = time.time()
+        if self.user_ids and now - self.state["fallback_at"] >= self.fallback_interval:
+            changed.update((user_id, 0) for user_id in self.user_ids - in_tray)
+            self.state["fallback_at"] = now
+        return changed
+
+    def poll(self) -> Dict[str, List[Story]]:
+        """
+        Fetch stories which were not reported by previous polls
+
+        Returns
+        -------
+        Dict[str, List[Story]]
+            User id -> new stories, only accounts with new stories are included
+        """
+        with self.lock:
+            # Another watcher of the same file may have polled since this one loaded it
+            self._load_state()
+            return self._poll()
+
+    def _poll(self) -> Dict[str, List[Story]]:
+        changed = self.changed_user_ids()
+        new_stories = {}
+        if changed:
+            expired = time.time() - STORY_TTL
+            for user_id, stories in self.client.users_stories_v1(list(changed)).items():
+                user_state = self._user_state(user_id)
+                user_state["latest_reel_media"] = max(
+                    user_state["latest_reel_media"], changed.get(user_id, 0)
+                )
+                seen = {
+                    pk: taken_at
+                    for pk, taken_at in user_state["seen"].items()
+                    if taken_at > expired
+                }
+                fresh = [story for story in stories if story.pk not in seen]
+                for story in stories:
+                    taken_at = int(story.taken_at.timestamp())
+                    seen[story.pk] = taken_at
+                    user_state["latest_reel_media"] = max(
+                        user_state["latest_reel_media"], taken_at
+                    )
+                user_state["seen"] = seen
+                if fresh:
+                    new_stories[user_id] = fresh
+        self._save_state()
+        return new_stories
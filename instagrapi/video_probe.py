@@ -0,0 +1,405 @@
+import hashlib
+import math
+import os
+import shutil
+import struct
+import subprocess
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    raise Exception("You don't have PIL installed. Please install PIL or Pillow>=8.1.1")
+
+CONTAINER_BOXES = {b"moov", b"trak", b"mdia", b"minf", b"stbl", b"edts"}
+PROBE_CACHE_SIZE = 64
+
+
+class VideoInfo(NamedTuple):
+    width: int  # as displayed, i.e. after rotation
+    height: int
+    duration: float  # seconds
+    codec: str  # sample entry fourcc, e.g. "avc1", "hvc1"
+    rotation: int  # degrees
+    keyframes: Tuple[float, ...]  # sync sample times in seconds
+    audio_codec: Optional[str] = None
+
+
+class ProbeError(Exception):
+    pass
+
+
+def _boxes(data: bytes, start: int = 0, end: int = None):
+    """Iterate over (type, payload start, payload end) of the boxes in data[start:end]"""
+    end = len(data) if end is None else end
+    while start + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, start)
+        header = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, start + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header:
+            raise ProbeError(f"Broken box {kind!r} at {start}")
+        yield kind, start + header, min(start + size, end)
+        start += size
+
+
+def _read_moov(fp) -> bytes:
+    """Find the top level moov box by seeking over the others (mdat is never read)"""
+    fp.seek(0, os.SEEK_END)
+    file_size = fp.tell()
+    offset = 0
+    while offset + 8 <= file_size:
+        fp.seek(offset)
+        header = fp.read(16)
+        size, kind = struct.unpack_from(">I4s", header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", header, 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - offset
+        if size < header_size:
+            break
+        if kind == b"moov":
+            fp.seek(offset + header_size)
+            return fp.read(size - header_size)
+        offset += size
+    raise ProbeError("No moov box, not an MP4/MOV file")
+
+
+def _full_box(data: bytes, start: int) -> Tuple[int, int]:
+    """Version and the offset after the version/flags header"""
+    return data[start], start + 4
+
+
+def _parse_track(data: bytes, start: int, end: int) -> Dict:
+    track = {}
+    stack = [(start, end, b"trak")]
+    while stack:
+        box_start, box_end, parent = stack.pop()
+        for kind, payload, payload_end in _boxes(data, box_start, box_end):
+            if kind in CONTAINER_BOXES:
+                stack.append((payload, payload_end, kind))
+            elif kind == b"tkhd":
+                version, pos = _full_box(data, payload)
+                pos += 32 if version == 1 else 20  # times, track id, duration
+                pos += 16  # reserved, layer, alternate group, volume, reserved
+                matrix = struct.unpack_from(">9i", data, pos)
+                width, height = struct.unpack_from(">II", data, pos + 36)
+                track["matrix"] = matrix
+                track["size"] = (width >> 16, height >> 16)
+            elif kind == b"hdlr" and parent == b"mdia":
+                # QuickTime also has a data handler (dhlr) hdlr in minf, skip it
+                track["handler"] = data[payload + 8:payload + 12]
+            elif kind == b"mdhd":
+                version, pos = _full_box(data, payload)
+                if version == 1:
+                    timescale, duration = struct.unpack_from(">IQ", data, pos + 16)
+                else:
+                    timescale, duration = struct.unpack_from(">II", data, pos + 8)
+                track["timescale"] = timescale
+                track["duration"] = duration
+            elif kind == b"stsd":
+                # first sample entry: size, fourcc, reserved, data reference index
+                codec = data[payload + 12:payload + 16]
+                track["codec"] = codec.decode("latin-1").strip()
+                track["coded_size"] = struct.unpack_from(">HH", data, payload + 8 + 32)
+            elif kind == b"stss":
+                count = struct.unpack_from(">I", data, payload + 4)[0]
+                track["sync"] = struct.unpack_from(f">{count}I", data, payload + 8)
+            elif kind == b"stts":
+                count = struct.unpack_from(">I", data, payload + 4)[0]
+                track["stts"] = struct.unpack_from(f">{count * 2}I", data, payload + 8)
+    return track
+
+
+def _keyframe_times(track: Dict) -> List[float]:
+    """Times of the sync samples, all samples are sync samples without stss"""
+    stts = track.get("stts", ())
+    timescale = track.get("timescale") or 1
+    sync = track.get("sync")
+    times = []
+    sample, time = 1, 0
+    wanted = iter(sorted(sync)) if sync is not None else None
+    target = next(wanted, None) if wanted is not None else None
+    for i in range(0, len(stts), 2):
+        count, delta = stts[i], stts[i + 1]
+        if wanted is None:
+            times.extend((time + n * delta) / timescale for n in range(count))
+        else:
+            while target is not None and target < sample + count:
+                times.append((time + (target - sample) * delta) / timescale)
+                target = next(wanted, None)
+        sample += count
+        time += count * delta
+    return times
+
+
+def probe_mp4(path: Path) -> VideoInfo:
+    """
+    Read video metadata from the MP4/MOV container without decoding
+
+    Parameters
+    ----------
+    path: Path
+        Path to the video
+
+    Returns
+    -------
+    VideoInfo
+    """
+    with open(path, "rb") as fp:
+        moov = _read_moov(fp)
+    try:
+        return _parse_moov(moov)
+    except (struct.error, KeyError, ValueError, TypeError, IndexError) as e:
+        raise ProbeError(f"Broken moov box: {e}")
+
+
+def _parse_moov(moov: bytes) -> VideoInfo:
+    movie_duration = None
+    tracks = []
+    for kind, payload, payload_end in _boxes(moov):
+        if kind == b"mvhd":
+            version, pos = _full_box(moov, payload)
+            if version == 1:
+                timescale, duration = struct.unpack_from(">IQ", moov, pos + 16)
+            else:
+                timescale, duration = struct.unpack_from(">II", moov, pos + 8)
+            movie_duration = duration / timescale if timescale else None
+        elif kind == b"trak":
+            tracks.append(_parse_track(moov, payload, payload_end))
+    video = next((t for t in tracks if t.get("handler") == b"vide"), None)
+    if video is None:
+        raise ProbeError("No video track")
+    audio = next((t for t in tracks if t.get("handler") == b"soun"), None)
+    a, b = video["matrix"][0], video["matrix"][1]
+    rotation = round(math.degrees(math.atan2(b, a))) % 360
+    width, height = video.get("size") or video.get("coded_size")
+    if not width or not height:
+        width, height = video.get("coded_size", (0, 0))
+    if rotation in (90, 270):
+        width, height = height, width
+    if movie_duration is None:
+        movie_duration = video["duration"] / video["timescale"]
+    return VideoInfo(
+        width=width,
+        height=height,
+        duration=movie_duration,
+        codec=video.get("codec", ""),
+        rotation=rotation,
+        keyframes=tuple(_keyframe_times(video)),
+        audio_codec=audio.get("codec") if audio else None,
+    )
+
+
+def ffmpeg_exe() -> str:
+    """ffmpeg bundled with moviepy (imageio-ffmpeg) or the one on PATH"""
+    try:
+        import imageio_ffmpeg
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        exe = shutil.which("ffmpeg")
+        if not exe:
+            raise ProbeError("ffmpeg not found")
+        return exe
+
+
+def extract_thumbnail(path: Path, thumbnail: Path, timestamp: float = 0.0) -> Path:
+    """
+    Save one frame as JPEG, seeking straight to ``timestamp`` (best a keyframe)
+
+    Parameters
+    ----------
+    path: Path
+        Path to the video
+    thumbnail: Path
+        Path for the JPEG
+    timestamp: float, optional
+        Seconds from the start, default is 0
+
+    Returns
+    -------
+    Path
+    """
+    subprocess.run(
+        [
+            ffmpeg_exe(), "-v", "error", "-y",
+            "-ss", f"{timestamp:.3f}", "-i", str(path),
+            "-frames:v", "1", "-q:v", "2", str(thumbnail),
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    return Path(thumbnail)
+
+
+def crop_thumbnail(path: Path) -> bool:
+    """
+    Crop the center of a thumbnail to the 9:16 frame of IGTV and clips
+
+    Parameters
+    ----------
+    path: Path
+        Path to the thumbnail
+
+    Returns
+    -------
+    bool
+        A boolean value
+    """
+    with Image.open(str(path)) as im:
+        width, height = im.size
+        offset = (height / 1.78) / 2
+        center = width / 2
+        # Crop the center of the image
+        cropped = im.crop((center - offset, 0, center + offset, height))
+    cropped.save(str(path))
+    return True
+
+
+class _ProbeCache:
+    """LRU of analyze_video results by file content hash"""
+
+    def __init__(self, size: int = PROBE_CACHE_SIZE):
+        self.size = size
+        self.results = OrderedDict()  # (hash, crop) -> (VideoInfo, thumbnail)
+        self.hashes = {}  # (path, size, mtime) -> hash
+        self.lock = threading.Lock()
+
+    def file_hash(self, path: Path) -> str:
+        stat = os.stat(path)
+        key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+        with self.lock:
+            digest = self.hashes.get(key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=20)
+            with open(path, "rb") as fp:
+                for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            with self.lock:
+                self.hashes[key] = digest
+        return digest
+
+    def get(self, key):
+        with self.lock:
+            result = self.results.get(key)
+            if result is not None:
+                self.results.move_to_end(key)
+            return result
+
+    def set(self, key, value):
+        with self.lock:
+            self.results[key] = value
+            while len(self.results) > self.size:
+                self.results.popitem(last=False)
+
+
+_cache = _ProbeCache()
+
+
+def file_hash(path: Path) -> str:
+    """
+    Content hash of a file, memoized by path, size and mtime
+
+    Parameters
+    ----------
+    path: Path
+        Path to the file
+
+    Returns
+    -------
+    str
+        Hex digest
+    """
+    return _cache.file_hash(path)
+
+
+def _analyze_moviepy(path: Path, thumbnail: Optional[Path]) -> Tuple[VideoInfo, Optional[Path]]:
+    """Fallback for containers probe_mp4 does not understand"""
+    try:
+        import moviepy.editor as mp
+    except ImportError:
+        try:
+            import moviepy as mp
+        except ImportError:
+            raise Exception("Please install moviepy>=1.0.3 and retry")
+
+    video = mp.VideoFileClip(str(path))
+    try:
+        width, height = video.size
+        if thumbnail:
+            video.save_frame(str(thumbnail), t=(video.duration / 2))
+        info = VideoInfo(width, height, video.duration, "", 0, ())
+    finally:
+        try:
+            video.close()
+        except AttributeError:
+            pass
+    return info, thumbnail
+
+
+def analyze_video(
+    path: Path, thumbnail: Path = None, crop: bool = False
+) -> Tuple[int, int, float, Path]:
+    """
+    Video dimensions, duration and a thumbnail, shared by video, IGTV and clip uploads
+
+    Metadata comes from the MP4 container (no decoding). A missing thumbnail
+    is rendered from the keyframe closest to the middle of the video, to
+    ``<path>.crop.jpg`` or ``<path>.full.jpg`` by crop mode. Results are
+    cached by file hash, so the same file uploaded to feed, story and
+    direct is analyzed once.
+
+    Parameters
+    ----------
+    path: Path
+        Path to the video
+    thumbnail: Path, optional
+        Path to thumbnail for video. When None, then thumbnail is generate automatically
+    crop: bool, optional
+        Crop the generated thumbnail to 9:16 (IGTV, clips), default value is False
+
+    Returns
+    -------
+    Tuple
+        (width, height, duration, thumbnail)
+    """
+    key = (file_hash(path), crop)
+    cached = _cache.get(key)
+    if cached is not None:
+        info, cached_thumbnail = cached
+        if thumbnail or (cached_thumbnail and Path(cached_thumbnail).exists()):
+            return info.width, info.height, info.duration, thumbnail or cached_thumbnail
+    print(f'Analyzing video file "{path}"')
+    # Each crop mode has its own file, a cropped thumbnail must not replace a full one
+    default_thumbnail = Path(f"{path}.crop.jpg" if crop else f"{path}.full.jpg")
+    generated = None
+    try:
+        info = probe_mp4(path)
+    except ProbeError:
+        generated = None if thumbnail else default_thumbnail
+        info, _ = _analyze_moviepy(path, generated)
+    else:
+        if not thumbnail:
+            generated = default_thumbnail
+            middle = info.duration / 2
+            timestamp = min(info.keyframes, key=lambda t: abs(t - middle), default=middle)
+            print(f'Generating thumbnail "{generated}"...')
+            try:
+                extract_thumbnail(path, generated, timestamp)
+            except (ProbeError, subprocess.CalledProcessError, OSError):
+                _analyze_moviepy(path, generated)
+    if generated and crop:
+        crop_thumbnail(generated)
+    _cache.set(key, (info, generated))
+    return info.width, info.height, info.duration, thumbnail or generated